@@ -0,0 +1,470 @@
+import numpy as np
+import networkx as nx
+
+'''
+
+Almacenamiento de la adyacencia del grafo
+
+Backends intercambiables para la clase Graph de "grapher.py". Ambos exponen la misma
+interfaz (add_vertex, add_edge, neighbors, edges, to_networkx, to_dense), por lo que
+el grafo puede usar cualquiera de los dos sin cambios.
+
+'''
+
+#* Backend disperso: listas de adyacencia (diccionario de arreglos) con crecimiento geométrico
+class SparseAdjacency:
+    def __init__(self, dtype=int, capacity=4):
+        self.dtype = dtype                                          # Tipo de dato de los pesos (igual que la matriz original)
+        self.num_vertices = 0                                       # Número de vértices
+        self.num_edges = 0                                          # Número de aristas (no dirigidas)
+        self.capacity = capacity                                    # Capacidad inicial de cada lista de vecinos
+        self.neighbors_of = {}                                      # Vértice -> arreglo de vecinos (con espacio libre)
+        self.weights_of = {}                                        # Vértice -> arreglo de pesos (con espacio libre)
+        self.degree = np.zeros(capacity, dtype=np.int64)            # Número de vecinos ocupados por vértice
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir vértices (solo se reserva espacio, no se copia ninguna matriz)
+    def add_vertex(self, num_vertices) -> None:
+
+        self.num_vertices += num_vertices
+
+        # Si el arreglo de grados se queda corto, se duplica su capacidad (crecimiento amortizado)
+        if self.num_vertices > self.degree.shape[0]:
+            new_capacity = max(self.num_vertices, 2 * self.degree.shape[0])
+            new_degree = np.zeros(new_capacity, dtype=np.int64)
+            new_degree[:self.degree.shape[0]] = self.degree
+            self.degree = new_degree
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir (o actualizar) una conexión entre dos nodos
+    def add_edge(self, vertex1, vertex2, weight=1.0) -> None:
+
+        # Se valida que ambos vértices existan, igual que lo haría la matriz densa
+        for vertex in (vertex1, vertex2):
+            if not 0 <= vertex < self.num_vertices:
+                raise IndexError(f'El vértice {vertex} no existe en el grafo.')
+
+        # Si la arista ya existe solo se actualiza el peso; se busca desde el vértice con menos vecinos
+        if self.degree[vertex1] <= self.degree[vertex2]:
+            position = self._find(vertex1, vertex2)
+        else:
+            position = self._find(vertex2, vertex1)
+
+        if position is not None:
+            self._set_weight(vertex1, vertex2, weight)
+            self._set_weight(vertex2, vertex1, weight)
+            return
+
+        self._append(vertex1, vertex2, weight)
+        if vertex1 != vertex2:
+            self._append(vertex2, vertex1, weight)
+
+        self.num_edges += 1
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para encontrar la posición de un vecino (None si no existe)
+    def _find(self, vertex, neighbor):
+        if vertex not in self.neighbors_of:
+            return None
+
+        matches = np.flatnonzero(self.neighbors_of[vertex][:self.degree[vertex]] == neighbor)
+
+        return int(matches[0]) if matches.size else None
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para actualizar el peso de una arista existente
+    def _set_weight(self, vertex, neighbor, weight) -> None:
+        position = self._find(vertex, neighbor)
+        self.weights_of[vertex][position] = weight
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para añadir un vecino, duplicando la capacidad de la lista si está llena
+    def _append(self, vertex, neighbor, weight) -> None:
+
+        # Se crea la lista de vecinos del vértice la primera vez que se usa
+        if vertex not in self.neighbors_of:
+            self.neighbors_of[vertex] = np.zeros(self.capacity, dtype=np.int64)
+            self.weights_of[vertex] = np.zeros(self.capacity, dtype=self.dtype)
+
+        size = self.degree[vertex]
+        neighbors = self.neighbors_of[vertex]
+
+        # Si la lista está llena se duplica su tamaño
+        if size == neighbors.shape[0]:
+            new_neighbors = np.zeros(2 * size, dtype=np.int64)
+            new_neighbors[:size] = neighbors
+            new_weights = np.zeros(2 * size, dtype=self.dtype)
+            new_weights[:size] = self.weights_of[vertex]
+            self.neighbors_of[vertex] = new_neighbors
+            self.weights_of[vertex] = new_weights
+
+        self.neighbors_of[vertex][size] = neighbor
+        self.weights_of[vertex][size] = weight
+        self.degree[vertex] += 1
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir muchas aristas nuevas de una vez (no deben existir todavía en el grafo)
+    def add_edges(self, sources, targets, weights) -> None:
+
+        # Cada arista se guarda en ambos sentidos (los lazos solo una vez)
+        loops = sources == targets
+        origins = np.concatenate([sources, targets[~loops]]).astype(np.int64)
+        destinations = np.concatenate([targets, sources[~loops]]).astype(np.int64)
+        all_weights = np.concatenate([weights, weights[~loops]]).astype(self.dtype)
+
+        # Se ordenan por vértice de origen para añadir a cada lista todos sus vecinos nuevos de un golpe
+        order = np.argsort(origins, kind='stable')
+        vertices, starts, counts = np.unique(origins[order], return_index=True, return_counts=True)
+        destinations = destinations[order]
+        all_weights = all_weights[order]
+
+        for vertex, start, quantity in zip(vertices.tolist(), starts.tolist(), counts.tolist()):
+            new_neighbors = destinations[start:start + quantity]
+            new_weights = all_weights[start:start + quantity]
+
+            # Vértice sin vecinos: su lista es directamente el tramo del arreglo ordenado
+            if vertex not in self.neighbors_of:
+                self.neighbors_of[vertex] = new_neighbors
+                self.weights_of[vertex] = new_weights
+                continue
+
+            size = self.degree[vertex]
+            neighbors = self.neighbors_of[vertex]
+
+            # Si no caben, se amplía la lista una sola vez
+            if size + quantity > neighbors.shape[0]:
+                capacity = max(size + quantity, 2 * neighbors.shape[0])
+                grown_neighbors = np.zeros(capacity, dtype=np.int64)
+                grown_neighbors[:size] = neighbors[:size]
+                grown_weights = np.zeros(capacity, dtype=self.dtype)
+                grown_weights[:size] = self.weights_of[vertex][:size]
+                self.neighbors_of[vertex] = grown_neighbors
+                self.weights_of[vertex] = grown_weights
+
+            self.neighbors_of[vertex][size:size + quantity] = new_neighbors
+            self.weights_of[vertex][size:size + quantity] = new_weights
+
+        self.degree[vertices] += counts
+        self.num_edges += int(sources.shape[0])
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para cargar de una sola vez todas las aristas (reemplaza el contenido actual)
+    def load_edges(self, num_vertices, sources, targets, weights) -> None:
+        self.num_vertices = 0
+        self.num_edges = 0
+        self.degree = np.zeros(0, dtype=np.int64)
+        self.neighbors_of = {}
+        self.weights_of = {}
+
+        self.add_vertex(num_vertices)
+        self.add_edges(sources, targets, weights)
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener los vecinos de un vértice y los pesos de sus aristas
+    def neighbors(self, vertex):
+        if vertex not in self.neighbors_of:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=self.dtype)
+
+        size = self.degree[vertex]
+
+        return self.neighbors_of[vertex][:size], self.weights_of[vertex][:size]
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener el peso entre dos vértices (0 si no están conectados)
+    def weight(self, vertex1, vertex2):
+        position = self._find(vertex1, vertex2)
+
+        return self.weights_of[vertex1][position] if position is not None else 0
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener todas las aristas como arreglos (origen, destino, peso), con origen <= destino
+    def edge_arrays(self):
+        if not self.neighbors_of:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=self.dtype)
+
+        # Se juntan todas las listas de vecinos (en orden de vértice) y se conserva cada arista una sola vez
+        vertices = np.sort(np.fromiter(self.neighbors_of, dtype=np.int64, count=len(self.neighbors_of)))
+        sizes = self.degree[vertices]
+        pairs = list(zip(vertices.tolist(), sizes.tolist()))
+
+        sources = np.repeat(vertices, sizes)
+        targets = np.concatenate([self.neighbors_of[vertex][:size] for vertex, size in pairs])
+        weights = np.concatenate([self.weights_of[vertex][:size] for vertex, size in pairs])
+        mask = targets >= sources
+
+        return sources[mask], targets[mask], weights[mask]
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para iterar sobre las aristas (u, v, peso)
+    def edges(self):
+        sources, targets, weights = self.edge_arrays()
+
+        return zip(sources.tolist(), targets.tolist(), weights.tolist())
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para generar un grafo de NetworkX (equivalente a nx.from_numpy_array sobre la matriz densa)
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(range(self.num_vertices))
+        G.add_weighted_edges_from(self.edges())
+
+        return G
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para generar la matriz densa (solo para pruebas y debug)
+    def to_dense(self) -> np.ndarray:
+        matrix = np.zeros((self.num_vertices, self.num_vertices), dtype=self.dtype)
+        sources, targets, weights = self.edge_arrays()
+        matrix[sources, targets] = weights
+        matrix[targets, sources] = weights
+
+        return matrix
+
+    #-----------------------------------------------------------------------------
+
+    #* Memoria ocupada por los arreglos (en bytes)
+    @property
+    def nbytes(self) -> int:
+        return int(self.degree.nbytes
+                   + sum(a.nbytes for a in self.neighbors_of.values())
+                   + sum(a.nbytes for a in self.weights_of.values()))
+
+
+#-----------------------------------------------------------------------------------
+
+#* Backend denso: la matriz de adyacencia original (se conserva para comparar y para grafos pequeños)
+class DenseAdjacency:
+    def __init__(self, dtype=int):
+        self.dtype = dtype
+        self.matrix = np.array([])                                  # Matriz de adyacencia
+
+    #-----------------------------------------------------------------------------
+
+    @property
+    def num_vertices(self) -> int:
+        return self.matrix.shape[0] if self.matrix.size else 0
+
+    @property
+    def num_edges(self) -> int:
+        return int(np.count_nonzero(np.triu(self.matrix))) if self.matrix.size else 0
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir un vertice (nodo)
+    def add_vertex(self, num_vertices) -> None:
+
+        # Si la matriz esta vacia, se genera la matriz
+        if self.matrix.size == 0:
+            self.matrix = np.zeros((num_vertices, num_vertices), dtype=self.dtype)
+
+        # De lo contrario,
+        else:
+
+            # Se obtiene el tamaño actual de la matriz
+            current_size = self.matrix.shape[0]
+
+            # Se extiende el tamaño de la matriz, sumando el tamaño actual + el numero de nuevos nodos
+            new_size = current_size + num_vertices
+
+            # Se genera la nueva matriz
+            new_matrix = np.zeros((new_size, new_size), dtype=self.dtype)
+
+            # Se añaden los valores de la matriz actual a la nueva
+            new_matrix[:current_size, :current_size] = self.matrix
+
+            # Se guarda la nueva matriz como la actual
+            self.matrix = new_matrix
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir una conexión entre dos nodos
+    def add_edge(self, vertex1, vertex2, weight=1.0) -> None:
+
+        #Se añade el valor del peso entre dos vertices de la matriz de adyacencia (2D), esto genera un enlace entre los nodos
+        self.matrix[vertex1][vertex2] = weight
+        self.matrix[vertex2][vertex1] = weight
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir muchas aristas de una vez
+    def add_edges(self, sources, targets, weights) -> None:
+        self.matrix[sources, targets] = weights
+        self.matrix[targets, sources] = weights
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para cargar de una sola vez todas las aristas (reemplaza el contenido actual)
+    def load_edges(self, num_vertices, sources, targets, weights) -> None:
+        self.matrix = np.zeros((num_vertices, num_vertices), dtype=self.dtype)
+        self.add_edges(sources, targets, weights)
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    def neighbors(self, vertex):
+        neighbors = np.flatnonzero(self.matrix[vertex])
+
+        return neighbors, self.matrix[vertex][neighbors]
+
+    def weight(self, vertex1, vertex2):
+        return self.matrix[vertex1][vertex2]
+
+    def edge_arrays(self):
+        sources, targets = np.nonzero(np.triu(self.matrix))
+
+        return sources, targets, self.matrix[sources, targets]
+
+    def edges(self):
+        sources, targets, weights = self.edge_arrays()
+
+        return zip(sources.tolist(), targets.tolist(), weights.tolist())
+
+    def to_networkx(self) -> nx.Graph:
+        return nx.from_numpy_array(self.matrix, create_using=nx.Graph)
+
+    def to_dense(self) -> np.ndarray:
+        return self.matrix
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes)
+
+
+#-----------------------------------------------------------------------------------
+
+#* Backend de solo lectura en formato CSR (indptr, índices, pesos); los arreglos pueden ser mapas de memoria compartidos
+class CSRAdjacency:
+    def __init__(self, dtype=int):
+        self.dtype = dtype
+        self.indptr = np.zeros(1, dtype=np.int64)                   # Inicio de los vecinos de cada vértice
+        self.indices = np.zeros(0, dtype=np.int64)                  # Vecinos de todos los vértices, uno tras otro
+        self.data = np.zeros(0, dtype=dtype)                        # Pesos, en el mismo orden que indices
+        self.num_edges = 0
+
+    #-----------------------------------------------------------------------------
+
+    @property
+    def num_vertices(self) -> int:
+        return self.indptr.shape[0] - 1
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para usar arreglos CSR ya construidos (sin copiarlos)
+    def adopt(self, indptr, indices, data, num_edges) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.num_edges = int(num_edges)
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para construir los arreglos CSR a partir de las aristas (u, v, peso)
+    def load_edges(self, num_vertices, sources, targets, weights) -> None:
+        indptr, indices, data = csr_arrays(num_vertices, sources, targets, weights)
+        self.adopt(indptr, indices, data.astype(self.dtype), sources.shape[0])
+
+        return
+
+    #-----------------------------------------------------------------------------
+
+    #* Las mutaciones no están permitidas: el dueño del grafo publica una versión nueva
+    def add_vertex(self, num_vertices) -> None:
+        raise RuntimeError('CSRAdjacency es de solo lectura')
+
+    def add_edge(self, vertex1, vertex2, weight=1.0) -> None:
+        raise RuntimeError('CSRAdjacency es de solo lectura')
+
+    def add_edges(self, sources, targets, weights) -> None:
+        raise RuntimeError('CSRAdjacency es de solo lectura')
+
+    #-----------------------------------------------------------------------------
+
+    def neighbors(self, vertex):
+        start, end = self.indptr[vertex], self.indptr[vertex + 1]
+
+        return self.indices[start:end], self.data[start:end]
+
+    def weight(self, vertex1, vertex2):
+        neighbors, weights = self.neighbors(vertex1)
+        matches = np.flatnonzero(neighbors == vertex2)
+
+        return weights[matches[0]] if matches.size else 0
+
+    def edge_arrays(self):
+        sources = np.repeat(np.arange(self.num_vertices, dtype=np.int64), np.diff(self.indptr))
+        mask = self.indices >= sources
+
+        return sources[mask], np.asarray(self.indices[mask]), np.asarray(self.data[mask])
+
+    def edges(self):
+        sources, targets, weights = self.edge_arrays()
+
+        return zip(sources.tolist(), targets.tolist(), weights.tolist())
+
+    def to_networkx(self) -> nx.Graph:
+        G = nx.Graph()
+        G.add_nodes_from(range(self.num_vertices))
+        G.add_weighted_edges_from(self.edges())
+
+        return G
+
+    def to_dense(self) -> np.ndarray:
+        matrix = np.zeros((self.num_vertices, self.num_vertices), dtype=self.dtype)
+        sources, targets, weights = self.edge_arrays()
+        matrix[sources, targets] = weights
+        matrix[targets, sources] = weights
+
+        return matrix
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.indptr.nbytes + self.indices.nbytes + self.data.nbytes)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para pasar aristas (u, v, peso) a arreglos CSR con ambos sentidos (indptr, índices, pesos)
+def csr_arrays(num_vertices, sources, targets, weights):
+    loops = sources == targets
+    origins = np.concatenate([sources, targets[~loops]]).astype(np.int64)
+    destinations = np.concatenate([targets, sources[~loops]]).astype(np.int64)
+    all_weights = np.concatenate([weights, weights[~loops]])
+
+    order = np.argsort(origins, kind='stable')
+    indptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origins, minlength=num_vertices), out=indptr[1:])
+
+    return indptr, destinations[order], all_weights[order]
@@ -0,0 +1,609 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import random
+import resource
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import networkx as nx
+import numpy as np
+
+import mst
+import wal
+from adjacency import SparseAdjacency, DenseAdjacency
+from grapher import Graph
+
+'''
+
+Benchmarks del proyecto
+
+Uso:
+    python benchmark.py load                 Carga de N estudiantes (tiempo y memoria) por backend
+    python benchmark.py correlation          Matriz de correlación: ciclo original contra versión vectorizada
+    python benchmark.py mst                  MST: NetworkX sobre el grafo completo contra Prim denso nativo
+    python benchmark.py mst-incremental      MST tras una mutación: reparación incremental contra recálculo
+    python benchmark.py dijkstra             Consultas por segundo de find_best_path_to_skill
+    python benchmark.py oracle               Oráculo de distancias: construcción, consulta y actualización
+    python benchmark.py snapshot             Arranque en caliente: cargar un snapshot contra repetir las mutaciones
+    python benchmark.py wal                  Bitácora de mutaciones: registros por segundo y fsync por registro
+    python benchmark.py import               Importación masiva de un CSV contra altas una por una
+    python benchmark.py stress               Lectores y escritores concurrentes sobre un mismo grafo (y verificación)
+
+Cada medición de memoria se ejecuta en un proceso aparte para que el pico de RSS
+(ru_maxrss) corresponda solo a esa configuración.
+
+'''
+
+BACKENDS = {'sparse': SparseAdjacency, 'dense': DenseAdjacency}
+SKILLS = ['Programar', 'Dibujar', 'Escribir', 'Cantar', 'Modelar', 'Investigar', 'Animar', 'Negociar']
+
+#-----------------------------------------------------------------------------------
+
+#* Función para generar estudiantes sintéticos (nombre, carrera, semestre, habilidades)
+def synthetic_students(graph, quantity, seed=42, skills_per_student=1):
+    rng = random.Random(seed)
+    degrees = list(graph.degrees.values())
+
+    return [(f'Alumno{i}', rng.choice(degrees), rng.randint(1, 9), rng.sample(SKILLS, skills_per_student))
+            for i in range(quantity)]
+
+#-----------------------------------------------------------------------------------
+
+#* Función para cargar un grafo con N estudiantes y sus habilidades
+def load_graph(quantity, backend='sparse', seed=42, skills_per_student=1):
+    graph = Graph(adjacency=BACKENDS[backend])
+    graph.start()
+
+    for student, degree, semester, skills in synthetic_students(graph, quantity, seed, skills_per_student):
+        student_id = graph.add_student_vertex(student, degree, semester)
+        for skill in skills:
+            graph.add_skill_vertex(student, skill, student_id)
+
+    return graph
+
+#-----------------------------------------------------------------------------------
+
+#* Medición de una sola configuración (se ejecuta dentro del proceso hijo)
+def measure_load(quantity, backend) -> dict:
+    start = time.perf_counter()
+    graph = load_graph(quantity, backend)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss está en KiB en Linux
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return {'backend': backend, 'students': quantity, 'nodes': graph.num_nodes,
+            'seconds': round(elapsed, 3), 'rss_mb': round(rss_mb, 1),
+            'adjacency_mb': round(graph.adjacency.nbytes / 2**20, 2)}
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark de carga: backend disperso contra la matriz densa original
+def bench_load(args) -> None:
+    print(f"{'backend':<8} {'alumnos':>8} {'nodos':>8} {'seg':>9} {'RSS MB':>9} {'adj MB':>9}")
+
+    for quantity in args.students:
+        for backend in args.backends:
+
+            # La matriz densa es O(N²) en memoria y O(N³) en tiempo de carga; por encima del límite se omite
+            if backend == 'dense' and quantity > args.dense_max:
+                print(f"{backend:<8} {quantity:>8} {'omitido (O(N²) memoria / O(N³) tiempo)':>38}")
+                continue
+
+            output = subprocess.run([sys.executable, __file__, 'load', '--child', backend, str(quantity)],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{backend:<8} {quantity:>8} {result['nodes']:>8} {result['seconds']:>9} "
+                  f"{result['rss_mb']:>9} {result['adjacency_mb']:>9}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Matriz de correlación con el ciclo original (un llamado a weight por par ordenado)
+def loop_correlation(graph) -> np.ndarray:
+    student_list = list(graph.students.keys())
+    matrix = np.zeros((len(student_list), len(student_list)), dtype=float)
+
+    # Se descartan los prints de coincidence para medir solo el cálculo
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i, a in enumerate(student_list):
+            for j, b in enumerate(student_list):
+                if i != j:
+                    matrix[i][j] = graph.weight(a, b)
+
+    return matrix
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark de la matriz de correlación: ciclo original contra versión vectorizada
+def bench_correlation(args) -> None:
+    print(f"{'alumnos':>8} {'ciclo seg':>10} {'vector seg':>11} {'aceleración':>12} {'idénticos':>10}")
+
+    for quantity in args.students:
+        graph = load_graph(quantity, skills_per_student=args.skills)
+
+        start = time.perf_counter()
+        vectorized = graph.correlation_matrix()
+        vector_seconds = time.perf_counter() - start
+
+        if quantity > args.loop_max:
+            print(f"{quantity:>8} {'omitido':>10} {vector_seconds:>11.3f} {'-':>12} {'-':>10}")
+            continue
+
+        start = time.perf_counter()
+        loop = loop_correlation(graph)
+        loop_seconds = time.perf_counter() - start
+
+        print(f"{quantity:>8} {loop_seconds:>10.3f} {vector_seconds:>11.3f} "
+              f"{loop_seconds / vector_seconds:>11.0f}x {str(np.array_equal(loop, vectorized)):>10}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* MST como lo hacía getMST originalmente: matriz completa -> nx.Graph completo -> minimum_spanning_tree
+def networkx_mst_weight(graph) -> float:
+    matrix = graph.correlation_matrix()
+    G1 = nx.Graph()
+
+    for i in range(matrix.shape[0]):
+        for j in range(i + 1, matrix.shape[0]):
+            if matrix[i][j] > 0:
+                G1.add_edge(i, j, weight=matrix[i][j])
+
+    MST = nx.minimum_spanning_tree(G1, weight='weight', algorithm='prim')
+
+    return MST.size(weight='weight')
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark del MST: NetworkX contra Prim denso sobre el grafo implícito
+def bench_mst(args) -> None:
+    print(f"{'alumnos':>8} {'networkx seg':>13} {'prim seg':>9} {'peso nx':>10} {'peso prim':>10}")
+
+    for quantity in args.students:
+        graph = load_graph(quantity, skills_per_student=args.skills)
+
+        start = time.perf_counter()
+        edges = mst.prim(*graph.student_arrays())
+        prim_seconds = time.perf_counter() - start
+        prim_weight = mst.total_weight(edges)
+
+        if quantity > args.networkx_max:
+            print(f"{quantity:>8} {'omitido':>13} {prim_seconds:>9.3f} {'-':>10} {prim_weight:>10.2f}")
+            continue
+
+        start = time.perf_counter()
+        nx_weight = networkx_mst_weight(graph)
+        nx_seconds = time.perf_counter() - start
+
+        print(f"{quantity:>8} {nx_seconds:>13.3f} {prim_seconds:>9.3f} {nx_weight:>10.2f} {prim_weight:>10.2f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark del MST incremental: costo de /prim después de añadir un estudiante y una habilidad
+def bench_mst_incremental(args) -> None:
+    print(f"{'alumnos':>8} {'recálculo seg':>14} {'incremental seg':>16} {'peso completo':>14} {'peso incremental':>17}")
+
+    for quantity in args.students:
+        graph = load_graph(quantity, skills_per_student=args.skills)
+        graph.mst_tree.tree()
+
+        # Mutación típica: un alumno nuevo desde /add_student y su habilidad desde /add_skill
+        student_id = graph.add_student_vertex('Nuevo', 'SIS.', 3)
+        graph.add_skill_vertex('Nuevo', 'Programar', student_id)
+
+        start = time.perf_counter()
+        incremental = mst.total_weight(graph.mst_tree.tree())
+        incremental_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = mst.total_weight(mst.prim(*graph.student_arrays()))
+        full_seconds = time.perf_counter() - start
+
+        print(f"{quantity:>8} {full_seconds:>14.3f} {incremental_seconds:>16.4f} {full:>14.2f} {incremental:>17.2f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Función para medir consultas por segundo de find_best_path_to_skill
+def queries_per_second(graph, queries, rebuild=False) -> float:
+    start = time.perf_counter()
+
+    for student_id, skill in queries:
+        # rebuild=True simula el comportamiento anterior: reconstruir el grafo de NetworkX en cada consulta
+        if rebuild:
+            graph.path_view_version = -1
+
+        graph.find_nearest_students(graph.students[student_id], skill, 1, student_id)
+
+    return len(queries) / (time.perf_counter() - start)
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark de Dijkstra: consultas por segundo con y sin la vista en caché
+def bench_dijkstra(args) -> None:
+    print(f"{'alumnos':>8} {'nodos':>8} {'reconstruir q/s':>16} {'caché q/s':>10}")
+
+    for quantity in args.students:
+        graph = load_graph(quantity, skills_per_student=args.skills)
+        rng = random.Random(7)
+        students = list(graph.students)
+        queries = [(rng.choice(students), rng.choice(SKILLS)) for _ in range(args.queries)]
+
+        rebuild_qps = queries_per_second(graph, queries[:max(1, args.queries // 10)], rebuild=True)
+        graph.get_path_view()
+        cached_qps = queries_per_second(graph, queries)
+
+        print(f"{quantity:>8} {graph.num_nodes:>8} {rebuild_qps:>16.1f} {cached_qps:>10.1f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark del oráculo de distancias contra Dijkstra por consulta
+def bench_oracle(args) -> None:
+    print(f"{'alumnos':>8} {'construir seg':>14} {'oráculo ms':>11} {'dijkstra ms':>12} {'mutación+consulta ms':>21}")
+
+    for quantity in args.students:
+        graph = load_graph(quantity, skills_per_student=args.skills)
+        rng = random.Random(7)
+        students = list(graph.students)
+        queries = [(rng.choice(students), rng.choice(SKILLS)) for _ in range(args.queries)]
+
+        # Primer árbol de cada habilidad consultada (los siguientes ya están guardados)
+        start = time.perf_counter()
+        for skill in SKILLS:
+            graph.oracle.tree(graph.skills.index_of(skill))
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for student_id, skill in queries:
+            graph.find_best_path_to_skill(graph.students[student_id], skill, student_id)
+        oracle_ms = 1000 * (time.perf_counter() - start) / len(queries)
+
+        graph.get_path_view()
+        dijkstra_ms = 1000 / queries_per_second(graph, queries[:max(1, args.queries // 10)])
+
+        # Un alumno nuevo con una habilidad y la consulta siguiente (actualización incremental)
+        start = time.perf_counter()
+        student_id = graph.add_student_vertex('Nuevo', 'SIS.', 3)
+        graph.add_skill_vertex('Nuevo', 'Programar', student_id)
+        graph.find_best_path_to_skill('Nuevo', 'Dibujar', student_id)
+        mutation_ms = 1000 * (time.perf_counter() - start)
+
+        print(f"{quantity:>8} {build_seconds:>14.2f} {oracle_ms:>11.3f} {dijkstra_ms:>12.1f} {mutation_ms:>21.2f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark del snapshot: guardar y cargar contra reconstruir el grafo mutación por mutación
+def bench_snapshot(args) -> None:
+    print(f"{'alumnos':>8} {'reconstruir seg':>16} {'guardar seg':>12} {'cargar seg':>11} {'MB':>8}")
+
+    for quantity in args.students:
+        start = time.perf_counter()
+        graph = load_graph(quantity, skills_per_student=args.skills)
+        replay_seconds = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'graph.npz')
+
+            start = time.perf_counter()
+            graph.save_snapshot(path)
+            save_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            restored = Graph.load_snapshot(path)
+            load_seconds = time.perf_counter() - start
+
+            size = os.path.getsize(path) / 2**20
+
+        assert restored.num_nodes == graph.num_nodes and restored.adjacency.num_edges == graph.adjacency.num_edges
+
+        print(f"{quantity:>8} {replay_seconds:>16.2f} {save_seconds:>12.2f} {load_seconds:>11.2f} {size:>8.1f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark de la bitácora: hilos escribiendo a la vez, cada registro espera a estar en disco
+def bench_wal(args) -> None:
+    print(f"{'hilos':>6} {'registros/s':>12} {'fsync':>8} {'registros por fsync':>20}")
+
+    for threads in args.threads:
+        with tempfile.TemporaryDirectory() as directory:
+            log = wal.WriteAheadLog(os.path.join(directory, 'graph_wal.jsonl'))
+            fsync_calls = [0]
+            original_fsync = os.fsync
+
+            def counting_fsync(fd):
+                fsync_calls[0] += 1
+                original_fsync(fd)
+
+            def writer(thread):
+                for record in range(args.records):
+                    log.append({'seq': thread * args.records + record, 'op': 'student', 'student': f'Alumno{record}'})
+
+            workers = [threading.Thread(target=writer, args=(thread,)) for thread in range(threads)]
+
+            os.fsync = counting_fsync
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            seconds = time.perf_counter() - start
+            os.fsync = original_fsync
+
+            log.close()
+
+        total = threads * args.records
+        print(f"{threads:>6} {total / seconds:>12.0f} {fsync_calls[0]:>8} {total / fsync_calls[0]:>20.1f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Benchmark de la importación masiva: CSV por bloques contra add_student_vertex / add_skill_vertex por fila
+def bench_import(args) -> None:
+    print(f"{'alumnos':>8} {'una por una seg':>16} {'importar seg':>13} {'filas/s':>10}")
+
+    for quantity in args.students:
+        graph = Graph()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'alumnos.csv')
+
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['student', 'degree', 'semester', 'skills'])
+                for student, degree, semester, skills in synthetic_students(graph, quantity, skills_per_student=args.skills):
+                    writer.writerow([student, degree, semester, ';'.join(skills)])
+
+            incremental_seconds = float('nan')
+            if quantity <= args.incremental_max:
+                start = time.perf_counter()
+                load_graph(quantity, skills_per_student=args.skills)
+                incremental_seconds = time.perf_counter() - start
+
+            graph.start()
+            start = time.perf_counter()
+            graph.import_file(path, args.chunk_size)
+            import_seconds = time.perf_counter() - start
+
+        print(f"{quantity:>8} {incremental_seconds:>16.2f} {import_seconds:>13.2f} {quantity / import_seconds:>10.0f}")
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Verificación de consistencia del grafo tras la prueba de estrés; regresa la lista de problemas encontrados
+def check_consistency(graph) -> list:
+    problems = []
+
+    if graph.adjacency.num_vertices != graph.num_nodes:
+        problems.append(f'adyacencia con {graph.adjacency.num_vertices} vértices y num_nodes = {graph.num_nodes}')
+
+    if sorted(graph.students) != sorted(graph.attributes.student_ids()):
+        problems.append('los estudiantes del índice no coinciden con los arreglos de atributos')
+
+    for skill_index, bit in graph.skill_bits.items():
+        holders = {student for student, bits in graph.students_skills.items() if bits >> bit & 1}
+        if holders != graph.skill_students[skill_index]:
+            problems.append(f'índice invertido inconsistente para {graph.skills[skill_index]}')
+
+    # El MST reparado en cada mutación debe pesar lo mismo que uno calculado desde cero
+    if abs(mst.total_weight(graph.mst_tree.tree()) - mst.total_weight(mst.prim(*graph.student_arrays()))) > 1e-9:
+        problems.append('el MST incremental no coincide con Prim desde cero')
+
+    # Las distancias mantenidas por el oráculo deben coincidir con las de un oráculo recién construido
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.npz')
+        graph.save_snapshot(path)
+        fresh = Graph.load_snapshot(path)
+
+    rng = random.Random(3)
+    students = list(graph.students)
+    for skill_index in graph.skill_vocabulary:
+        for student_index in rng.sample(students, min(200, len(students))):
+            if graph.oracle.distance(student_index, skill_index) != fresh.oracle.distance(student_index, skill_index):
+                problems.append(f'distancia del oráculo distinta para {student_index} -> {graph.skills[skill_index]}')
+                break
+
+    return problems
+
+#-----------------------------------------------------------------------------------
+
+#* Prueba de estrés: hilos lectores (consultas) y escritores (altas) a la vez sobre el mismo grafo
+def bench_stress(args) -> None:
+    graph = load_graph(args.students, skills_per_student=args.skills)
+    degrees = list(graph.degrees.values())
+    students = list(graph.students)
+    deadline = time.perf_counter() + args.seconds
+    counts = {'reads': 0, 'writes': 0}
+    errors = []
+    counter_lock = threading.Lock()
+
+    def reader(thread):
+        rng = random.Random(thread)
+        reads = 0
+
+        while time.perf_counter() < deadline:
+            student_index = rng.choice(students)
+            skill = rng.choice(SKILLS)
+
+            try:
+                operation = rng.randrange(3)
+                if operation == 0:
+                    graph.find_best_path_to_skill(graph.students[student_index], skill, student_index)
+                elif operation == 1:
+                    graph.find_nearest_students(graph.students[student_index], skill, 3, student_index)
+                else:
+                    graph.students_with_skill(skill)
+
+            except ValueError:
+                pass                                                # Sin camino o habilidad aún inexistente: respuesta válida
+
+            except Exception as e:
+                errors.append(f'lector {thread}: {e!r}')
+
+            reads += 1
+
+        with counter_lock:
+            counts['reads'] += reads
+
+    def writer(thread):
+        rng = random.Random(1000 + thread)
+        writes = 0
+
+        while time.perf_counter() < deadline:
+            name = f'Escritor{thread}_{writes}'
+
+            try:
+                student_index = graph.add_student_vertex(name, rng.choice(degrees), rng.randint(1, 9))
+                graph.add_skill_vertex(name, rng.choice(SKILLS + [f'Nueva{thread}_{writes % 5}']), student_index)
+
+            except Exception as e:
+                errors.append(f'escritor {thread}: {e!r}')
+
+            writes += 1
+
+            if args.write_rate:
+                time.sleep(1 / args.write_rate)
+
+        with counter_lock:
+            counts['writes'] += writes
+
+    workers = [threading.Thread(target=reader, args=(thread,)) for thread in range(args.readers)]
+    workers += [threading.Thread(target=writer, args=(thread,)) for thread in range(args.writers)]
+
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    problems = check_consistency(graph)
+
+    print(f"lectores: {args.readers}  escritores: {args.writers} ({args.write_rate or 'sin límite'} altas/s c/u)  duración: {args.seconds} s")
+    print(f"consultas/s: {counts['reads'] / args.seconds:.0f}  altas/s: {counts['writes'] / args.seconds:.0f}")
+    print(f"errores: {len(errors)}  inconsistencias: {len(problems)}")
+
+    for message in (errors + problems)[:10]:
+        print(f'  {message}')
+
+    if errors or problems:
+        sys.exit(1)
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks del grafo de estudiantes')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('load', help='Tiempo de carga y RSS por backend de adyacencia')
+    load.add_argument('--students', type=int, nargs='+', default=[1000, 10000, 100000])
+    load.add_argument('--backends', nargs='+', default=['sparse', 'dense'], choices=list(BACKENDS))
+    load.add_argument('--dense-max', type=int, default=2000)
+    load.add_argument('--child', nargs=2, metavar=('BACKEND', 'N'), help=argparse.SUPPRESS)
+
+    correlation = commands.add_parser('correlation', help='Matriz de correlación: ciclo contra NumPy')
+    correlation.add_argument('--students', type=int, nargs='+', default=[200, 1000, 5000])
+    correlation.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    correlation.add_argument('--loop-max', type=int, default=1000)
+
+    mst_parser = commands.add_parser('mst', help='MST: NetworkX contra Prim denso')
+    mst_parser.add_argument('--students', type=int, nargs='+', default=[500, 2000, 5000])
+    mst_parser.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    mst_parser.add_argument('--networkx-max', type=int, default=2000)
+
+    incremental = commands.add_parser('mst-incremental', help='MST tras una mutación: incremental contra recálculo')
+    incremental.add_argument('--students', type=int, nargs='+', default=[1000, 10000, 50000])
+    incremental.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+
+    dijkstra = commands.add_parser('dijkstra', help='Consultas por segundo de find_best_path_to_skill')
+    dijkstra.add_argument('--students', type=int, nargs='+', default=[10000, 50000])
+    dijkstra.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    dijkstra.add_argument('--queries', type=int, default=200)
+
+    oracle = commands.add_parser('oracle', help='Oráculo de distancias contra Dijkstra por consulta')
+    oracle.add_argument('--students', type=int, nargs='+', default=[10000, 50000])
+    oracle.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    oracle.add_argument('--queries', type=int, default=1000)
+
+    snapshot = commands.add_parser('snapshot', help='Arranque en caliente desde un snapshot contra reconstrucción')
+    snapshot.add_argument('--students', type=int, nargs='+', default=[10000, 100000])
+    snapshot.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+
+    wal_parser = commands.add_parser('wal', help='Bitácora de mutaciones con fsync agrupado')
+    wal_parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16])
+    wal_parser.add_argument('--records', type=int, default=500, help='Registros por hilo')
+
+    import_parser = commands.add_parser('import', help='Importación masiva desde CSV contra altas una por una')
+    import_parser.add_argument('--students', type=int, nargs='+', default=[100000, 1000000])
+    import_parser.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    import_parser.add_argument('--chunk-size', type=int, default=50000)
+    import_parser.add_argument('--incremental-max', type=int, default=100000)
+
+    stress = commands.add_parser('stress', help='Lectores y escritores concurrentes (y verificación de consistencia)')
+    stress.add_argument('--students', type=int, default=2000)
+    stress.add_argument('--skills', type=int, default=2, help='Habilidades por estudiante')
+    stress.add_argument('--readers', type=int, default=8)
+    stress.add_argument('--writers', type=int, default=2)
+    stress.add_argument('--seconds', type=float, default=5.0)
+    stress.add_argument('--write-rate', type=float, default=50, help='Altas por segundo de cada escritor (0 = sin pausa)')
+
+    args = parser.parse_args()
+
+    if args.command == 'load':
+        if args.child:
+            print(json.dumps(measure_load(int(args.child[1]), args.child[0])))
+        else:
+            bench_load(args)
+
+    elif args.command == 'correlation':
+        bench_correlation(args)
+
+    elif args.command == 'mst':
+        bench_mst(args)
+
+    elif args.command == 'mst-incremental':
+        bench_mst_incremental(args)
+
+    elif args.command == 'dijkstra':
+        bench_dijkstra(args)
+
+    elif args.command == 'oracle':
+        bench_oracle(args)
+
+    elif args.command == 'snapshot':
+        bench_snapshot(args)
+
+    elif args.command == 'wal':
+        bench_wal(args)
+
+    elif args.command == 'import':
+        bench_import(args)
+
+    elif args.command == 'stress':
+        bench_stress(args)
+
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from indexes import NameIndex
+
+'''
+
+Catálogo de carreras y categorías (degrees.json)
+
+El archivo se lee una sola vez por ruta y el catálogo se comparte entre todos los grafos
+del proceso (y entre los procesos hijos creados con fork, que heredan la caché). La ruta
+se resuelve junto a este módulo, no desde el directorio de trabajo, y se puede cambiar
+con la variable de entorno EDYA_DEGREES.
+
+'''
+
+# Ruta por defecto del catálogo (junto al código, sin depender del directorio de trabajo)
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'degrees.json')
+
+# Catálogos ya cargados: ruta absoluta -> DegreeCatalog
+_catalogs = {}
+_lock = threading.Lock()
+
+#-----------------------------------------------------------------------------------
+
+#* Catálogo inmutable: categorías, carreras y los mapas entre ellas
+class DegreeCatalog:
+    def __init__(self, data):
+        self.data = {category: list(degrees) for category, degrees in data.items()}      # Categoría -> carreras (orden del archivo)
+        self.categories = list(self.data)                                               # Categorías en orden (índices 0..C-1)
+        self.degrees = [degree for degrees in self.data.values() for degree in degrees]  # Carreras en orden (índices C..C+D-1)
+
+        # Mapas hash en ambos sentidos (una carrera puede aparecer en más de una categoría)
+        self.category_degrees = {category: frozenset(degrees) for category, degrees in self.data.items()}
+        self.degree_categories = {}
+        for category, degrees in self.data.items():
+            for degree in degrees:
+                self.degree_categories.setdefault(degree, []).append(category)
+
+        # Carreras ordenadas con el índice de su primera aparición (para validar con searchsorted)
+        first_index = {}
+        for index, degree in enumerate(self.degrees, start=len(self.categories)):
+            first_index.setdefault(degree, index)
+
+        order = sorted(first_index)
+        self.sorted_degrees = np.array(order, dtype=str)
+        self.sorted_degree_indices = np.array([first_index[degree] for degree in order], dtype=np.int64)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para crear el índice de categorías (0..C-1) de un grafo
+    def category_index(self) -> NameIndex:
+        return NameIndex(enumerate(self.categories))
+
+    #* Método para crear el índice de carreras (empiezan después de las categorías) de un grafo
+    def degree_index(self) -> NameIndex:
+        return NameIndex(enumerate(self.degrees, start=len(self.categories)))
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener las aristas categoría -> carrera como pares de nombres
+    def hierarchy(self):
+        for category, degrees in self.data.items():
+            for degree in dict.fromkeys(degrees):
+                yield category, degree
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener el catálogo de una ruta (se lee del disco solo la primera vez)
+def load(path=None) -> DegreeCatalog:
+    path = os.path.abspath(path or os.environ.get('EDYA_DEGREES') or DEFAULT_PATH)
+
+    with _lock:
+        if path not in _catalogs:
+            with open(path, 'r', encoding='utf-8') as f:
+                _catalogs[path] = DegreeCatalog(json.load(f))
+
+        return _catalogs[path]
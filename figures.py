@@ -0,0 +1,86 @@
+import numpy as np
+import plotly.graph_objects as go
+
+'''
+
+Figuras de Plotly a partir de arreglos
+
+Todas las figuras del proyecto se construyen igual: un arreglo de posiciones (N x 2), un
+arreglo de aristas como pares de índices (E x 2) y un código de tipo por nodo. Las
+coordenadas de las aristas (x0, x1, None por arista) y de sus puntos medios se obtienen
+con indexado de NumPy y los colores con una tabla por código, sin recorrer nodos ni
+aristas en Python.
+
+'''
+
+# Tipos de nodo (código = posición en la tupla) y su color
+NODE_TYPES = ('category', 'degree', 'student', 'skill', 'cluster')
+CATEGORY, DEGREE, STUDENT, SKILL, CLUSTER = range(len(NODE_TYPES))
+PALETTE = ('yellow', 'lightgreen', 'lightblue', 'lightcoral', 'plum')
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener los colores de los nodos a partir de sus códigos de tipo
+def type_colors(types, palette=PALETTE) -> np.ndarray:
+    return np.array(palette, dtype=object)[types]
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener las coordenadas de las aristas: x, y con NaN entre aristas, y los puntos medios (E x 2)
+def edge_coordinates(positions, edges):
+    segments = np.full((edges.shape[0], 3, 2), np.nan)
+    segments[:, 0] = positions[edges[:, 0]]
+    segments[:, 1] = positions[edges[:, 1]]
+
+    return segments[:, :, 0].ravel(), segments[:, :, 1].ravel(), (segments[:, 0] + segments[:, 1]) / 2
+
+#-----------------------------------------------------------------------------------
+
+#* Función para construir la figura: un trazo de aristas, uno de nodos y (opcional) uno con los pesos
+# weight_text recibe los pesos y regresa sus etiquetas; show_labels=False deja los nombres solo al pasar el cursor
+def figure(positions, edges, labels, colors, title, weights=None, weight_text=None, show_labels=True,
+           edge_width=1, marker_line=None, weight_font=None, size=None) -> go.Figure:
+    edge_x, edge_y, middle = edge_coordinates(positions, edges)
+
+    traces = [
+        go.Scatter(
+            x=edge_x, y=edge_y,
+            line=dict(width=edge_width, color='#888'),
+            hoverinfo='none',
+            mode='lines'),
+        go.Scatter(
+            x=positions[:, 0], y=positions[:, 1],
+            mode='markers+text' if show_labels else 'markers',
+            text=labels,
+            textposition="top center",
+            hoverinfo='text',
+            marker=dict(
+                showscale=False,
+                color=colors,
+                size=15,
+                line=marker_line or dict(width=2))),
+    ]
+
+    # Todas las etiquetas de peso van en un solo trazo, en el punto medio de cada arista
+    if weights is not None and show_labels:
+        traces.append(go.Scatter(
+            x=middle[:, 0], y=middle[:, 1],
+            mode='text',
+            text=weight_text(weights) if weight_text else [f'{weight:g}' for weight in weights.tolist()],
+            textposition="middle center",
+            textfont=weight_font,
+            hoverinfo='none',
+            showlegend=False))
+
+    width, height = size or (None, None)
+
+    return go.Figure(data=traces,
+                     layout=go.Layout(
+                        title=title,
+                        showlegend=False,
+                        hovermode='closest',
+                        margin=dict(b=20,l=5,r=5,t=40),
+                        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                        width=width,
+                        height=height))
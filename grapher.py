@@ -1,8 +1,26 @@
+import os
 import numpy as np
 import networkx as nx
-import plotly.graph_objects as go
-import json
-import time
+import logging
+import threading
+import functools
+from adjacency import SparseAdjacency
+import catalog as degree_catalog
+from indexes import NameIndex, SetView
+import similarity
+import mst
+import paths
+import layout
+import lod
+import queries
+import figures
+from figures import NODE_TYPES, CATEGORY, DEGREE, STUDENT, SKILL
+from oracle import DistanceOracle
+from tracing import span
+import snapshot
+import importer
+from wal import WriteAheadLog, read_records
+from locks import ReadWriteLock
 
 '''
 
@@ -16,60 +34,91 @@ Por: Daniel Peña Cruz
 
 '''
 
+# Logger del módulo (sin costo si el nivel de log no lo habilita)
+logger = logging.getLogger(__name__)
+
+# Papel de cada nodo en los caminos de Dijkstra (código = posición en la paleta)
+ORIGIN, STEP, HOLDER, TARGET = range(4)
+PATH_PALETTE = ('yellow', 'lightblue', 'lightgreen', 'lightcoral')
+
+# Aristas del MST a partir de las cuales ya no se dibujan los pesos ni los nombres (configurable con EDYA_MST_LABELS)
+MST_LABEL_LIMIT = int(os.environ.get('EDYA_MST_LABELS', '500'))
+
+#* Decorador para los métodos de consulta: se ejecutan con el candado de lectura (en paralelo con otras consultas)
+def reader(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+#* Decorador para las mutaciones: se ejecutan con el candado de escritura (exclusivo)
+def writer(method):
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.lock.write():
+            result = method(self, *args, **kwargs)
+
+        # Ya sin el candado, se espera a que la bitácora esté en disco (así el fsync se agrupa con otros escritores)
+        if self.log is not None and not self.lock.owns_write():
+            self.log.sync()
+
+        return result
+
+    return locked
+
 #* Clase principal para el uso y manejo del grafo
 class Graph:
-    def __init__(self):
-        self.matrix = np.array([])                                  # Matriz de adyacencia
+    def __init__(self, adjacency=SparseAdjacency, catalog=None):
+        self.catalog = catalog or degree_catalog.load()             # Catálogo de carreras (degrees.json, leído una sola vez por proceso)
+        self.adjacency = adjacency()                                # Almacenamiento de la adyacencia (disperso por defecto)
         self.co_matrix = np.array([])                               # Matriz de correlación
         self.degrees = self.load_degrees()                          # Carreras
         self.categories = self.load_categories()                    # Categorías de las carreras
-        self.students = {}                                          # Diccionario para guardar los estudiante
-        self.skills = {}                                            # Diccionario para guardar las habilidades
+        self.students = NameIndex()                                 # Diccionario para guardar los estudiante (con índice inverso por nombre)
+        self.skills = NameIndex()                                   # Diccionario para guardar las habilidades (con índice inverso por nombre)
         self.students_semesters = {}                                # Diccionario para guardar los semetres
-        self.students_skills = {}
+        self.students_skills = {}                                   # Habilidades de cada estudiante como bitset (int), un bit por habilidad
+        self.skill_bits = {}                                        # Vocabulario global: nodo de habilidad -> número de bit
+        self.skill_vocabulary = []                                  # Vocabulario global: número de bit -> nodo de habilidad
+        self.skill_students = {}                                    # Índice invertido: habilidad -> conjunto de estudiantes
         self.students_degrees = {}
         self.num_nodes = len(self.categories) + len(self.degrees)   # Nodos iniciales
         self.mst_student_list = []                                  # Lista de estudiantes para el MST
+        self.attributes = similarity.StudentAttributes()            # Carrera, semestre y habilidades como arreglos (para cálculos vectorizados)
+        self.mst_tree = mst.IncrementalMST(self.attributes)         # MST de estudiantes, reparado incrementalmente en cada mutación
+        self.version = 0                                            # Versión del grafo (aumenta con cada mutación)
+        self.path_view = None                                       # Vista de NetworkX en caché para Dijkstra
+        self.path_view_version = -1                                 # Versión del grafo con la que se generó la vista
+        self.oracle = DistanceOracle(self.adjacency, self.hierarchy_aliases())  # Distancias precalculadas hacia cada habilidad
+        self.log = None                                             # Bitácora de mutaciones (write-ahead log), si está abierta
+        self.log_sequence = 0                                       # Secuencia del último registro de la bitácora aplicado
+        self.lock = ReadWriteLock()                                 # Muchas consultas a la vez, una sola mutación
+        self.cache_lock = threading.RLock()                         # Protege las cachés que las consultas recalculan (vista de NetworkX, MST)
+        self.compact_lock = threading.Lock()                        # Una sola compactación a la vez (snapshot y recorte de la bitácora)
+        self.layouts = layout.LayoutCache()                         # Posiciones de los dibujos por versión del grafo
+        self.queries = queries.QueryCache()                         # Resultados de /dijkstra_test (se descartan los que toca cada mutación)
     
         
         
     #-----------------------------------------------------------------------------
     
-    #* Método para cargar las carreras desde degrees.json
-    def load_degrees(self) -> dict:
-        # Se abre el archivo Json
-        with open('../proyectoFinal/degrees.json', 'r') as f:
-            data = json.load(f)
-        
-        labels = {}
-        index = len(data.keys())  # Comienza después de las categorías
-
-        # Asignar índices a las carreras
-        for deg_list in data.values():
-            for degree in deg_list:
-                labels[index] = degree
-                index += 1
-                
-        return labels
+    #* Método para obtener el índice de carreras (a partir del catálogo compartido)
+    def load_degrees(self) -> NameIndex:
+        return self.catalog.degree_index()
     
     #-----------------------------------------------------------------------------
     
-    #* Método para cargar las categorías desde degrees.json
-    def load_categories(self) -> dict:
-        # Se abre el archivo Json
-        with open('../proyectoFinal/degrees.json', 'r') as f:
-            data = json.load(f)
-        
-        # Se añade un índice a cada categoría
-        categories = {i: cat for i, cat in enumerate(data.keys())}
-        
-        return categories
+    #* Método para obtener el índice de categorías (a partir del catálogo compartido)
+    def load_categories(self) -> NameIndex:
+        return self.catalog.category_index()
         
     #----------------------------------------------------------------------------- 
         
     #* Método para imprimir la matriz del grafo (utilizado para test y debug)
     def get_graph_matrix(self) -> None:
-        print(self.matrix)
+        print(self.adjacency.to_dense())
         
         return
         
@@ -78,27 +127,22 @@ class Graph:
     #* Método para añadir un vertice (nodo)
     def add_vertex(self, num_vertices) -> None:
         
-        # Si la matriz esta vacia, se genera la matriz
-        if self.matrix.size == 0:
-            self.matrix = np.zeros((num_vertices, num_vertices), dtype=int)
-            
-        # De lo contrario,
-        else:
-            
-            # Se obtiene el tamaño actual de la matriz
-            current_size = self.matrix.shape[0]
-            
-            # Se extiende el tamaño de la matriz, sumando el tamaño actual + el numero de nuevos nodos
-            new_size = current_size + num_vertices
-            
-            # Se genera la nueva matriz
-            new_matrix = np.zeros((new_size, new_size), dtype=int)
-            
-            # Se añaden los valores de la matriz actual a la nueva
-            new_matrix[:current_size, :current_size] = self.matrix
-            
-            # Se guarda la nueva matriz como la actual
-            self.matrix = new_matrix    
+        # Se delega al backend de adyacencia, que reserva espacio sin copiar una matriz completa
+        first_vertex = self.adjacency.num_vertices
+        self.adjacency.add_vertex(num_vertices)
+        
+        # Si la vista de Dijkstra estaba al día, se actualiza en lugar de reconstruirla en la siguiente consulta
+        if self.path_view_version == self.version:
+            self.path_view.add_nodes_from(self.view_label(vertex) for vertex in range(first_vertex, first_vertex + num_vertices))
+            self.path_view_version += 1
+        
+        self.version += 1
+        
+        # Un nodo sin aristas no cambia ningún camino; solo afecta a las consultas que fallaron por su nombre
+        # (los estudiantes y habilidades ya registrados; en la importación masiva se nombran después)
+        names = {queries.student_name(self.students[vertex]) if vertex in self.students else self.skills[vertex]
+                 for vertex in range(first_vertex, first_vertex + num_vertices) if vertex in self.students or vertex in self.skills}
+        self.queries.invalidate(self.version - 1, self.version, names)
             
         return
             
@@ -107,24 +151,37 @@ class Graph:
     #* Método para añadir una conexión entre dos nodos
     def add_edge(self, vertex1, vertex2, weight=1.0) -> None:
         
-        #Se añade el valor del peso entre dos vertices de la matriz de adyacencia (2D), esto genera un enlace entre los nodos
-        self.matrix[vertex1][vertex2] = weight
-        self.matrix[vertex2][vertex1] = weight    
+        # Se guarda el peso de la arista en ambos sentidos (grafo no dirigido)
+        previous_weight = self.adjacency.weight(vertex1, vertex2)
+        self.adjacency.add_edge(vertex1, vertex2, weight)
+        
+        if self.path_view_version == self.version:
+            self.path_view.add_edge(self.view_label(vertex1), self.view_label(vertex2), weight=self.adjacency.weight(vertex1, vertex2).item())
+            self.path_view_version += 1
+        
+        self.version += 1
+        
+        # Una arista nueva hacia un nodo sin otras aristas (hoja) no acorta caminos: solo afecta a las consultas sobre la hoja
+        ends = [vertex for vertex in (vertex1, vertex2) if not previous_weight and self.adjacency.neighbors(vertex)[0].shape[0] == 1]
+        self.queries.invalidate(self.version - 1, self.version, {self.view_label(vertex) for vertex in ends or (vertex1, vertex2)})
+        
+        # Se avisa al oráculo de distancias con el peso ya guardado (mismo tipo que la adyacencia)
+        self.oracle.add_edge(vertex1, vertex2, self.adjacency.weight(vertex1, vertex2), previous_weight)
         
         return
               
     #-----------------------------------------------------------------------------            
         
-    #* Método para añadir un estudiante a la matriz de adyacencia
-    # Método para añadir un estudiante a la matriz de adyacencia
+    #* Método para añadir un estudiante a la matriz de adyacencia (regresa el ID asignado al estudiante)
+    @writer
     def add_student_vertex(self, student, degree, year):
         
         # Se busca el inddice de la carrera en la matriz de adyacencia
-        degree_index = next((k for k, v in self.degrees.items() if v == degree), None)
+        degree_index = self.degrees.index_of(degree)
         
         # Si no se encuentra el index de la carrera, significa que no existe o se escribió mal
         if degree_index is None:
-            print(f'Error: La carrera {degree} no existe.')
+            logger.warning('Error: La carrera %s no existe.', degree)
             return
 
         # Asignar índice al estudiante
@@ -137,6 +194,9 @@ class Graph:
         self.students_semesters[student_index] = year
         
         self.students_degrees[student_index] = degree
+        
+        # Se registran sus atributos y se marca como pendiente en el MST
+        self.mst_tree.touch(self.attributes.add(student_index, degree, year))
           
         # Agregar nodo para el estudiante
         self.add_vertex(1)
@@ -147,85 +207,175 @@ class Graph:
         # Conectar el estudiante a su carrera
         self.add_edge(student_index, degree_index, year)
         
+        # Se registra la mutación en la bitácora
+        self.record({'op': 'student', 'id': student_index, 'student': student, 'degree': degree, 'semester': year})
+        
+        return student_index
+        
     #-----------------------------------------------------------------------------
         
     #* Método para añadir una habilidad a la matriz de adyacencia
-    def add_skill_vertex(self, student, skill):  
+    @writer
+    def add_skill_vertex(self, student, skill, student_id=None):  
          
-        try:
-            # Si se encuentra el estudiante el el array de estudiantes, se obtiene el index del estudiante
-            if student in self.students.values():
-                student_index = next((k for k, v in self.students.items() if v == student), None)
-                
-            # De lo contrario, se retorna un error
-            else:
-                raise ValueError(f'Error: El estudiante {student} no existe.')
-        except ValueError as e:
-            print(e)
-            return
-        
-        # Se obtiene un idex para la habilidad
-        skill_index = next((k for k, v in self.skills.items() if v == skill), None)
+        # Se obtiene el index del estudiante (el ID desambigua alumnos con el mismo nombre)
+        # Si no existe (o el nombre es ambiguo) se lanza ValueError para que quien llama muestre el error
+        student_index = self.getStudentId(student, student_id)
         
-        # Asignar índice a la habilidad
-        skill_index = self.num_nodes
-        self.skills[skill_index] = skill
+        # Se obtiene un idex para la habilidad (cada habilidad tiene un solo nodo canónico)
+        skill_index = self.skills.index_of(skill)
         
-        # Agregar nodo para la habilidad
-        self.add_vertex(1)
-        
-        # Se aumenta el numero de nodos del grafo, para futuras adiciones a la matriz
-        self.num_nodes += 1
+        # Si la habilidad no existe, se crea su nodo
+        if skill_index is None:
+            
+            # Asignar índice a la habilidad
+            skill_index = self.num_nodes
+            self.skills[skill_index] = skill
+            self.skill_students[skill_index] = set()
+            
+            # Se le asigna el siguiente bit del vocabulario de habilidades
+            self.skill_bits[skill_index] = len(self.skill_vocabulary)
+            self.skill_vocabulary.append(skill_index)
+            
+            # Agregar nodo para la habilidad
+            self.add_vertex(1)
+            
+            # Se aumenta el numero de nodos del grafo, para futuras adiciones a la matriz
+            self.num_nodes += 1
         
         # Conectar el estudiante con la habilidad
         self.add_edge(student_index, skill_index)
         
+        # Se registra al estudiante en el índice invertido de la habilidad
+        self.skill_students[skill_index].add(student_index)
+        
+        # Se enciende el bit de la habilidad en el perfil del estudiante (puede tener varias)
+        self.students_skills[student_index] = self.students_skills.get(student_index, 0) | (1 << self.skill_bits[skill_index])
         
-        self.students_skills[student_index] = skill
+        # Sus aristas en el grafo de similitud pudieron cambiar, se marca como pendiente en el MST
+        self.mst_tree.touch(self.attributes.set_skills(student_index, self.students_skills[student_index]))
+        
+        # Se registra la mutación en la bitácora (con el ID ya resuelto)
+        self.record({'op': 'skill', 'id': student_index, 'student': student, 'skill': skill})
     
     #----------------------------------------------------------------------------- 
     
-    #* Metodo para obtener ID de un estudiante por nombre
-    def getStudentId(self, student):
+    #* Método para obtener los IDs de los estudiantes que tienen una habilidad (O(1), sin recorrer el grafo ni copiar)
+    # Se regresa una vista de solo lectura del índice invertido; para iterarla mientras hay mutaciones, tomar graph.lock.read()
+    @reader
+    def students_with_skill(self, skill) -> SetView:
+        skill_index = self.skills.index_of(skill)
         
-        if student in self.students.values():
-            student_index = next((k for k, v in self.students.items() if v == student), None)
+        if skill_index is None:
+            raise ValueError(f"Habilidad '{skill}' no encontrada")
         
-            return student_index
-
-        else:
+        return SetView(self.skill_students[skill_index])
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para saber si un estudiante tiene una habilidad (O(1), con el bit de la habilidad en su perfil)
+    def has_skill(self, student_index, skill) -> bool:
+        skill_index = self.skills.index_of(skill)
+        
+        if skill_index is None:
+            return False
+        
+        return bool(self.students_skills.get(student_index, 0) >> self.skill_bits[skill_index] & 1)
+    
+    #----------------------------------------------------------------------------- 
+    
+    #* Método para obtener los nombres de las habilidades de un estudiante a partir de su bitset
+    def get_student_skills(self, student_index) -> list:
+        return self.skill_names(self.students_skills.get(student_index, 0))
+    
+    #* Método para traducir un bitset de habilidades a sus nombres
+    def skill_names(self, bits) -> list:
+        return [self.skills[skill_index] for bit, skill_index in enumerate(self.skill_vocabulary) if bits >> bit & 1]
+    
+    #----------------------------------------------------------------------------- 
+    
+    #* Metodo para obtener ID de un estudiante por nombre (el ID opcional desambigua nombres repetidos)
+    def getStudentId(self, student, student_id=None):
+        
+        # Se obtienen todos los IDs con ese nombre desde el índice inverso
+        student_indices = self.students.indices_of(student)
+        
+        if not student_indices:
             raise ValueError(f'Error: El estudiante {student} no existe.')
+        
+        # Si se indicó un ID, se valida que corresponda al nombre
+        if student_id is not None:
+            if int(student_id) not in student_indices:
+                raise ValueError(f'Error: El estudiante {student} no tiene el ID {student_id}.')
+            
+            return int(student_id)
+        
+        # Si hay varios estudiantes con el mismo nombre, se pide el ID
+        if len(student_indices) > 1:
+            raise ValueError(f'Error: Hay {len(student_indices)} estudiantes llamados {student}, indique su ID: {student_indices}.')
+        
+        return student_indices[0]
             
     
     #-----------------------------------------------------------------------------
-     
-    def coincidence(self, a, b) -> int:
-        print(f"Calculando coincidencias entre alumnos {self.students[a]} y {self.students[b]}")
-      
-        student_A_skills = [self.students_skills[a] if a in self.students_skills else []]
-        print(f"Estudiante A: {self.students[a]} con habilidades {student_A_skills}")
+    
+    #* Método para obtener la etiqueta de un estudiante (se añade el ID si su nombre está repetido)
+    def student_label(self, student_index) -> str:
+        name = self.students[student_index]
         
-        student_B_skills = [self.students_skills[b] if b in self.students_skills else []]
-        print(f"Estudiante B: {self.students[b]} con habilidades {student_B_skills}")
+        if len(self.students.ids[name]) > 1:
+            return f'{name} (ID {student_index})'
         
-        shared_list = list(set(student_A_skills) & set(student_B_skills))
+        return name
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener la etiqueta de cualquier nodo a partir de su índice
+    def node_label(self, index) -> str:
+        if index in self.students:
+            return self.student_label(index)
         
-        print(f"Lista de habilidades en comun: {shared_list}")
+        for labels in (self.skills, self.degrees, self.categories):
+            if index in labels:
+                return labels[index]
         
-        shared_skills = len(shared_list) * 2
-        print(f"Puntos de habilidades en comun: {shared_skills}")
+        return str(index)
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener los nodos de la jerarquía que comparten nombre (p. ej. la categoría "ING." y la carrera "ING.")
+    # Al dibujar, NetworkX los fusiona por su etiqueta; el oráculo de distancias necesita la misma fusión
+    def hierarchy_aliases(self) -> dict:
+        return {index: self.categories.index_of(name)
+                for index, name in self.degrees.items() if self.categories.has_name(name)}
+    
+    #-----------------------------------------------------------------------------
+     
+    @reader
+    def coincidence(self, a, b) -> int:
+        student_A_skills = self.students_skills.get(a, 0)
+        student_B_skills = self.students_skills.get(b, 0)
+        
+        # Las habilidades en común son el AND de ambos bitsets; se cuentan con popcount
+        shared_bits = student_A_skills & student_B_skills
+        shared_skills = shared_bits.bit_count() * 2
         
         added_points = 0
         
-        if self.students_degrees[a] == self.students_degrees[b]:
-            print("Carrera en comun detectada")
+        same_degree = self.students_degrees[a] == self.students_degrees[b]
+        if same_degree:
             added_points += 5
             
-        if self.students_semesters[a] == self.students_semesters[b]:
-            print("Semestre en comun detectado")
+        same_semester = self.students_semesters[a] == self.students_semesters[b]
+        if same_semester:
             added_points += 1
-            
-        print(f"Coincidencia encontrada: {(shared_skills + added_points)}")
+        
+        # El detalle solo se formatea si el nivel DEBUG está activo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Coincidencia entre %s %s y %s %s: habilidades en común %s, carrera en común: %s, '
+                         'semestre en común: %s -> %d',
+                         self.students[a], self.get_student_skills(a), self.students[b], self.get_student_skills(b),
+                         self.skill_names(shared_bits), same_degree, same_semester, shared_skills + added_points)
     
         return (shared_skills + added_points)
     
@@ -239,284 +389,283 @@ class Graph:
 
     #----------------------------------------------------------------------------- 
     
-    #* Método para mostrar el grafo
+    #* Método para obtener los atributos de los estudiantes como arreglos (carrera, semestre y habilidades)
+    # Carreras y semestres van codificados como enteros (misma igualdad que en coincidence) y las habilidades
+    # como bitsets empaquetados en palabras uint64; el orden es el de self.attributes.student_ids()
+    def student_arrays(self):
+        return self.attributes.arrays()
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para calcular la matriz de correlación (pesos entre todos los pares de estudiantes)
+    @reader
     def correlation_matrix(self):
-        mst_student_list = list(self.students.keys())
-
-        students_quantity = len(mst_student_list)
-
-        matrix = np.zeros((students_quantity, students_quantity), dtype=float)
-
-        index_map = {student_id: index for index, student_id in enumerate(mst_student_list)}
-
-        for i in mst_student_list:
-            for j in mst_student_list:
-                if i == j:
-                    matrix[index_map[i]][index_map[j]] = 0
-                else: 
-                    calculated_weight = self.weight(i, j)
-                    matrix[index_map[i]][index_map[j]] = calculated_weight
-                    matrix[index_map[j]][index_map[i]] = calculated_weight 
+        # Se calculan todos los pesos de forma vectorizada (mismo resultado que self.weight(i, j) para cada par)
+        matrix = similarity.correlation_matrix(*self.student_arrays())
         
-        self.mst_student_list = mst_student_list
+        self.mst_student_list = self.attributes.student_ids()
         
         return matrix
     
     #-----------------------------------------------------------------------------
 
 
-    def getMST(self):
-        matrix = self.correlation_matrix()
-
-        print(matrix)
-
-        # Crear grafo y asignar pesos explícitamente
-        G1 = nx.Graph()
-        num_nodes = matrix.shape[0]
-        for i in range(num_nodes):
-            for j in range(i + 1, num_nodes):  # Solo la mitad superior (grafo no dirigido)
-                weight = matrix[i][j]
-                if weight > 0:  # Puedes omitir si hay ceros innecesarios
-                    G1.add_edge(i, j, weight=weight)
-
-        # Obtener el Árbol de Expansión Mínima
-        MST = nx.minimum_spanning_tree(G1, weight='weight', algorithm='prim')
-        
-        # Se renombran los nodos utilizando los diccionarios de categorías, carreras, estudiantes y habilidades
-        relabel_dict = {i: self.students[self.mst_student_list[i]] for i in range(len(self.mst_student_list))}
-        MST = nx.relabel_nodes(MST, relabel_dict)
-
-        # Posiciones para dibujar usando spring_layout de NetworkX
-        pos = nx.spring_layout(MST)
-
-        # Crear listas para los nodos
-        node_x = []
-        node_y = []
-        for node in MST.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-
-        # Crear listas para las aristas
-        edge_x = []
-        edge_y = []
-        edge_text = []
-
-        for edge in MST.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-
-            # Obtener el peso de la arista para mostrar en la etiqueta
-            weight = MST[edge[0]][edge[1]]['weight']
-            # Punto medio de la arista para ubicar la etiqueta
-            mid_x = (x0 + x1) / 2
-            mid_y = (y0 + y1) / 2
-            edge_text.append((mid_x, mid_y, weight))
-
-        # Crear el trace para las aristas
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=1, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-
-        # Crear el trace para los nodos
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=[str(i) for i in MST.nodes()],
-            textposition="top center",
-            hoverinfo='text',
-            marker=dict(
-                showscale=False,
-                color='rgb(41, 128, 185)',
-                size=15,
-                line=dict(width=2)))
-
-        # Crear traces para las etiquetas de peso
-        weight_traces = []
-        for mid_x, mid_y, weight in edge_text:
-            weight_trace = go.Scatter(
-                x=[mid_x], y=[mid_y],
-                text=[f"{weight:.2f}"],
-                mode='text',
-                hoverinfo='none',
-                textfont=dict(size=10),
-                showlegend=False
-            )
-            weight_traces.append(weight_trace)
-
-        # Crear la figura
-        fig = go.Figure(data=[edge_trace, node_trace, *weight_traces],
-                        layout=go.Layout(
-                            title='Árbol de Expansión Mínima entre Estudiantes (Enraizado)',
-                            showlegend=False,
-                            hovermode='closest',
-                            margin=dict(b=20, l=5, r=5, t=40),
-                            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                            width=800,
-                            height=600
-                        ))
+    #* Método para dibujar el MST con Plotly: un trazo para las aristas, uno para los nodos y uno para los pesos
+    # Con más de max_labels aristas no se dibujan los pesos ni los nombres (quedan al pasar el cursor)
+    @reader
+    def getMST(self, max_labels=MST_LABEL_LIMIT):
+        
+        # Árbol, etiquetas y posiciones como arreglos (Prim denso la primera vez, después solo se repara lo que cambió)
+        data = self.get_mst_data()
+        pos, edges, weights = data['positions'], data['edges'], data['weights']
+        
+        logger.debug('Peso total del MST: %.2f (%d aristas)', weights.sum(), edges.shape[0])
+        
+        with span('figure'):
+            fig = figures.figure(pos, edges, data['labels'], 'rgb(41, 128, 185)', 'Árbol de Expansión Mínima entre Estudiantes (Enraizado)',
+                                 weights=weights, weight_text=lambda weights: [f"{weight:.2f}" for weight in weights.tolist()],
+                                 show_labels=edges.shape[0] <= max_labels, weight_font=dict(size=10), size=(800, 600))
 
         # Regresar la figura
         return fig
         
     #-----------------------------------------------------------------------    
     
-    #* Método para inicializar el grafo con Plotly   
-    def getGraph(self):
-        # Se genera un nuevo grafo a partir de la matriz de adyacencia
-        G1 = nx.from_numpy_array(self.matrix, create_using=nx.Graph)
-
-        # Se renombran los nodos utilizando los diccionarios de categorías, carreras, estudiantes y habilidades
-        relabel_dict = {**self.categories, **self.degrees, **self.students, **self.skills}
-        G1 = nx.relabel_nodes(G1, relabel_dict)
-
-        # Posiciones de los nodos usando el layout de spring
-        pos = nx.spring_layout(G1, seed=42)  # Añadimos seed para consistencia
+    #* Método para inicializar el grafo con Plotly
+    # Si el grafo tiene más de lod.NODE_BUDGET nodos se dibuja la vista resumida (expand: carreras o categorías a abrir)
+    @reader
+    def getGraph(self, expand=()):
+        
+        # Posiciones, aristas (pares de índices) y código de tipo de cada nodo
+        data = self.get_graph_data(expand)
+        
+        # El color de cada nodo sale de su código de tipo (categoría, carrera, estudiante, habilidad o cúmulo)
+        with span('figure'):
+            fig = figures.figure(data['positions'], data['edges'], data['labels'], figures.type_colors(data['types']),
+                                 data['title'], weights=data['weights'])
+        
+        # Mostrar la figura (Para purebas o debug)
+        #fig.show()
+        
+        return fig
 
-        # Crear listas para nodos y aristas
-        edge_x = []
-        edge_y = []
+    #-----------------------------------------------------------------------------
+    
+    #* Método para dibujar con Plotly los caminos encontrados por Dijkstra (uno o varios)
+    @reader
+    def getDijkstra(self, paths):
+        
+        # Se acepta un solo camino (lista de nombres) o una lista de caminos
+        if paths and isinstance(paths[0], str):
+            paths = [paths]
+        
+        # Nodos (en orden de aparición) y aristas de la unión de los caminos, como índices
+        index = {node: position for position, node in enumerate(dict.fromkeys(node for path in paths for node in path))}
+        pairs = {tuple(sorted((index[u], index[v]))) for path in paths for u, v in zip(path, path[1:])}
+        edges = np.array(sorted(pairs), dtype=np.int64).reshape(len(pairs), 2)
+        
+        with span('layout'):
+            G1 = nx.Graph()
+            G1.add_nodes_from(range(len(index)))
+            G1.add_edges_from(edges.tolist())
+            pos = nx.spring_layout(G1, seed=42)
+            positions = np.array([pos[node] for node in range(len(index))], dtype=np.float64).reshape(len(index), 2)
+        
+        # El origen, los estudiantes encontrados y la habilidad se distinguen por color (código de tipo por nodo)
+        roles = np.full(len(index), STEP, dtype=np.uint8)
+        roles[[index[path[-2]] for path in paths if len(path) > 1]] = HOLDER
+        roles[[index[path[-1]] for path in paths]] = TARGET
+        roles[[index[path[0]] for path in paths]] = ORIGIN
+        
+        with span('figure'):
+            fig = figures.figure(positions, edges, [str(node) for node in index], figures.type_colors(roles, PATH_PALETTE),
+                                 'Camino más corto hacia la habilidad', edge_width=2)
         
-        # Añadir coordenadas para las aristas
-        for edge in G1.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
+        return fig
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener el grafo como arreglos (para dibujarlo en el navegador): etiquetas, tipo de cada nodo,
+    # posiciones (N x 2), aristas como pares de posiciones (E x 2) y sus pesos
+    # Los nodos de la jerarquía con el mismo nombre (p. ej. la categoría y la carrera "ING.") se dibujan como uno solo
+    # Un grafo con más de lod.NODE_BUDGET nodos se entrega como vista resumida (ver lod.graph_data)
+    @reader
+    def get_graph_data(self, expand=()) -> dict:
+        if self.num_nodes > lod.NODE_BUDGET:
+            with span('build'):
+                return lod.graph_data(self, expand)
+        
+        with span('build'):
+            num_nodes = self.num_nodes
+            
+            # Cada nodo apunta a su nodo canónico (él mismo, o la categoría con la que comparte nombre)
+            canonical = np.arange(num_nodes)
+            aliases = self.hierarchy_aliases()
+            if aliases:
+                canonical[list(aliases)] = list(aliases.values())
+            
+            kept = np.flatnonzero(canonical == np.arange(num_nodes))
+            position = np.full(num_nodes, -1, dtype=np.int64)
+            position[kept] = np.arange(kept.shape[0])
+            position = position[canonical]
             
-        # Crear trazado de aristas
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=1, color='#888'),
-            hoverinfo='none',
-            mode='lines')
-        
-        # Crear listas para nodos
-        node_x = []
-        node_y = []
-        node_text = []
-        node_colors = []
-        
-        # Añadir coordenadas e información para los nodos
-        for node in G1.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(str(node))
+            # Tipo de cada nodo según el rango de índices (categorías, carreras) o el vocabulario de habilidades
+            types = np.full(num_nodes, STUDENT, dtype=np.uint8)
+            types[:len(self.categories)] = CATEGORY
+            types[len(self.categories):len(self.categories) + len(self.degrees)] = DEGREE
+            types[np.array(self.skill_vocabulary, dtype=np.int64)] = SKILL
             
-            # Asignar colores según el tipo de nodo
-            if node in self.categories.values():
-                node_colors.append("yellow")
-            elif node in self.degrees.values():
-                node_colors.append("lightgreen")
-            elif node in self.skills.values():
-                node_colors.append("lightcoral")
-            else:
-                node_colors.append("lightblue")
-        
-        # Crear trazado de nodos
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=node_text,
-            textposition="top center",
-            hoverinfo='text',
-            marker=dict(
-                showscale=False,
-                color=node_colors,
-                size=15,
-                line_width=2))
-        
-        # Crear etiquetas de peso para las aristas
-        edge_labels_x = []
-        edge_labels_y = []
-        edge_labels_text = []
-        
-        for u, v, data in G1.edges(data=True):
-            x0, y0 = pos[u]
-            x1, y1 = pos[v]
-            # Posicionar la etiqueta en el medio de la arista
-            edge_labels_x.append((x0 + x1) / 2)
-            edge_labels_y.append((y0 + y1) / 2)
-            edge_labels_text.append(str(data.get('weight', '')))
-        
-        edge_labels_trace = go.Scatter(
-            x=edge_labels_x, y=edge_labels_y,
-            mode='text',
-            text=edge_labels_text,
-            textposition="middle center",
-            hoverinfo='none')
+            # Aristas en posiciones compactas, sin lazos ni repetidas (las que deja la fusión de nombres)
+            sources, targets, weights = self.adjacency.edge_arrays()
+            low = np.minimum(position[sources], position[targets])
+            high = np.maximum(position[sources], position[targets])
+            keep = low != high
+            _, unique = np.unique(low[keep] * kept.shape[0] + high[keep], return_index=True)
+            edges = np.stack([low[keep][unique], high[keep][unique]], axis=1)
             
-        # Crear la figura
-        fig = go.Figure(data=[edge_trace, node_trace, edge_labels_trace],
-                     layout=go.Layout(
-                        title='Grafo de estudiantes y carreras',
-                        showlegend=False,
-                        hovermode='closest',
-                        margin=dict(b=20,l=5,r=5,t=40),
-                        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
-                        )
+            labels = [self.node_label(index) for index in kept.tolist()]
         
-        # Mostrar la figura (Para purebas o debug)
-        #fig.show()
+        with span('layout'):
+            pos = self.layouts.array_positions('graph-data', self.version, kept.shape[0], edges, root=0)
         
-        return fig
+        return {'title': 'Grafo de estudiantes y carreras', 'version': self.version, 'labels': labels,
+                'types': types[kept], 'positions': pos, 'edges': edges, 'weights': weights[keep][unique]}
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener el MST de estudiantes como arreglos (mismo formato que get_graph_data)
+    @reader
+    def get_mst_data(self) -> dict:
+        with span('mst'):
+            with self.cache_lock:
+                student_ids = self.mst_student_list = self.attributes.student_ids()
+                tree = self.mst_tree.tree()
+            
+            edges = np.array([(i, j) for i, j, _ in tree], dtype=np.int64).reshape(len(tree), 2)
+            weights = np.array([weight for *_, weight in tree], dtype=np.float64)
+            labels = [self.student_label(student) for student in student_ids]
+        
+        with span('layout'):
+            pos = self.layouts.array_positions('mst-data', self.version, len(student_ids), edges)
+        
+        return {'title': 'Árbol de Expansión Mínima entre Estudiantes (Enraizado)', 'version': self.version, 'labels': labels,
+                'types': np.full(len(student_ids), STUDENT, dtype=np.uint8), 'positions': pos, 'edges': edges, 'weights': weights,
+                'colors': {'student': 'rgb(41, 128, 185)'}}
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener el grafo de NetworkX que usa Dijkstra; solo se reconstruye si cambió la versión del grafo
+    # Los estudiantes conservan su ID como nodo para que dos alumnos con el mismo nombre no se fusionen
+    # (la vista es compartida entre consultas, no se debe modificar)
+    @reader
+    def get_path_view(self) -> nx.Graph:
+        with self.cache_lock:
+            if self.path_view_version != self.version:
+                with span('build'):
+                    G = self.adjacency.to_networkx()
+                    relabel_dict = {**self.categories, **self.degrees, **self.skills}
+                    self.path_view = nx.relabel_nodes(G, relabel_dict)
+                    self.path_view_version = self.version
+        
+            return self.path_view
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Método para obtener la etiqueta de un nodo en la vista de Dijkstra (nombre, salvo los estudiantes que conservan su ID)
+    def view_label(self, index):
+        for labels in (self.skills, self.degrees, self.categories):
+            if index in labels:
+                return labels[index]
+        
+        return index
+    
+    #-----------------------------------------------------------------------------
+    
+    #* Algoritmo de Dijkstra multi-objetivo: los k estudiantes más cercanos que tienen la habilidad
+    # settled (opcional) recibe los nodos que fijó la búsqueda (de ellos depende el resultado)
+    @reader
+    def find_nearest_students(self, student_name, skill_name, k=1, student_id=None, settled=None) -> list:
+        
+        # Verificar existencia del estudiante
+        student_index = self.getStudentId(student_name, student_id)
 
+        # Verificar existencia de la habilidad; sus poseedores salen del índice invertido
+        skill_index = self.skills.index_of(skill_name)
+        if skill_index is None:
+            raise ValueError(f"Habilidad '{skill_name}' no encontrada")
+        
+        holders = self.skill_students[skill_index]
+
+        # Se obtiene el grafo NetworkX (en caché mientras el grafo no cambie)
+        G = self.get_path_view()
+
+        # Una sola búsqueda desde el estudiante, que termina al fijar a los k poseedores más cercanos
+        # (no se atraviesa el nodo de la habilidad: el camino llega a ella a través del poseedor)
+        with span('dijkstra'):
+            found = paths.nearest_targets(G, student_index, holders, k, blocked={skill_name}, settled=settled)
+        
+        results = []
+        for holder, cost, path in found:
+            results.append({
+                'id': holder,
+                'student': self.students[holder],
+                'degree': self.students_degrees[holder],
+                'semester': self.students_semesters[holder],
+                'cost': cost + G.adj[holder][skill_name]['weight'],
+                # Se traducen los IDs de estudiantes del camino a sus nombres y se termina en la habilidad
+                'path': [self.student_label(node) if node in self.students else node for node in path] + [skill_name],
+            })
+        
+        return results
+    
     #-----------------------------------------------------------------------------
     
-    #* Algortimo de Dijkstra
-    def find_best_path_to_skill(self, student_name, skill_name):
+    #* Los k estudiantes más cercanos con caché: las consultas idénticas en paralelo comparten una sola búsqueda
+    # render (opcional) convierte los candidatos en lo que se guarda (p. ej. la página con el dibujo); no se debe modificar lo que regresa
+    @reader
+    def cached_nearest_students(self, student_name, skill_name, k=1, student_id=None, render=None):
+
+        def compute():
+            settled = set()
+            candidates = self.find_nearest_students(student_name, skill_name, k, student_id, settled)
+
+            # El resultado depende de los nodos fijados, de la habilidad y de las etiquetas de los alumnos (cambian si se repite un nombre)
+            dependencies = settled | {skill_name, queries.student_name(student_name)}
+            dependencies.update(queries.student_name(self.students[node]) for node in settled if node in self.students)
+
+            return (render(candidates) if render else candidates), dependencies
+
+        return self.queries.get((student_name, skill_name, k, student_id, render), self.version, compute)
+
+    #-----------------------------------------------------------------------------
+    
+    #* Camino más corto hacia una habilidad, leído del oráculo de distancias (sin ejecutar una búsqueda)
+    @reader
+    def find_best_path_to_skill(self, student_name, skill_name, student_id=None):
         
         # Verificar existencia del estudiante
-        student_index = self.getStudentId(student_name)
+        student_index = self.getStudentId(student_name, student_id)
 
         # Verificar existencia de la habilidad
-        target_nodes = [k for k, v in self.skills.items() if v == skill_name]
-        if not target_nodes:
+        skill_index = self.skills.index_of(skill_name)
+        if skill_index is None:
             raise ValueError(f"Habilidad '{skill_name}' no encontrada")
         
-
-        # Crear grafo NetworkX desde la matriz
-        G = nx.from_numpy_array(self.matrix, create_using=nx.Graph)
-        relabel_dict = {**self.categories, **self.degrees, **self.students, **self.skills}
-        G = nx.relabel_nodes(G, relabel_dict)
-
-        # Declara las condiciones iniciales para usar el algoritmo de Dijkstra
-        start_node = student_name
-        best_path = None
-        best_cost = float('inf')
-
-        # Dijkstra (con networkx)
-        for target_skill_node in [skill_name]:
-            try:
-                path = nx.dijkstra_path(G, start_node, target_skill_node, weight='weight')
-                cost = nx.dijkstra_path_length(G, start_node, target_skill_node, weight='weight')
-                if cost < best_cost:
-                    best_cost = cost
-                    best_path = path
-            except nx.NetworkXNoPath:
-                continue
+        # El oráculo guarda, para cada habilidad, el siguiente salto de cada nodo hacia ella
+        with span('oracle'):
+            path = self.oracle.path(student_index, skill_index)
             
         # Si no se encuentra un camino valido, se retorna un error
-        if best_path is None:
+        if len(path) < 2:
             raise ValueError("No se encontró un camino válido entre el estudiante y la habilidad.")
         
-        # Se guarda el nombre del estudiante encontrado con el algoritmo
-        objective_student = best_path[-2]
+        # El estudiante encontrado es el nodo previo a la habilidad
+        objective_index = path[-2]
+        objective_student = self.students[objective_index]
+        objective_semester = self.students_semesters[objective_index]
         
-        # Se encuentra el indice del estudiante encontrado
-        if objective_student in self.students.values():
-            student_index = next((k for k, v in self.students.items() if v == objective_student), None)
-
-            
-        # Se encuenetra el semestre del estudiante encontrado    
-        objective_semester = self.students_semesters[student_index]
+        # Se traducen los índices del camino a sus nombres
+        best_path = [self.node_label(node) for node in path]
 
         # La función regresa el mejor camino, el nombre del estudiante encontrado y su semestre
         return best_path, objective_student, objective_semester
@@ -532,16 +681,12 @@ class Graph:
         # Se agregar nodos de carreras
         self.add_vertex(len(self.degrees))     
          
-        # Se abre el archivo Json
-        with open('../proyectoFinal/degrees.json', 'r') as f:
-            data = json.load(f)
-            
-        # Conectar categorías con carreras
+        # Conectar categorías con carreras (cada categoría con los índices de sus carreras, por hash)
         for cat_index, category in self.categories.items():
-            for deg_index, degree in self.degrees.items():
-                if degree in data[category]:  
-                    # Se conecta categoría con carrera
-                    self.add_edge(cat_index, deg_index)  
+            for deg_index in sorted(index for degree in self.catalog.category_degrees[category]
+                                    for index in self.degrees.indices_of(degree)):
+                # Se conecta categoría con carrera
+                self.add_edge(cat_index, deg_index)  
                     
         self.add_student_vertex('Daniel', 'SIS.', 2)
         self.add_student_vertex('Karol', 'ANIM.', 4)
@@ -560,7 +705,140 @@ class Graph:
         self.add_skill_vertex('Arath', 'Escribir')
         self.add_skill_vertex('Jorge', 'Escribir')
         self.add_skill_vertex('Javier', 'Dibujar')
-                    
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para guardar el estado del grafo en un snapshot binario
+    @reader
+    def save_snapshot(self, path) -> None:
+        with span('snapshot'):
+            snapshot.save(self, path)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para importar un bloque de filas (columnas student, degree, semester, skills) en una sola pasada
+    @writer
+    def import_rows(self, chunk) -> dict:
+        with span('import'):
+            summary = importer.import_chunk(self, chunk)
+
+        if summary['rejected']:
+            logger.warning('%d filas rechazadas (carrera desconocida, nombre vacío o semestre inválido)', summary['rejected'])
+
+        # Se registran solo las filas aceptadas, para que repetir el registro produzca los mismos IDs
+        if summary['students']:
+            self.record({'op': 'import', 'id': summary['first_id'], 'rows': summary['rows']})
+
+        return summary
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para importar un archivo CSV o JSONL por bloques; regresa el resumen total
+    def import_file(self, path, chunk_size=importer.CHUNK_SIZE) -> dict:
+        total = {'students': 0, 'skills': 0, 'rejected': 0}
+
+        for chunk in importer.read_chunks(path, chunk_size):
+            summary = self.import_rows(chunk)
+
+            for key in total:
+                total[key] += summary[key]
+
+        return total
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para registrar una mutación en la bitácora (si está abierta); regresa cuando está en disco
+    def record(self, entry) -> None:
+        if self.log is None:
+            return
+
+        # El registro se escribe sin esperar el fsync; el decorador writer lo espera al soltar el candado
+        self.log_sequence += 1
+        self.log.append({'seq': self.log_sequence, **entry}, wait=False)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para aplicar un registro de la bitácora (repetición de la mutación original)
+    @writer
+    def apply_record(self, entry) -> None:
+        if entry['op'] == 'student':
+            student_index = self.add_student_vertex(entry['student'], entry['degree'], entry['semester'])
+
+            # Los IDs se asignan en orden, así que la repetición debe producir el mismo ID
+            if student_index != entry['id']:
+                raise ValueError(f"La bitácora no corresponde al grafo: se esperaba el ID {entry['id']} y se obtuvo {student_index}")
+
+        elif entry['op'] == 'skill':
+            self.add_skill_vertex(entry['student'], entry['skill'], entry['id'])
+
+        elif entry['op'] == 'import':
+            if self.num_nodes != entry['id']:
+                raise ValueError(f"La bitácora no corresponde al grafo: se esperaba el ID {entry['id']} y se obtuvo {self.num_nodes}")
+
+            importer.import_chunk(self, entry['rows'])
+
+        else:
+            raise ValueError(f"Operación desconocida en la bitácora: {entry['op']}")
+
+        self.log_sequence = entry['seq']
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para aplicar los registros pendientes de una bitácora y dejarla abierta para nuevas mutaciones
+    def open_log(self, path) -> int:
+        replayed = 0
+
+        # Primero se toma la bitácora en exclusiva (falla con LogInUseError si otro proceso la tiene abierta)
+        log = WriteAheadLog(path)
+
+        try:
+            with span('replay'):
+                for entry in read_records(path):
+                    if entry['seq'] > self.log_sequence:
+                        self.apply_record(entry)
+                        replayed += 1
+        except Exception:
+            log.close()
+            raise
+
+        self.log = log
+
+        return replayed
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para compactar: guarda un snapshot y descarta de la bitácora lo que ya incluye
+    # Con min_records solo se compacta si la bitácora tiene al menos esos registros (se revisa ya con el candado tomado,
+    # así que varias peticiones que pasan el umbral a la vez compactan una sola vez)
+    @reader
+    def compact(self, path, min_records=0) -> None:
+        with self.compact_lock:
+            if self.log is not None and self.log.records < min_records:
+                return
+            
+            # Solo compacta quien aplicó todas las escrituras de la bitácora: otro proceso con la misma bitácora
+            # (p. ej. el padre del recargador de Flask) guardaría un grafo viejo y borraría registros que no tiene
+            if self.log is not None and not self.log.owned():
+                logger.error('La bitácora %s fue modificada por otro proceso; no se compacta', self.log.path)
+                return
+            
+            self.save_snapshot(path)
+
+            if self.log is not None:
+                self.log.truncate(self.log_sequence)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para crear un grafo a partir de un snapshot (en lugar de start())
+    @classmethod
+    def load_snapshot(cls, path, adjacency=SparseAdjacency):
+        graph = cls(adjacency)
+
+        with span('snapshot'):
+            snapshot.restore(graph, path)
+
+        return graph
+
 #-----------------------------------------------------------------------------------                         
 
 '''
@@ -596,7 +874,10 @@ while run:
     elif option == '3':
         student = input('Ingrese el nombre del estudiante: ')
         skill = input('Ingrese el nombre de la habilidad: ')
-        graph.add_skill_vertex(student, skill)
+        try:
+            graph.add_skill_vertex(student, skill)
+        except ValueError as e:
+            print(e)
         
     elif option == '4':
         student = input('Ingrese el nombre del estudiante: ')
@@ -0,0 +1,251 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from itertools import islice
+
+import numpy as np
+
+import queries
+
+'''
+
+Importación masiva de estudiantes y habilidades
+
+Lee un archivo CSV o JSON Lines por bloques (memoria acotada) y añade cada bloque al grafo
+de una sola vez: valida las carreras con NumPy, reserva todos los vértices nuevos con una
+sola llamada y construye la adyacencia y los índices en bloque, en lugar de repetir
+add_student_vertex / add_skill_vertex por cada fila.
+
+Formato (una fila por estudiante):
+    CSV:    student,degree,semester,skills        (habilidades separadas por ";")
+    JSONL:  {"student": ..., "degree": ..., "semester": ..., "skills": [...]}
+
+Uso:
+    python importer.py alumnos.csv [--chunk-size N] [--snapshot RUTA] [--wal RUTA]
+
+La bitácora tiene un solo dueño, así que el servidor que usa la misma bitácora debe estar detenido.
+
+'''
+
+logger = logging.getLogger(__name__)
+
+# Filas por bloque
+CHUNK_SIZE = 50_000
+
+# Separador de habilidades dentro de una celda CSV
+SKILL_SEPARATOR = ';'
+
+#-----------------------------------------------------------------------------------
+
+#* Función para leer un archivo por bloques; cada bloque son columnas (listas) student, degree, semester, skills
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.jsonl') or path.endswith('.ndjson'):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            # Las filas CSV se leen como tuplas y se nombran con el encabezado (más rápido que DictReader)
+            reader = csv.reader(f)
+            header = next(reader, [])
+            rows = (dict(zip(header, row)) for row in reader)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+
+            if not chunk:
+                return
+
+            yield columns(chunk)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para pasar filas (diccionarios) a columnas; las habilidades quedan como lista sin repetidos
+def columns(rows) -> dict:
+    skills = []
+
+    for row in rows:
+        value = row.get('skills') or []
+
+        if isinstance(value, str):
+            value = value.split(SKILL_SEPARATOR)
+
+        skills.append(list(dict.fromkeys(skill.strip() for skill in value if skill.strip())))
+
+    return {
+        'student': [text(row.get('student')) for row in rows],
+        'degree': [text(row.get('degree')) for row in rows],
+        'semester': [text(row.get('semester')) for row in rows],
+        'skills': skills,
+    }
+
+#-----------------------------------------------------------------------------------
+
+#* Función para normalizar una celda como texto (vacío si falta)
+def text(value) -> str:
+    return '' if value is None else str(value).strip()
+
+#-----------------------------------------------------------------------------------
+
+#* Función para validar un bloque de forma vectorizada; regresa (máscara de filas válidas, índice de su carrera)
+def validate(graph, chunk):
+    names = np.array(chunk['student'], dtype=str)
+    degrees = np.array(chunk['degree'], dtype=str)
+    semesters = np.array(chunk['semester'], dtype=str)
+
+    # Carreras conocidas ordenadas, con el primer índice de cada nombre (precalculadas en el catálogo)
+    known, first_index = graph.catalog.sorted_degrees, graph.catalog.sorted_degree_indices
+    positions = np.clip(np.searchsorted(known, degrees), 0, known.shape[0] - 1)
+
+    valid = (known[positions] == degrees) & (np.char.str_len(names) > 0) & np.char.isdigit(semesters)
+
+    return valid, first_index[positions]
+
+#-----------------------------------------------------------------------------------
+
+#* Función para añadir un bloque al grafo; regresa el resumen del bloque (con las filas aceptadas en 'rows')
+def import_chunk(graph, chunk) -> dict:
+    valid, degree_indices = validate(graph, chunk)
+    rows = np.flatnonzero(valid)
+    quantity = rows.shape[0]
+
+    if not quantity:
+        return {'students': 0, 'skills': 0, 'rejected': int(valid.shape[0]), 'first_id': None, 'rows': None}
+
+    # Filas aceptadas (si todas son válidas se usan las columnas tal cual)
+    if quantity == valid.shape[0]:
+        names, degrees, skill_lists = chunk['student'], chunk['degree'], chunk['skills']
+        semesters = list(map(int, chunk['semester']))
+    else:
+        names = [chunk['student'][row] for row in rows.tolist()]
+        degrees = [chunk['degree'][row] for row in rows.tolist()]
+        semesters = [int(chunk['semester'][row]) for row in rows.tolist()]
+        skill_lists = [chunk['skills'][row] for row in rows.tolist()]
+
+    # Los estudiantes nuevos ocupan los siguientes índices, seguidos de las habilidades nuevas
+    student_ids = graph.num_nodes + np.arange(quantity, dtype=np.int64)
+
+    skill_counts = np.fromiter((len(skills) for skills in skill_lists), dtype=np.int64, count=quantity)
+    skill_owners = np.repeat(student_ids, skill_counts)
+    skill_names = [skill for skills in skill_lists for skill in skills]
+
+    # Cada nombre distinto se resuelve una sola vez (las habilidades son pocas comparadas con las filas)
+    lookup = dict.fromkeys(skill_names)
+    new_skills = []
+
+    for skill in lookup:
+        skill_index = graph.skills.index_of(skill)
+
+        if skill_index is None:
+            skill_index = graph.num_nodes + quantity + len(new_skills)
+            new_skills.append((skill_index, skill))
+
+        lookup[skill] = skill_index
+
+    skill_targets = np.fromiter(map(lookup.__getitem__, skill_names), dtype=np.int64, count=len(skill_names))
+
+    # Una sola reserva de vértices para todo el bloque
+    graph.add_vertex(quantity + len(new_skills))
+    graph.num_nodes += quantity + len(new_skills)
+
+    # Índices de nombres y atributos de los estudiantes
+    graph.students.update(zip(student_ids.tolist(), names))
+    graph.students_semesters.update(zip(student_ids.tolist(), semesters))
+    graph.students_degrees.update(zip(student_ids.tolist(), degrees))
+
+    # Vocabulario de habilidades
+    for skill_index, skill in new_skills:
+        graph.skills[skill_index] = skill
+        graph.skill_students[skill_index] = set()
+        graph.skill_bits[skill_index] = len(graph.skill_vocabulary)
+        graph.skill_vocabulary.append(skill_index)
+
+    # Aristas estudiante -> carrera (peso = semestre) y estudiante -> habilidad (peso 1)
+    sources = np.concatenate([student_ids, skill_owners])
+    targets = np.concatenate([degree_indices[rows], skill_targets])
+    weights = np.concatenate([np.array(semesters, dtype=np.int64), np.ones(skill_owners.shape[0], dtype=np.int64)])
+
+    graph.adjacency.add_edges(sources, targets, weights)
+    graph.oracle.add_edges(sources, targets, weights)
+    graph.version += 1
+
+    # Las aristas nuevas pasan por las carreras y habilidades del bloque; se descartan las consultas que las tocan
+    # (y las que nombran a un alumno con el mismo nombre que uno nuevo)
+    touched = {graph.view_label(node) for node in np.unique(targets).tolist()}
+    graph.queries.invalidate(graph.version - 1, graph.version, touched | set(map(queries.student_name, names)))
+
+    # Índice invertido habilidad -> estudiantes (agrupado por habilidad)
+    order = np.argsort(skill_targets, kind='stable')
+    groups, starts = np.unique(skill_targets[order], return_index=True)
+    for skill_index, owners in zip(groups.tolist(), np.split(skill_owners[order], starts[1:])):
+        graph.skill_students[skill_index].update(owners.tolist())
+
+    # Bitsets de habilidades: empaquetados en uint64 (arreglos vectorizados) y como int de Python (grafo)
+    bit_numbers = np.array(list(map(graph.skill_bits.__getitem__, skill_targets.tolist())), dtype=np.int64)
+    packed = np.zeros((quantity, max(1, (len(graph.skill_vocabulary) + 63) // 64)), dtype=np.uint64)
+    np.bitwise_or.at(packed, (skill_owners - student_ids[0], bit_numbers // 64), np.left_shift(np.uint64(1), (bit_numbers % 64).astype(np.uint64)))
+
+    owners = np.flatnonzero(skill_counts)
+    bitsets = packed[owners, 0].tolist()
+    for word in range(1, packed.shape[1]):
+        bitsets = [bits | (value << (64 * word)) for bits, value in zip(bitsets, packed[owners, word].tolist())]
+    graph.students_skills.update(zip(student_ids[owners].tolist(), bitsets))
+
+    positions = graph.attributes.extend(student_ids, degrees, semesters)
+    graph.attributes.set_packed_skills(positions, packed)
+    graph.mst_tree.touch_many(positions.tolist())
+
+    accepted = {'student': names, 'degree': degrees, 'semester': [str(semester) for semester in semesters], 'skills': skill_lists}
+
+    return {'students': int(quantity), 'skills': len(new_skills), 'rejected': int(valid.shape[0] - quantity),
+            'first_id': int(student_ids[0]), 'rows': accepted}
+
+#-----------------------------------------------------------------------------------
+
+#* Importación desde la terminal: snapshot + bitácora -> importar -> compactar
+def main() -> None:
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description='Importación masiva de estudiantes (CSV o JSONL)')
+    parser.add_argument('path', help='Archivo .csv o .jsonl')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--snapshot', default=os.environ.get('EDYA_SNAPSHOT', os.path.join(base_dir, 'graph_snapshot.npz')))
+    parser.add_argument('--wal', default=os.environ.get('EDYA_WAL', os.path.join(base_dir, 'graph_wal.jsonl')))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.environ.get('EDYA_LOG_LEVEL', 'WARNING').upper(),
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    # grapher importa este módulo, así que la clase se importa aquí
+    from grapher import Graph
+    from wal import LogInUseError
+
+    # Se parte del mismo estado con el que arrancaría el servidor
+    if os.path.exists(args.snapshot):
+        graph = Graph.load_snapshot(args.snapshot)
+    else:
+        graph = Graph()
+        graph.start()
+
+    # La bitácora tiene un solo dueño: si el servidor la tiene abierta, se importaría con secuencias repetidas
+    try:
+        graph.open_log(args.wal)
+    except LogInUseError as e:
+        parser.exit(1, f'{e}\nDetén el servidor antes de importar o usa otra bitácora con --wal y --snapshot\n')
+
+    start = time.perf_counter()
+    summary = graph.import_file(args.path, args.chunk_size)
+    seconds = time.perf_counter() - start
+
+    graph.compact(args.snapshot)
+    graph.log.close()
+
+    print(f"{summary['students']} estudiantes, {summary['skills']} habilidades nuevas, "
+          f"{summary['rejected']} filas rechazadas en {seconds:.2f} s")
+
+    return
+
+
+if __name__ == '__main__':
+    main()
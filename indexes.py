@@ -0,0 +1,127 @@
+from collections.abc import Set
+
+'''
+
+Índices bidireccionales del grafo
+
+NameIndex se comporta como el diccionario original índice -> nombre (students, skills,
+degrees, categories), pero además mantiene el mapa inverso nombre -> índices, de modo que
+buscar un nodo por su nombre es un acceso a una tabla hash en lugar de recorrer .items().
+
+Los nombres no son únicos (puede haber varios alumnos con el mismo nombre), por lo que el
+mapa inverso guarda la lista de índices en orden de inserción.
+
+SetView envuelve un conjunto del grafo para entregarlo sin copiarlo: permite consultar
+pertenencia (O(1)), tamaño e iterar, pero no modificarlo.
+
+'''
+
+#* Diccionario índice -> nombre que mantiene sincronizado su mapa inverso en cada modificación
+class NameIndex(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.ids = {}                                               # Nombre -> lista de índices
+        self.update(*args, **kwargs)
+
+    #-----------------------------------------------------------------------------
+
+    def __setitem__(self, index, name) -> None:
+
+        # Si el índice ya tenía un nombre, se quita del mapa inverso antes de reemplazarlo
+        if index in self:
+            self._unlink(index)
+
+        super().__setitem__(index, name)
+        self.ids.setdefault(name, []).append(index)
+
+    def __delitem__(self, index) -> None:
+        self._unlink(index)
+        super().__delitem__(index)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para quitar un índice del mapa inverso
+    def _unlink(self, index) -> None:
+        name = dict.__getitem__(self, index)
+        indices = self.ids[name]
+        indices.remove(index)
+
+        if not indices:
+            del self.ids[name]
+
+    #-----------------------------------------------------------------------------
+
+    #* Métodos de dict que modifican el contenido, redirigidos para mantener el mapa inverso
+    def update(self, *args, **kwargs) -> None:
+        items = dict(*args, **kwargs)
+
+        # Se quitan del mapa inverso los índices que se reemplazan y luego se inserta todo en bloque
+        for index in items.keys() & self.keys():
+            self._unlink(index)
+
+        super().update(items)
+
+        for index, name in items.items():
+            self.ids.setdefault(name, []).append(index)
+
+    def setdefault(self, index, name=None):
+        if index not in self:
+            self[index] = name
+
+        return self[index]
+
+    def pop(self, index, *default):
+        if index in self:
+            name = self[index]
+            del self[index]
+            return name
+
+        if default:
+            return default[0]
+
+        raise KeyError(index)
+
+    def popitem(self):
+        index, name = next(reversed(self.items()))
+        del self[index]
+
+        return index, name
+
+    def clear(self) -> None:
+        super().clear()
+        self.ids.clear()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para saber si existe algún nodo con ese nombre (O(1))
+    def has_name(self, name) -> bool:
+        return name in self.ids
+
+    #* Método para obtener todos los índices con ese nombre (lista vacía si no existe)
+    def indices_of(self, name) -> list:
+        return list(self.ids.get(name, ()))
+
+    #* Método para obtener el primer índice con ese nombre (None si no existe)
+    def index_of(self, name):
+        indices = self.ids.get(name)
+
+        return indices[0] if indices else None
+
+#-----------------------------------------------------------------------------------
+
+#* Vista de solo lectura de un conjunto (sin copia: refleja los cambios del conjunto original)
+class SetView(Set):
+    def __init__(self, items):
+        self._items = items
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f'SetView({self._items!r})'
@@ -0,0 +1,139 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+'''
+
+Trabajos en segundo plano para los cálculos pesados (MST, figuras completas)
+
+Cada cálculo se envía a un ejecutor con un número fijo de hilos y recibe un ID. Los
+trabajos se identifican además por una clave (vista, versión del grafo): si llega otra
+petición con la misma clave mientras el trabajo está pendiente (o ya terminó), se regresa
+el mismo trabajo en lugar de calcular otra vez, así que cien recargas de /prim con el
+grafo sin cambios hacen un solo cálculo.
+
+Una petición puede esperar el resultado (wait) o regresar el ID de inmediato; el cliente
+consulta el estado en /jobs/<id> o recibe el aviso por server-sent events.
+
+'''
+
+logger = logging.getLogger(__name__)
+
+# Hilos del ejecutor (cálculos pesados en paralelo como máximo); configurable con EDYA_JOB_WORKERS
+WORKERS = int(os.environ.get('EDYA_JOB_WORKERS', '2'))
+
+# Trabajos terminados que se conservan (los más viejos se olvidan)
+MAX_FINISHED = 64
+
+#-----------------------------------------------------------------------------------
+
+#* Un cálculo en segundo plano: estado, resultado (o error) y aviso al terminar
+class Job:
+    def __init__(self, job_id, key, info=None):
+        self.id = job_id                                            # ID público del trabajo
+        self.key = key                                              # Clave de agrupación (vista, versión del grafo)
+        self.info = info or {}                                      # Datos para responder con el resultado (p. ej. tipo MIME)
+        self.status = 'pending'                                     # pending -> running -> done | failed
+        self.result = None
+        self.error = None
+        self.spans = []                                             # Tiempos por etapa del cálculo (si la cola traza)
+        self.created = time.time()
+        self.finished = threading.Event()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para esperar a que termine (regresa False si se agotó el tiempo)
+    def wait(self, timeout=None) -> bool:
+        return self.finished.wait(timeout)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para describir el trabajo (respuesta JSON de /jobs/<id>)
+    def describe(self) -> dict:
+        description = {'id': self.id, 'status': self.status}
+
+        if self.error is not None:
+            description['error'] = self.error
+
+        return description
+
+#-----------------------------------------------------------------------------------
+
+#* Ejecutor de trabajos con agrupación por clave
+class JobQueue:
+    def __init__(self, workers=WORKERS, trace=False):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self.trace = trace                                          # Si se miden las etapas de cada trabajo (tracing.span)
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()                                   # ID -> trabajo (en orden de creación)
+        self.by_key = {}                                            # Clave -> trabajo vigente
+        self.ids = itertools.count(1)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para enviar un cálculo; si ya hay un trabajo con la misma clave (y no falló) se regresa ese
+    def submit(self, key, function, info=None) -> Job:
+        with self.lock:
+            job = self.by_key.get(key)
+
+            if job is not None and job.status != 'failed':
+                return job
+
+            job = Job(f'{next(self.ids):x}', key, info)
+            self.jobs[job.id] = job
+            self.by_key[key] = job
+            self._forget_finished()
+
+        self.executor.submit(self._run, job, function)
+
+        return job
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener un trabajo por su ID (None si no existe o ya se olvidó)
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar: ejecuta el cálculo y avisa a quien espera
+    # Los spans se miden en el hilo del trabajo; se guardan en el trabajo para que la petición los publique
+    def _run(self, job, function) -> None:
+        job.status = 'running'
+
+        if self.trace:
+            tracing.start_request()
+
+        try:
+            job.result = function()
+            job.status = 'done'
+
+        except Exception as e:
+            logger.exception('Falló el trabajo %s %s', job.id, job.key)
+            job.error = str(e)
+            job.status = 'failed'
+
+        finally:
+            if self.trace:
+                job.spans = tracing.finish_request()
+                logger.info('Trabajo %s %s: %s', job.id, job.key, tracing.server_timing(job.spans))
+
+            job.finished.set()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar (con el candado tomado): olvida los trabajos terminados más viejos
+    def _forget_finished(self) -> None:
+        finished = [job for job in self.jobs.values() if job.finished.is_set()]
+
+        for job in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del self.jobs[job.id]
+
+            if self.by_key.get(job.key) is job:
+                del self.by_key[job.key]
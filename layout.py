@@ -0,0 +1,187 @@
+import os
+import threading
+from collections import deque
+
+import networkx as nx
+import numpy as np
+
+from adjacency import csr_arrays
+
+'''
+
+Posiciones de los nodos para dibujar los grafos
+
+spring_layout es iterativo y cuesta O(V²) por iteración; recalcularlo en cada petición de
+/graph o /prim domina el tiempo de respuesta y, sin semilla, el dibujo cambia cada vez.
+
+El layout radial coloca el árbol IBERO -> categoría -> carrera -> estudiante -> habilidad en
+anillos concéntricos (un anillo por nivel del BFS desde la raíz) y reparte el ángulo de cada
+nodo entre sus hijos en proporción a sus hojas: O(V + E) y determinista.
+
+Las posiciones se guardan por versión del grafo; con EDYA_LAYOUT=spring se usa spring_layout,
+partiendo de las posiciones anteriores cuando solo se añadieron unos pocos nodos.
+
+'''
+
+# Layout por defecto ('radial' o 'spring')
+METHOD = os.environ.get('EDYA_LAYOUT', 'radial')
+
+# Spring: si los nodos nuevos son a lo más esta fracción, se parte de las posiciones anteriores
+WARM_FRACTION = 0.1
+
+# Spring: iteraciones al partir de posiciones anteriores (el default de NetworkX es 50)
+WARM_ITERATIONS = 10
+
+#-----------------------------------------------------------------------------------
+
+#* Layout radial de un grafo dado como arreglo de aristas (E x 2) sobre los nodos 0..N-1; regresa un arreglo N x 2 en [-1, 1]
+# El árbol es el BFS desde root; sin raíz se usa el centro de cada componente y los componentes extra cuelgan de una raíz virtual
+def radial_array(num_nodes, edges, root=None) -> np.ndarray:
+    indptr, indices, _ = csr_arrays(num_nodes, edges[:, 0], edges[:, 1], np.ones(edges.shape[0], dtype=np.int8))
+    indptr, indices = indptr.tolist(), indices.tolist()
+
+    pos = tree_positions(range(num_nodes), lambda node: indices[indptr[node]:indptr[node + 1]], root)
+
+    return np.array([pos[node] for node in range(num_nodes)], dtype=np.float64).reshape(num_nodes, 2)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para calcular el layout radial a partir de los nodos y una función de vecinos
+def tree_positions(nodes, neighbors, root=None) -> dict:
+    if not nodes:
+        return {}
+
+    # Árbol BFS: hijos (en el orden de los vecinos) y orden de visita
+    children = {}
+    depth = {}
+    order = []
+    roots = []
+
+    for start in ([root] if root is not None else []) + list(nodes):
+        if start in depth:
+            continue
+
+        start = start if start == root else tree_center(neighbors, start)
+        roots.append(start)
+        depth[start] = 0
+        children[start] = []
+        queue = deque([start])
+
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+
+            for neighbor in neighbors(node):
+                if neighbor not in depth:
+                    depth[neighbor] = depth[node] + 1
+                    children[neighbor] = []
+                    children[node].append(neighbor)
+                    queue.append(neighbor)
+
+    # Con varios componentes, sus raíces forman el primer anillo alrededor del centro
+    offset = 0 if len(roots) == 1 else 1
+
+    # Hojas por subárbol (de abajo hacia arriba): cada nodo recibe un ángulo proporcional
+    leaves = {}
+    for node in reversed(order):
+        leaves[node] = sum(leaves[child] for child in children[node]) or 1
+
+    # Intervalo angular de cada nodo (de arriba hacia abajo)
+    span = {}
+    start_angle = 0.0
+    total = sum(leaves[node] for node in roots)
+    for node in roots:
+        width = 2 * np.pi * leaves[node] / total
+        span[node] = (start_angle, width)
+        start_angle += width
+
+    radius = max(max(depth.values()) + offset, 1)
+    pos = {}
+
+    for node in order:
+        start_angle, width = span[node]
+        angle = start_angle + width / 2
+        distance = (depth[node] + offset) / radius
+        pos[node] = np.array([distance * np.cos(angle), distance * np.sin(angle)])
+
+        for child in children[node]:
+            child_width = width * leaves[child] / leaves[node]
+            span[child] = (start_angle, child_width)
+            start_angle += child_width
+
+    return pos
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener el centro (punto medio del camino más largo) del componente de start, con dos BFS
+def tree_center(neighbors, start):
+    farthest, _ = bfs_parents(neighbors, start)
+    other, parents = bfs_parents(neighbors, farthest)
+
+    path = [other]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+
+    return path[len(path) // 2]
+
+#* Función auxiliar: BFS desde start; regresa (último nodo visitado, padres)
+def bfs_parents(neighbors, start):
+    parents = {start: None}
+    queue = deque([start])
+    node = start
+
+    while queue:
+        node = queue.popleft()
+        for neighbor in neighbors(node):
+            if neighbor not in parents:
+                parents[neighbor] = node
+                queue.append(neighbor)
+
+    return node, parents
+
+#-----------------------------------------------------------------------------------
+
+#* Caché de posiciones por nombre de dibujo ('graph', 'mst', ...) y versión del grafo
+class LayoutCache:
+    def __init__(self, method=None):
+        self.method = method or METHOD                              # 'radial' o 'spring'
+        self.entries = {}                                           # Nombre -> (versión, posiciones)
+        self.lock = threading.Lock()                                # Las consultas en paralelo comparten la caché
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener las posiciones (arreglo N x 2) de un grafo dado como aristas sobre los nodos 0..N-1
+    # Los nodos solo se añaden al final, así que el índice de cada nodo se conserva entre versiones
+    def array_positions(self, name, version, num_nodes, edges, root=None) -> np.ndarray:
+        with self.lock:
+            previous = self.entries.get(name)
+
+            if previous is not None and previous[0] == version:
+                return previous[1]
+
+            if self.method == 'spring':
+                G = nx.Graph()
+                G.add_nodes_from(range(num_nodes))
+                G.add_edges_from(edges.tolist())
+
+                known = dict(enumerate(previous[1])) if previous is not None else None
+                pos = self.spring(G, known)
+                pos = np.array([pos[node] for node in range(num_nodes)], dtype=np.float64).reshape(num_nodes, 2)
+            else:
+                pos = radial_array(num_nodes, edges, root)
+
+            self.entries[name] = (version, pos)
+
+            return pos
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar: spring_layout con semilla, partiendo de las posiciones anteriores si cambió poco
+    def spring(self, G, previous) -> dict:
+        if previous:
+            known = {node: previous[node] for node in G if node in previous}
+
+            if len(G) - len(known) <= WARM_FRACTION * len(G):
+                return nx.spring_layout(G, pos=known or None, iterations=WARM_ITERATIONS, seed=42)
+
+        return nx.spring_layout(G, seed=42)
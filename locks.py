@@ -0,0 +1,119 @@
+import threading
+from contextlib import contextmanager
+
+'''
+
+Candado de lectores/escritor para el grafo compartido del servidor
+
+Muchas consultas pueden leer el grafo a la vez; una mutación espera a que terminen las
+lecturas en curso y las nuevas lecturas esperan a que termine la mutación. Los turnos se
+alternan por fases: si hay un escritor esperando no entran lectores nuevos, y al terminar
+una escritura entran todos los lectores que estaban esperando antes que el siguiente
+escritor, así que ni una ráfaga de consultas ni una de altas deja esperando a la otra.
+
+Ambos modos son reentrantes dentro del mismo hilo: una consulta puede llamar a otra y una
+mutación puede leer (o llamar a otra mutación) sin bloquearse a sí misma. Lo único que no
+se permite es pasar de lectura a escritura, porque dos hilos haciéndolo se bloquearían
+mutuamente.
+
+'''
+
+#* Candado de muchos lectores / un escritor, reentrante por hilo
+class ReadWriteLock:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0                                            # Hilos leyendo
+        self.writer = None                                          # Hilo que escribe (identificador)
+        self.waiting_writers = 0                                    # Escritores esperando turno
+        self.waiting_readers = 0                                    # Lectores esperando turno
+        self.releases = 0                                           # Escrituras terminadas (marca la llegada de cada lector)
+        self.priority_readers = 0                                   # Lectores que esperaban cuando terminó la última escritura
+        self.local = threading.local()                              # Profundidad de lectura/escritura del hilo actual
+
+    #-----------------------------------------------------------------------------
+
+    #* Contexto de lectura (se comparte con otros lectores)
+    @contextmanager
+    def read(self):
+        depth = getattr(self.local, 'reads', 0)
+
+        # Lectura anidada (o dentro de una escritura del mismo hilo): ya se tiene acceso
+        if depth or self.owns_write():
+            self.local.reads = depth + 1
+            try:
+                yield
+            finally:
+                self.local.reads = depth
+            return
+
+        with self.condition:
+            arrival = self.releases
+            self.waiting_readers += 1
+            try:
+                # Un lector que llegó antes de la última escritura pasa aunque haya escritores esperando
+                while self.writer is not None or (self.waiting_writers and arrival == self.releases):
+                    self.condition.wait()
+            finally:
+                self.waiting_readers -= 1
+
+            self.readers += 1
+
+            # Al entrar el último de los lectores con prioridad, vuelve el turno de los escritores
+            if arrival != self.releases and self.priority_readers:
+                self.priority_readers -= 1
+                if not self.priority_readers:
+                    self.condition.notify_all()
+
+        self.local.reads = 1
+        try:
+            yield
+        finally:
+            self.local.reads = 0
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    #-----------------------------------------------------------------------------
+
+    #* Contexto de escritura (exclusivo)
+    @contextmanager
+    def write(self):
+        depth = getattr(self.local, 'writes', 0)
+
+        if depth:
+            self.local.writes = depth + 1
+            try:
+                yield
+            finally:
+                self.local.writes = depth
+            return
+
+        if getattr(self.local, 'reads', 0):
+            raise RuntimeError('No se puede pasar de lectura a escritura sobre el grafo')
+
+        with self.condition:
+            self.waiting_writers += 1
+            try:
+                while self.writer is not None or self.readers or self.priority_readers:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writer = threading.get_ident()
+
+        self.local.writes = 1
+        try:
+            yield
+        finally:
+            self.local.writes = 0
+            with self.condition:
+                self.writer = None
+                self.releases += 1
+                self.priority_readers = self.waiting_readers
+                self.condition.notify_all()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para saber si el hilo actual tiene el candado de escritura
+    def owns_write(self) -> bool:
+        return getattr(self.local, 'writes', 0) > 0
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+
+import layout
+from figures import CATEGORY, DEGREE, STUDENT, SKILL, CLUSTER
+
+'''
+
+Vista resumida (nivel de detalle) del grafo para dibujarlo
+
+Con miles de nodos el dibujo completo es ilegible y lento de serializar. La vista resumida
+muestra la jerarquía (categorías y carreras) y un nodo "cúmulo" por carrera con el número
+de estudiantes; las carreras (o todas las de una categoría) indicadas en expand se abren y
+muestran a sus estudiantes con sus habilidades, hasta NODE_BUDGET nodos visibles.
+
+Los estudiantes de una carrera son sus vecinos en la adyacencia (los índices mayores a la
+jerarquía), así que el costo depende de los nodos visibles y no del tamaño del grafo.
+
+'''
+
+# Nodos visibles como máximo; un grafo más grande se dibuja con la vista resumida
+NODE_BUDGET = int(os.environ.get('EDYA_NODE_BUDGET', '2000'))
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener los índices de las carreras a abrir (nombres de carreras o de categorías)
+def expanded_degrees(graph, names) -> set:
+    degrees = set()
+
+    for name in names:
+        if graph.categories.has_name(name):
+            for degree in graph.catalog.category_degrees[name]:
+                degrees.update(graph.degrees.indices_of(degree))
+
+        if graph.degrees.has_name(name):
+            degrees.update(graph.degrees.indices_of(name))
+
+    return degrees
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener la vista resumida como arreglos (mismo formato que Graph.get_graph_data)
+def graph_data(graph, expand=(), budget=NODE_BUDGET) -> dict:
+    first_student = len(graph.categories) + len(graph.degrees)
+    aliases = graph.hierarchy_aliases()
+    opened = expanded_degrees(graph, expand)
+
+    labels, types, names = [], [], []
+    position = {}                                                   # Nodo (índice del grafo o ('cluster', carrera)) -> posición visible
+    edges = {}                                                      # (posición, posición) -> peso
+
+    def add_node(key, label, kind, name=''):
+        position[key] = len(labels)
+        labels.append(label)
+        types.append(kind)
+        names.append(name)
+
+    def add_edge(u, v, weight):
+        u, v = position[u], position[v]
+        if u != v:
+            edges.setdefault((min(u, v), max(u, v)), weight)
+
+    # Jerarquía: categorías y carreras (las que comparten nombre con una categoría se dibujan como la categoría)
+    for index, name in graph.categories.items():
+        add_node(index, name, CATEGORY, name)
+
+    for index, name in graph.degrees.items():
+        if index in aliases:
+            position[index] = position[aliases[index]]
+        else:
+            add_node(index, name, DEGREE, name)
+
+    for index in graph.categories:
+        neighbors, weights = graph.adjacency.neighbors(index)
+        for neighbor, weight in zip(neighbors.tolist(), weights.tolist()):
+            if neighbor < first_student:
+                add_edge(index, neighbor, weight)
+
+    # Estudiantes de cada carrera (vecinos fuera de la jerarquía), con su semestre como peso
+    members = {}
+    for index in graph.degrees:
+        neighbors, weights = graph.adjacency.neighbors(index)
+        mask = neighbors >= first_student
+        if mask.any():
+            members[index] = (neighbors[mask], weights[mask])
+
+    # Los cúmulos siempre se muestran; el resto del presupuesto es para las carreras abiertas
+    remaining = budget - len(labels) - len(members)
+
+    for index, (students, semesters) in members.items():
+        name = graph.degrees[index]
+        shown = 0
+
+        if index in opened and remaining > 0:
+            for student, semester in zip(students.tolist(), semesters.tolist()):
+                if remaining <= 0:
+                    break
+
+                add_node(student, graph.student_label(student), STUDENT)
+                add_edge(index, student, semester)
+                remaining -= 1
+                shown += 1
+
+                # Habilidades del estudiante (cada habilidad se dibuja una sola vez)
+                neighbors, weights = graph.adjacency.neighbors(student)
+                for skill, weight in zip(neighbors.tolist(), weights.tolist()):
+                    if skill in graph.skills:
+                        if skill not in position:
+                            if remaining <= 0:
+                                continue
+                            add_node(skill, graph.skills[skill], SKILL)
+                            remaining -= 1
+                        add_edge(student, skill, weight)
+
+        rest = students.shape[0] - shown
+        if rest:
+            label = f'{name} (+{rest} estudiantes)' if shown else f'{name} ({rest} estudiantes)'
+            add_node(('cluster', index), label, CLUSTER, name)
+            add_edge(index, ('cluster', index), rest)
+
+    pairs = np.array(list(edges), dtype=np.int64).reshape(len(edges), 2)
+
+    # Las posiciones de la vista sin abrir se guardan por versión; las vistas abiertas son pequeñas y se calculan
+    if opened:
+        pos = layout.radial_array(len(labels), pairs, root=0)
+    else:
+        pos = graph.layouts.array_positions('lod', graph.version, len(labels), pairs, root=0)
+
+    return {'title': 'Grafo de estudiantes y carreras (vista resumida)', 'version': graph.version, 'labels': labels,
+            'names': names, 'types': np.array(types, dtype=np.uint8), 'positions': pos, 'edges': pairs,
+            'weights': np.array(list(edges.values()), dtype=np.float64)}
@@ -0,0 +1,184 @@
+import numpy as np
+
+import similarity
+
+'''
+
+Árbol de Expansión Mínima sobre el grafo implícito de similitud
+
+El grafo de estudiantes es completo: el peso entre dos alumnos se obtiene de sus atributos
+(carrera, semestre y habilidades), así que no hace falta guardar la matriz N x N ni crear
+un grafo de NetworkX con N²/2 aristas. Prim denso calcula, en cada paso, los pesos desde el
+último vértice añadido hacia todos los demás: O(N²) tiempo y O(N) memoria.
+
+'''
+
+#* Algoritmo de Prim denso; regresa la lista de aristas (i, j, peso) con índices de posición en los arreglos
+def prim(degree_codes, semester_codes, skills) -> list:
+    students_quantity = degree_codes.shape[0]
+    edges = []
+
+    if students_quantity < 2:
+        return edges
+
+    # Tabla coincidencia -> peso (mismo redondeo que Graph.weight)
+    table = similarity.weight_table(similarity.SKILL_POINTS * 64 * skills.shape[1]
+                                    + similarity.DEGREE_POINTS + similarity.SEMESTER_POINTS)
+
+    # Mejor peso conocido para conectar cada vértice al árbol, y el vértice del árbol que lo logra
+    best = np.full(students_quantity, np.inf)
+    parent = np.full(students_quantity, -1, dtype=np.int64)
+    in_tree = np.zeros(students_quantity, dtype=bool)
+    everyone = np.arange(students_quantity)
+
+    current = 0
+    in_tree[current] = True
+
+    for _ in range(students_quantity - 1):
+
+        # Pesos desde el vértice recién añadido hacia todos los demás
+        weights = table[similarity.coincidence_block(np.array([current]), everyone, degree_codes, semester_codes, skills)[0]]
+
+        # Un peso de 0 no es arista (igual que en getMST original, que solo conectaba pesos > 0)
+        weights[weights <= 0] = np.inf
+
+        improved = ~in_tree & (weights < best)
+        best[improved] = weights[improved]
+        parent[improved] = current
+
+        # Se elige el vértice fuera del árbol con la arista más ligera
+        candidates = np.where(in_tree, np.inf, best)
+        current = int(np.argmin(candidates))
+
+        # Si no hay arista hacia el resto, se empieza un nuevo componente (bosque de expansión)
+        if np.isfinite(candidates[current]):
+            edges.append((int(parent[current]), current, float(best[current])))
+        else:
+            current = int(np.flatnonzero(~in_tree)[0])
+
+        in_tree[current] = True
+
+    return edges
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener el peso total de un árbol
+def total_weight(edges) -> float:
+    return float(sum(weight for _, _, weight in edges))
+
+#-----------------------------------------------------------------------------------
+
+#* Algoritmo de Kruskal sobre una lista de aristas candidatas (arreglos u, v, peso); regresa el bosque mínimo
+def kruskal(vertices_quantity, sources, targets, weights) -> list:
+    parent = list(range(vertices_quantity))
+
+    # Búsqueda con compresión de camino
+    def find(vertex):
+        root = vertex
+        while parent[root] != root:
+            root = parent[root]
+        while parent[vertex] != root:
+            parent[vertex], vertex = root, parent[vertex]
+        return root
+
+    edges = []
+    order = np.argsort(weights, kind='stable')
+
+    for u, v, weight in zip(sources[order].tolist(), targets[order].tolist(), weights[order].tolist()):
+        root_u, root_v = find(u), find(v)
+
+        if root_u != root_v:
+            parent[root_u] = root_v
+            edges.append((u, v, weight))
+
+            if len(edges) == vertices_quantity - 1:
+                break
+
+    return edges
+
+#-----------------------------------------------------------------------------------
+
+#* MST que se mantiene de forma incremental cuando se añaden estudiantes o habilidades
+class IncrementalMST:
+
+    # Si cambió más de esta fracción de los estudiantes, es más barato recalcular con Prim
+    REBUILD_FRACTION = 0.1
+
+    def __init__(self, attributes):
+        self.attributes = attributes                                # StudentAttributes del grafo (compartido)
+        self.edges = []                                             # Aristas del árbol (posición, posición, peso)
+        self.pending = set()                                        # Posiciones añadidas o modificadas desde el último cálculo
+        self.built = False                                          # Si self.edges corresponde a algún cálculo previo
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para marcar a un estudiante (nuevo o con habilidades nuevas) como pendiente de reparar
+    def touch(self, position) -> None:
+        self.pending.add(position)
+
+    #* Método para marcar a varios estudiantes a la vez (carga masiva)
+    def touch_many(self, positions) -> None:
+        self.pending.update(positions)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para usar un árbol ya calculado (p. ej. el de una versión publicada) sin recalcularlo
+    def adopt(self, edges) -> None:
+        self.edges = edges
+        self.built = True
+        self.pending.clear()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener el árbol actual, reparándolo solo donde hubo cambios
+    def tree(self) -> list:
+        students_quantity = self.attributes.size
+
+        if not self.built or len(self.pending) > max(1, self.REBUILD_FRACTION * students_quantity):
+            self.edges = prim(*self.attributes.arrays())
+            self.built = True
+
+        elif self.pending:
+            self._repair()
+
+        self.pending.clear()
+
+        return self.edges
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para reparar el árbol
+    # Añadir un vértice o bajar el peso de sus aristas (más coincidencias) solo puede cambiar el árbol
+    # a través de esas aristas, así que el nuevo MST está contenido en: árbol actual + aristas de los pendientes
+    def _repair(self) -> None:
+        degree_codes, semester_codes, skills = self.attributes.arrays()
+        students_quantity = degree_codes.shape[0]
+        everyone = np.arange(students_quantity)
+        pending = np.array(sorted(self.pending), dtype=np.int64)
+        is_pending = np.zeros(students_quantity, dtype=bool)
+        is_pending[pending] = True
+
+        table = similarity.weight_table(similarity.SKILL_POINTS * 64 * skills.shape[1]
+                                        + similarity.DEGREE_POINTS + similarity.SEMESTER_POINTS)
+
+        # Aristas del árbol que no tocan a ningún pendiente (su peso no cambió)
+        kept = [edge for edge in self.edges if not is_pending[edge[0]] and not is_pending[edge[1]]]
+        sources = [np.array([edge[0] for edge in kept], dtype=np.int64)]
+        targets = [np.array([edge[1] for edge in kept], dtype=np.int64)]
+        weights = [np.array([edge[2] for edge in kept], dtype=float)]
+
+        # Estrella de cada pendiente (sin repetir la arista entre dos pendientes)
+        for position in pending.tolist():
+            star = table[similarity.coincidence_block(np.array([position]), everyone, degree_codes, semester_codes, skills)[0]]
+
+            # Un peso que bajó hasta 0 deja de ser arista: eso no es una mejora, así que se recalcula todo
+            if (star[everyone != position] <= 0).any():
+                self.edges = prim(degree_codes, semester_codes, skills)
+                return
+
+            mask = (everyone != position) & (~is_pending | (everyone > position))
+            sources.append(np.full(int(mask.sum()), position, dtype=np.int64))
+            targets.append(everyone[mask])
+            weights.append(star[mask])
+
+        self.edges = kruskal(students_quantity, np.concatenate(sources), np.concatenate(targets), np.concatenate(weights))
@@ -0,0 +1,263 @@
+import heapq
+import os
+import threading
+from collections import OrderedDict
+from itertools import count
+
+import numpy as np
+
+'''
+
+Oráculo de distancias estudiante -> habilidad
+
+Las consultas de la interfaz siempre terminan en un nodo de habilidad, y hay muy pocas
+habilidades comparadas con el número de estudiantes. Por eso cada habilidad funciona como
+"hub": se guarda un árbol de caminos más cortos que sale de ella (distancia y siguiente
+salto de cada nodo hacia la habilidad). Una consulta es entonces una lectura O(1) de la
+distancia y O(largo del camino) para reconstruirlo, sin ejecutar ninguna búsqueda.
+
+Las mutaciones del grafo solo añaden vértices y aristas, lo que únicamente puede acortar
+distancias; por eso los árboles se actualizan de forma incremental (se relajan las aristas
+nuevas y se propaga la mejora) en la siguiente consulta.
+
+Cada árbol ocupa dos arreglos del tamaño del grafo, así que no se guardan todos: el árbol
+de una habilidad se calcula la primera vez que se consulta y se conservan solo los
+TREE_LIMIT más recientes (LRU). La memoria queda acotada a TREE_LIMIT x capacidad x 16 bytes
+(la capacidad es a lo más el doble de los vértices); una habilidad descartada se vuelve a
+calcular (un Dijkstra) si se consulta de nuevo.
+
+'''
+
+# Árboles guardados como máximo; configurable con EDYA_ORACLE_TREES
+TREE_LIMIT = int(os.environ.get('EDYA_ORACLE_TREES', '32'))
+
+#* Oráculo de distancias precalculadas desde los nodos de habilidad consultados
+class DistanceOracle:
+
+    # Si se acumularon más aristas nuevas que esta fracción de los vértices, se recalcula todo
+    REBUILD_FRACTION = 0.25
+
+    def __init__(self, adjacency, aliases=None, limit=TREE_LIMIT):
+        self.adjacency = adjacency                                  # Backend de adyacencia del grafo (solo lectura)
+        self.canonical = dict(aliases or {})                        # Vértice -> representante (nodos fusionados por nombre)
+        self.members = {}                                           # Representante -> vértices que representa
+        self.limit = max(1, limit)                                  # Árboles guardados como máximo
+        self.distances = OrderedDict()                              # Habilidad -> distancia de cada nodo hacia ella (orden LRU)
+        self.next_hop = {}                                          # Habilidad -> siguiente nodo en el camino hacia ella
+        self.pending_edges = []                                     # Aristas añadidas desde la última sincronización
+        self.capacity = 0                                           # Tamaño actual de los arreglos de cada árbol
+        self.lock = threading.Lock()                                # Varias consultas pueden pedir la sincronización a la vez
+
+        for vertex, representative in self.canonical.items():
+            self.members.setdefault(representative, [representative]).append(vertex)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para registrar una arista nueva o modificada
+    def add_edge(self, vertex1, vertex2, weight, previous_weight=0) -> None:
+
+        # Si la arista ya existía con un peso menor, las distancias pueden crecer: se descartan los árboles
+        if previous_weight and weight > previous_weight:
+            self._discard()
+            return
+
+        self.pending_edges.append((self.canonical.get(vertex1, vertex1), self.canonical.get(vertex2, vertex2), weight))
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para registrar muchas aristas nuevas de una vez (carga masiva)
+    def add_edges(self, sources, targets, weights) -> None:
+
+        # Si son demasiadas para actualizar los árboles arista por arista, se recalculan en la siguiente consulta
+        if len(self.pending_edges) + len(sources) > self.REBUILD_FRACTION * self.adjacency.num_vertices:
+            self._discard()
+            return
+
+        for vertex1, vertex2, weight in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+            self.pending_edges.append((self.canonical.get(vertex1, vertex1), self.canonical.get(vertex2, vertex2), weight))
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener la distancia de un nodo hasta una habilidad (inf si no hay camino)
+    def distance(self, vertex, skill_index) -> float:
+        distances, _ = self.tree(skill_index)
+
+        return float(distances[self.canonical.get(vertex, vertex)])
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para reconstruir el camino (lista de vértices representantes) desde un nodo hasta una habilidad
+    def path(self, vertex, skill_index) -> list:
+        distances, next_hop = self.tree(skill_index)
+        node = self.canonical.get(vertex, vertex)
+
+        if not np.isfinite(distances[node]):
+            return []
+
+        path = [node]
+        while node != skill_index:
+            node = int(next_hop[node])
+            path.append(node)
+
+        return path
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener el árbol (distancias, siguientes saltos) de una habilidad, calculándolo si no está guardado
+    # Los arreglos no cambian mientras se tenga el candado de lectura del grafo (solo una mutación los actualiza)
+    def tree(self, skill_index):
+        with self.lock:
+            self._sync()
+
+            if skill_index in self.distances:
+                self.distances.move_to_end(skill_index)
+            else:
+                self._build(skill_index)
+
+                # Se descarta el árbol consultado hace más tiempo
+                while len(self.distances) > self.limit:
+                    evicted, _ = self.distances.popitem(last=False)
+                    del self.next_hop[evicted]
+
+            return self.distances[skill_index], self.next_hop[skill_index]
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener los árboles guardados ya sincronizados: (habilidades, distancias K x N, siguientes saltos K x N)
+    def arrays(self):
+        with self.lock:
+            self._sync()
+
+            num_vertices = self.adjacency.num_vertices
+            skills = list(self.distances)
+            distances = np.array([self.distances[skill][:num_vertices] for skill in skills], dtype=float).reshape(len(skills), num_vertices)
+            next_hop = np.array([self.next_hop[skill][:num_vertices] for skill in skills], dtype=np.int64).reshape(len(skills), num_vertices)
+
+        return np.array(skills, dtype=np.int64), distances, next_hop
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para usar árboles ya calculados (p. ej. los de una versión publicada, en memoria compartida) sin recalcularlos
+    # Se conservan en el mismo orden LRU; los de otras habilidades se calculan (en memoria propia) al consultarse
+    def adopt(self, skills, distances, next_hop) -> None:
+        with self.lock:
+            kept = slice(max(0, len(skills) - self.limit), len(skills))
+            self.distances = OrderedDict(zip(skills[kept].tolist(), distances[kept]))
+            self.next_hop = dict(zip(skills[kept].tolist(), next_hop[kept]))
+            self.capacity = distances.shape[1]
+            self.pending_edges = []
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para aplicar las mutaciones pendientes a los árboles guardados
+    def sync(self) -> None:
+        with self.lock:
+            self._sync()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar: sincronización (con el candado tomado)
+    def _sync(self) -> None:
+        num_vertices = self.adjacency.num_vertices
+
+        if not self.pending_edges and self.capacity >= num_vertices:
+            return
+
+        # Se amplían los arreglos para los vértices nuevos (sin camino hasta que una arista los conecte)
+        if self.capacity < num_vertices:
+            self._grow(max(num_vertices, 2 * self.capacity))
+
+        if len(self.pending_edges) > self.REBUILD_FRACTION * num_vertices:
+            self._discard()
+
+        for skill_index in self.distances:
+            self._relax_edges(skill_index, self.pending_edges)
+
+        self.pending_edges = []
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para descartar los árboles guardados (se recalculan al consultarse)
+    def _discard(self) -> None:
+        self.distances.clear()
+        self.next_hop.clear()
+        self.pending_edges = []
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para ampliar los arreglos de todos los árboles
+    def _grow(self, capacity) -> None:
+        for skill_index in self.distances:
+            distances = np.full(capacity, np.inf)
+            distances[:self.capacity] = self.distances[skill_index]
+            next_hop = np.full(capacity, -1, dtype=np.int64)
+            next_hop[:self.capacity] = self.next_hop[skill_index]
+            self.distances[skill_index] = distances
+            self.next_hop[skill_index] = next_hop
+
+        self.capacity = capacity
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para obtener los vecinos (representantes) de un nodo representante
+    def _neighbors(self, node):
+        for member in self.members.get(node, (node,)):
+            neighbors, weights = self.adjacency.neighbors(member)
+
+            for neighbor, weight in zip(neighbors.tolist(), weights.tolist()):
+                yield self.canonical.get(neighbor, neighbor), weight
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para calcular desde cero el árbol de caminos más cortos hacia una habilidad
+    def _build(self, skill_index) -> None:
+        distances = np.full(self.capacity, np.inf)
+        next_hop = np.full(self.capacity, -1, dtype=np.int64)
+        distances[skill_index] = 0
+
+        self.distances[skill_index] = distances
+        self.next_hop[skill_index] = next_hop
+
+        self._propagate(skill_index, [(0.0, 0, skill_index)])
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para actualizar un árbol con aristas nuevas (solo pueden acortar distancias)
+    def _relax_edges(self, skill_index, edges) -> None:
+        distances = self.distances[skill_index]
+        next_hop = self.next_hop[skill_index]
+        tie = count()
+        heap = []
+
+        for vertex1, vertex2, weight in edges:
+            for source, target in ((vertex1, vertex2), (vertex2, vertex1)):
+                if distances[source] + weight < distances[target]:
+                    distances[target] = distances[source] + weight
+                    next_hop[target] = source
+                    heap.append((distances[target], next(tie), target))
+
+        heapq.heapify(heap)
+        self._propagate(skill_index, heap, tie)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar: Dijkstra a partir de los nodos en el heap, usando las distancias actuales como cotas
+    def _propagate(self, skill_index, heap, tie=None) -> None:
+        distances = self.distances[skill_index]
+        next_hop = self.next_hop[skill_index]
+        tie = tie or count(1)
+
+        while heap:
+            distance, _, node = heapq.heappop(heap)
+
+            # Entrada obsoleta del heap
+            if distance > distances[node]:
+                continue
+
+            for neighbor, weight in self._neighbors(node):
+                new_distance = distance + weight
+
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    next_hop[neighbor] = node
+                    heapq.heappush(heap, (new_distance, next(tie), neighbor))
@@ -0,0 +1,60 @@
+import heapq
+from itertools import count
+
+'''
+
+Búsquedas de caminos sobre la vista de NetworkX del grafo
+
+nearest_targets es un Dijkstra multi-objetivo: sale de un solo nodo y se detiene en cuanto
+se fijan (settle) los k objetivos más cercanos, en lugar de lanzar una búsqueda por objetivo.
+
+'''
+
+#* Dijkstra multi-objetivo; regresa [(objetivo, costo, camino)] de los k objetivos más cercanos, en orden
+# settled (opcional) recibe los nodos fijados: los únicos por los que una arista nueva podría mejorar el resultado
+def nearest_targets(G, source, targets, k=1, blocked=(), settled=None) -> list:
+    distances = {source: 0}
+    predecessors = {source: None}
+    settled = set() if settled is None else settled
+    found = []
+
+    # El contador desempata nodos con la misma distancia sin comparar sus etiquetas (pueden ser int o str)
+    tie = count()
+    heap = [(0, next(tie), source)]
+
+    while heap and len(found) < k:
+        distance, _, node = heapq.heappop(heap)
+
+        if node in settled:
+            continue
+
+        settled.add(node)
+
+        if node in targets:
+            found.append((node, distance))
+
+        for neighbor, data in G.adj[node].items():
+            # Los nodos bloqueados no se atraviesan (p. ej. la propia habilidad buscada)
+            if neighbor in blocked or neighbor in settled:
+                continue
+
+            new_distance = distance + data.get('weight', 1)
+
+            if neighbor not in distances or new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = node
+                heapq.heappush(heap, (new_distance, next(tie), neighbor))
+
+    return [(target, distance, build_path(predecessors, target)) for target, distance in found]
+
+#-----------------------------------------------------------------------------------
+
+#* Función para reconstruir el camino desde el origen hasta un nodo usando los predecesores
+def build_path(predecessors, node) -> list:
+    path = []
+
+    while node is not None:
+        path.append(node)
+        node = predecessors[node]
+
+    return path[::-1]
@@ -0,0 +1,44 @@
+import base64
+import json
+
+import numpy as np
+
+'''
+
+Datos del grafo para dibujarlo en el navegador
+
+Los arreglos numéricos viajan como arreglos tipados: bytes little-endian en base64 con su
+tipo y su forma, que el navegador convierte a Float32Array / Uint32Array / Uint8Array sin
+procesar número por número. Las posiciones y los pesos van en float32 (suficiente para
+dibujar) y los índices de las aristas en uint32.
+
+'''
+
+# Tipo con el que viaja cada arreglo (el navegador es little-endian)
+DTYPES = {
+    'types': '<u1',
+    'positions': '<f4',
+    'edges': '<u4',
+    'weights': '<f4',
+}
+
+#-----------------------------------------------------------------------------------
+
+#* Función para codificar un arreglo como {'dtype', 'shape', 'data' (base64)}
+def typed_array(array, dtype) -> dict:
+    array = np.ascontiguousarray(array, dtype=dtype)
+
+    return {
+        'dtype': np.dtype(dtype).name,
+        'shape': list(array.shape),
+        'data': base64.b64encode(array.tobytes()).decode('ascii'),
+    }
+
+#-----------------------------------------------------------------------------------
+
+#* Función para convertir los datos de Graph.get_graph_data / get_mst_data a JSON compacto
+def encode(data, node_types) -> str:
+    body = {key: typed_array(value, DTYPES[key]) if key in DTYPES else value for key, value in data.items()}
+    body['type_names'] = list(node_types)
+
+    return json.dumps(body, ensure_ascii=False, separators=(',', ':'))
@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+'''
+
+Caché de consultas de caminos (/dijkstra_test) con cálculo compartido
+
+Cuando un grupo entero busca "Programar" a la vez, cada petición repetía la misma búsqueda
+y el mismo dibujo. Las consultas idénticas que llegan mientras otra se calcula (misma
+clave y misma versión del grafo) esperan ese cálculo en lugar de repetirlo, y el resultado
+se guarda en una caché LRU de tamaño fijo.
+
+Cada resultado guarda de qué nodos depende (los que fijó la búsqueda, la habilidad y los
+nombres de los alumnos involucrados). Una arista nueva solo puede acortar un camino de
+costo menor al del k-ésimo candidato si toca un nodo fijado, así que cada mutación descarta
+únicamente los resultados que tocan sus nodos y el resto sigue siendo válido en la versión
+nueva. Si el grafo cambió sin avisar a la caché (p. ej. otra copia del grafo), se vacía.
+
+'''
+
+# Resultados guardados como máximo; configurable con EDYA_QUERY_CACHE
+CACHE_SIZE = int(os.environ.get('EDYA_QUERY_CACHE', '256'))
+
+# Nodos de los que puede depender un resultado; una búsqueda más grande depende de todo el grafo
+DEPENDENCY_LIMIT = 10000
+
+#-----------------------------------------------------------------------------------
+
+#* Función para obtener la dependencia por nombre de un alumno (su etiqueta cambia si el nombre se repite)
+def student_name(name) -> tuple:
+    return ('student', name)
+
+#-----------------------------------------------------------------------------------
+
+#* Caché LRU de resultados con agrupación de consultas idénticas en curso
+class QueryCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()                                # Clave -> (resultado, dependencias o None = todo el grafo)
+        self.flights = {}                                           # (clave, versión) -> Future del cálculo en curso
+        self.version = 0                                            # Versión del grafo con la que los resultados son válidos
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener un resultado; compute() regresa (resultado, dependencias) y solo se ejecuta una vez por clave
+    # Quien llama debe tener el candado de lectura del grafo (la versión no cambia durante el cálculo)
+    def get(self, key, version, compute):
+        with self.lock:
+            if self.version != version:
+                self.entries.clear()
+                self.version = version
+
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry[0]
+
+            flight = self.flights.get((key, version))
+
+            # Otra petición ya lo está calculando: se espera su resultado (o su error)
+            if flight is not None:
+                owner = False
+            else:
+                owner = True
+                flight = self.flights[(key, version)] = Future()
+
+        if not owner:
+            return flight.result()
+
+        try:
+            value, dependencies = compute()
+
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+
+        else:
+            flight.set_result(value)
+
+            if dependencies is not None and len(dependencies) > DEPENDENCY_LIMIT:
+                dependencies = None
+
+            with self.lock:
+                if self.version == version:
+                    self.entries[key] = (value, dependencies)
+                    self.entries.move_to_end(key)
+
+                    while len(self.entries) > self.size:
+                        self.entries.popitem(last=False)
+
+            return value
+
+        finally:
+            with self.lock:
+                del self.flights[(key, version)]
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para avisar de una mutación (previous -> version) que toca los nodos labels
+    # Se llama con el candado de escritura del grafo; si la caché ya estaba desfasada se vacía en la siguiente consulta
+    def invalidate(self, previous, version, labels=()) -> None:
+        with self.lock:
+            if self.version != previous:
+                return
+
+            if labels:
+                for key, (_, dependencies) in list(self.entries.items()):
+                    if dependencies is None or not dependencies.isdisjoint(labels):
+                        del self.entries[key]
+
+            self.version = version
@@ -1,6 +1,19 @@
-from flask import Flask, render_template, url_for, request, redirect, session
-from grapher import Graph
+from flask import Flask, render_template, url_for, request, redirect, session, make_response, jsonify, abort, Response
+from grapher import Graph, NODE_TYPES
+from plotly.offline import get_plotlyjs_version
 from random import randint
+import atexit
+import hashlib
+import jobs
+import json
+import logging
+import os
+import payload
+import shared
+import threading
+import time
+import tracing
+from tracing import span
 
 '''
 
@@ -11,12 +24,236 @@ Se utiliza Flask para mayor conectividad con el código de Python.
 
 '''
 
+# Nivel de log configurable (por defecto solo advertencias); EDYA_TRACE=1 activa la cabecera Server-Timing
+logging.basicConfig(level=os.environ.get('EDYA_LOG_LEVEL', 'WARNING').upper(),
+                    format='%(asctime)s %(name)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
 # Creación de la aplicación Flask
 app = Flask(__name__)
+app.config['TRACE_SPANS'] = os.environ.get('EDYA_TRACE', '0') == '1'
+
+# Snapshot del grafo y bitácora de mutaciones: al arrancar se carga el snapshot (si existe) y se aplican
+# encima las mutaciones registradas después; la bitácora se compacta cada EDYA_COMPACT_EVERY registros
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.environ.get('EDYA_SNAPSHOT', os.path.join(BASE_DIR, 'graph_snapshot.npz'))
+LOG_PATH = os.environ.get('EDYA_WAL', os.path.join(BASE_DIR, 'graph_wal.jsonl'))
+COMPACT_EVERY = int(os.environ.get('EDYA_COMPACT_EVERY', '10000'))
+
+# Procesos que atienden peticiones (con más de uno el grafo se comparte en memoria desde EDYA_SHARED)
+WORKERS = int(os.environ.get('EDYA_WORKERS', '1'))
+SHARED_DIR = os.environ.get('EDYA_SHARED', os.path.join(BASE_DIR, 'shared_graph'))
 
 # Creación e inicialización del grafo, utilizando el módulo Graph de "grapher.py"
-graph = Graph()
-graph.start()
+if os.path.exists(SNAPSHOT_PATH):
+    graph = Graph.load_snapshot(SNAPSHOT_PATH)
+    logger.info('Grafo cargado desde %s (%d nodos)', SNAPSHOT_PATH, graph.num_nodes)
+else:
+    graph = Graph()
+    graph.start()
+
+replayed = graph.open_log(LOG_PATH)
+logger.info('%d mutaciones aplicadas desde %s', replayed, LOG_PATH)
+
+
+# Se compacta la bitácora al detener el servidor
+@atexit.register
+def save_snapshot():
+    graph.compact(SNAPSHOT_PATH)
+    graph.log.close()
+
+
+# Compactación periódica: cuando la bitácora crece demasiado se guarda un snapshot nuevo
+# (en un trabajador no hay bitácora: el proceso dueño compacta después de aplicar la mutación)
+def compact_if_needed():
+    if graph.log is not None and graph.log.records >= COMPACT_EVERY:
+        graph.compact(SNAPSHOT_PATH, COMPACT_EVERY)
+
+
+#-----------------------------------------------------------------------------------
+
+# Versión de plotly.js que usa la figura generada en el servidor (la misma se carga para dibujar en el navegador)
+PLOTLY_VERSION = get_plotlyjs_version()
+
+
+# Caché de las respuestas que solo dependen de la versión del grafo (/graph, /prim y sus datos JSON):
+# nombre -> (versión del grafo, cuerpo, fecha de render)
+rendered = {}
+rendered_lock = threading.Lock()
+
+
+# Trabajos en segundo plano: las vistas pesadas se calculan en el ejecutor (pocos a la vez) y las peticiones
+# iguales para la misma versión del grafo comparten el cálculo
+job_queue = jobs.JobQueue(trace=app.config['TRACE_SPANS'])
+
+# Segundos entre comentarios de "sigue vivo" en el flujo de eventos de un trabajo
+EVENT_HEARTBEAT = 15
+
+
+# Se responde con el cuerpo de la versión actual del grafo; render() solo se llama si la versión cambió.
+# La ETag es el nombre y la versión, así que una recarga del navegador sin cambios recibe un 304 sin trabajo
+# (con store=False no se guarda: para las variantes que dependen de parámetros, p. ej. expand)
+# Con ?async=1 no se espera el cálculo: se responde 202 con el ID del trabajo
+def cached_response(name, render, mimetype='text/html', store=True):
+    
+    # La versión se lee antes de generar: si hay una mutación a la mitad, la siguiente petición vuelve a generar
+    version = graph.version
+    etag = f'{name}-{version}'
+    
+    if etag in request.if_none_match:
+        entry = rendered.get(name)
+        response = make_response('', 304)
+        response.set_etag(etag)
+        if entry is not None and entry[0] == version:
+            response.last_modified = entry[2]
+        return response
+    
+    entry = rendered.get(name)
+    
+    if entry is None or entry[0] != version:
+        job = submit_render(name, version, render, mimetype, store)
+        
+        if request.args.get('async') == '1' and not job.wait(0):
+            return job_accepted(job)
+        
+        job.wait()
+        
+        # Los tiempos del cálculo (medidos en el hilo del trabajo) van en el Server-Timing de esta petición
+        tracing.extend(job.spans)
+        
+        if job.status == 'failed':
+            return make_response(job.error, 500)
+        
+        entry = job.result
+    
+    return entry_response(name, entry, mimetype)
+
+
+# Se envía el render de una vista al ejecutor (una sola vez por nombre y versión); el resultado es la entrada de caché
+def submit_render(name, version, render, mimetype, store):
+    
+    # En un trabajador, el cálculo usa la misma versión publicada que la petición que lo pidió
+    source = graph.pinned() if isinstance(graph, shared.Replica) else None
+    
+    def run():
+        if source is not None:
+            graph.pin(source)
+        
+        # Se genera con el candado de lectura y se etiqueta con la versión leída ahí: es la que realmente se dibujó
+        # (si una mutación entró después de la petición, la entrada queda con la versión nueva)
+        target = source if source is not None else graph
+        
+        try:
+            with target.lock.read(), app.app_context():
+                entry = (target.version, render(), time.time())
+        
+        finally:
+            if source is not None:
+                graph.unpin()
+        
+        # Un render más lento de una versión anterior no reemplaza a uno más nuevo
+        if store:
+            with rendered_lock:
+                current = rendered.get(name)
+                if current is None or current[0] <= entry[0]:
+                    rendered[name] = entry
+        
+        return entry
+    
+    return job_queue.submit((name, version), run, {'name': name, 'mimetype': mimetype})
+
+
+# Respuesta con una entrada de la caché (ETag, Last-Modified y revalidación obligatoria)
+def entry_response(name, entry, mimetype):
+    response = make_response(entry[1])
+    response.mimetype = mimetype
+    response.set_etag(f'{name}-{entry[0]}')
+    response.last_modified = entry[2]
+    
+    # El navegador guarda la respuesta pero la revalida siempre (If-None-Match / If-Modified-Since)
+    response.cache_control.no_cache = True
+    
+    return response.make_conditional(request)
+
+
+# Respuesta 202 para un trabajo en curso: dónde consultar su estado, sus eventos y su resultado
+def job_accepted(job):
+    body = {**job.describe(),
+            'status_url': url_for('job_status', job_id=job.id),
+            'events_url': url_for('job_events', job_id=job.id),
+            'result_url': url_for('job_result', job_id=job.id)}
+    
+    response = jsonify(body)
+    response.status_code = 202
+    response.headers['Location'] = body['status_url']
+    
+    return response
+
+
+# Se responde con la página de una figura de Plotly generada en el servidor (en caché por versión)
+def render_cached(name, build_figure, store=True):
+    def render():
+        fig = build_figure()
+        
+        with span('render'):
+            graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')
+            return render_template('graph.html', graph_html=graph_html)
+    
+    return cached_response(name, render, store=store)
+
+
+# Carreras o categorías a abrir en la vista resumida: ?expand=SIS.&expand=ING. o ?expand=SIS.,ING.
+def expand_argument() -> tuple:
+    names = {name.strip() for value in request.args.getlist('expand') for name in value.split(',')}
+    
+    return tuple(sorted(name for name in names if name))
+
+
+# Nombre de caché (y ETag) de una vista: el nombre base, más un resumen de las carreras abiertas si hay
+# (BLAKE2 de 128 bits sobre la lista canónica: dos conjuntos distintos no comparten entrada en la práctica)
+def view_name(base, expand) -> str:
+    if not expand:
+        return base
+    
+    canonical = ','.join(sorted(set(expand)))
+    
+    return f"{base}-{hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()}"
+
+
+#-----------------------------------------------------------------------------------
+
+# Se abre una traza de tiempos por petición (si está activada)
+@app.before_request
+def start_trace():
+    if app.config['TRACE_SPANS']:
+        tracing.start_request()
+
+
+# En un trabajador (varios procesos), cada petición ve una sola versión publicada del grafo
+@app.before_request
+def pin_graph():
+    if isinstance(graph, shared.Replica):
+        graph.pin()
+
+
+@app.teardown_request
+def unpin_graph(exception=None):
+    if isinstance(graph, shared.Replica):
+        graph.unpin()
+
+
+# Se publican los tiempos de cada etapa en la cabecera Server-Timing (visible en las herramientas del navegador)
+@app.after_request
+def finish_trace(response):
+    if app.config['TRACE_SPANS']:
+        spans = tracing.finish_request()
+        
+        if spans:
+            response.headers['Server-Timing'] = tracing.server_timing(spans)
+            logger.info('%s %s', request.path, tracing.server_timing(spans))
+    
+    return response
+
 
 #-----------------------------------------------------------------------------------
 
@@ -43,6 +280,7 @@ def add_student():
         
         # Se llama la función para añadir nodos de alumno, de la clase "Graph"
         graph.add_student_vertex(st, dg, sm)
+        compact_if_needed()
         
         # Se redirige al índice para refrescar el grafo
         return redirect(url_for('index'))
@@ -64,9 +302,13 @@ def add_skill():
             # Se registran los datos (Nombre y habilidad)
             st = request.form["student"]
             sk = request.form["skill"]
+            
+            # ID opcional, para distinguir alumnos con el mismo nombre
+            sid = request.form.get("student_id") or None
 
             # Se llama la función para añadir nodos de habilidad, de la clase "Graph"
-            graph.add_skill_vertex(st, sk)
+            graph.add_skill_vertex(st, sk, sid)
+            compact_if_needed()
 
         # Manejo de errores
         except ValueError as e:
@@ -97,13 +339,14 @@ def search_path():
             # Se obtienen los datos del formulario (Nombre y habilidad)
             st = request.form["student"]
             sk = request.form["skill"]
+            sid = request.form.get("student_id") or None
             
-            print("Estudiante:", st)
-            print("Habilidad:", sk)
+            logger.debug('Búsqueda de camino: estudiante %s, habilidad %s', st, sk)
 
-            best_path, stundet, semester = graph.find_best_path_to_skill(st, sk)  # Llamamos a la función para encontrar el mejor camino
+            best_path, stundet, semester = graph.find_best_path_to_skill(st, sk, sid)  # Llamamos a la función para encontrar el mejor camino
             fig = graph.getDijkstra(best_path)
-            graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')  # Convertimos el gráfico a HTML
+            with span('render'):
+                graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')  # Convertimos el gráfico a HTML
 
         except Exception as e:
             error_message = str(e)  # Capturamos cualquier error y lo almacenamos
@@ -118,13 +361,10 @@ def search_path():
 @app.route('/graph')
 def show_graph():
     
-    # Se genera una figura para mostrar en la página
-    fig = graph.getGraph()
+    expand = expand_argument()
     
-    # Se convierte el grafo a HTML
-    graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')
-    
-    return render_template('graph.html', graph_html=graph_html)
+    # Se genera la figura (y su HTML) solo si el grafo cambió desde la última petición
+    return render_cached(view_name('graph', expand), lambda: graph.getGraph(expand), store=not expand)
 
 
 #-----------------------------------------------------------------------------------
@@ -132,39 +372,143 @@ def show_graph():
 # Ruta para manejar el algoritmo de Prim
 @app.route('/prim', methods=['GET'])
 def show_prim():
-    print("Se actibo el algoritmo de Prim")
-    print(f"Metodo: {request.method}")
-    fig = graph.getMST()  # Llamamos al método que aplica el algoritmo de Prim
+    logger.debug('Se activó el algoritmo de Prim (%s)', request.method)
+    
+    # Se aplica el algoritmo de Prim y se dibuja solo si el grafo cambió desde la última petición
+    return render_cached('prim', graph.getMST)
+
+
+#-----------------------------------------------------------------------------------
+
+# Datos del grafo y del MST como JSON (arreglos tipados en base64); el navegador los dibuja con Plotly (WebGL)
+@app.route('/api/graph')
+def graph_data():
+    expand = expand_argument()
+    
+    return cached_response(view_name('api-graph', expand), lambda: payload.encode(graph.get_graph_data(expand), NODE_TYPES),
+                           'application/json', store=not expand)
+
+
+@app.route('/api/prim')
+def prim_data():
+    return cached_response('api-prim', lambda: payload.encode(graph.get_mst_data(), NODE_TYPES), 'application/json')
+
+
+# Página que descarga los datos de /api/<name> y dibuja la figura en el navegador
+@app.route('/view/<any(graph, prim):name>')
+def show_view(name):
+    return render_template('graph_view.html', data_url=url_for(f'{name}_data', expand=','.join(expand_argument()) or None),
+                           plotly_version=PLOTLY_VERSION)
+
+
+#-----------------------------------------------------------------------------------
+
+# Estado de un trabajo en segundo plano
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = job_queue.get(job_id) or abort(404)
+    
+    return jsonify(job.describe())
+
+
+# Resultado de un trabajo (el mismo cuerpo y ETag que la vista que lo pidió); 202 si aún no termina
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = job_queue.get(job_id) or abort(404)
     
-    # Se convierte el gráfico a HTML
-    graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')  # Convertimos el gráfico a HTML
+    if not job.wait(0):
+        return job_accepted(job)
     
-    return render_template("graph.html", graph_html=graph_html)
+    tracing.extend(job.spans)
+    
+    if job.status == 'failed':
+        return make_response(job.error, 500)
+    
+    return entry_response(job.info['name'], job.result, job.info['mimetype'])
+
+
+# Aviso del fin de un trabajo como server-sent events (un evento "done" o "failed" con su estado)
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    job = job_queue.get(job_id) or abort(404)
+    
+    def stream():
+        while not job.wait(EVENT_HEARTBEAT):
+            yield ': sigue en curso\n\n'
+        
+        yield f'event: {job.status}\ndata: {json.dumps(job.describe())}\n\n'
+    
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 
 #-----------------------------------------------------------------------------------
 
+#* Función para dibujar los caminos hacia los candidatos; regresa (HTML o None si no hay candidatos, candidatos)
+def dijkstra_html(candidates):
+    if not candidates:
+        return None, candidates
+    
+    fig = graph.getDijkstra([candidate['path'] for candidate in candidates])
+    
+    # Se convierte el grafo a HTML
+    with span('render'):
+        return fig.to_html(full_html=False, include_plotlyjs='cdn'), candidates
+
+#-----------------------------------------------------------------------------------
+
 # Ruta para manejar el algoritmo de Dijkstra
 @app.route('/dijkstra_test', methods=['GET'])
 def show_dijkstra():
+    error_message = None
+    graph_html = None
+    candidates = []
+    
     # Se obtienen los datos del formulario (Nombre y habilidad)
     st = request.args.get("student")
     sk = request.args.get("skill")
     
-    # Se obtiene el mejor camino utilizando el algoritmo de Dijkstra
-    path, student, semester = graph.find_best_path_to_skill(st, sk)
+    # ID opcional, para distinguir alumnos con el mismo nombre
+    sid = request.args.get("student_id") or None
     
-    # Se convierte el camino a un formato adecuado para el gráfico
-    fig = graph.getDijkstra(path)  # Llamamos al método que aplica el algoritmo de Dijkstra
+    # Número de candidatos a mostrar (por defecto el más cercano)
+    k = max(1, min(request.args.get("k", default=1, type=int), 50))
     
-    # Se convierte el grafo a HTML
-    graph_html = fig.to_html(full_html=False, include_plotlyjs='cdn')  # Convertimos el gráfico a HTML
+    try:
+        # Los k estudiantes más cercanos (una sola búsqueda de Dijkstra) y su dibujo; las consultas idénticas
+        # en paralelo comparten el cálculo y el resultado queda en caché hasta que una mutación lo toque
+        graph_html, candidates = graph.cached_nearest_students(st, sk, k, sid, render=dijkstra_html)
+        
+        if not candidates:
+            raise ValueError("No se encontró un camino válido entre el estudiante y la habilidad.")
+    
+    except ValueError as e:
+        error_message = str(e)
     
-    return render_template("graph.html", graph_html=graph_html)
+    return render_template("graph.html", graph_html=graph_html, error_message=error_message, candidates=candidates)
 
 
 #-----------------------------------------------------------------------------------
 
+# Ruta para guardar un snapshot del grafo bajo demanda (compacta la bitácora)
+@app.route('/snapshot', methods=['POST'])
+def snapshot():
+    graph.compact(SNAPSHOT_PATH)
+    
+    return redirect(url_for('index'))
+
+
+#-----------------------------------------------------------------------------------
+
+# Cada trabajador consulta la réplica compartida en lugar del grafo del proceso dueño
+def use_replica(replica):
+    global graph
+    graph = replica
+
+
 # Inicio del servidor
 if __name__ == "__main__":
-    app.run(debug=True, port=8080)
+    if WORKERS > 1:
+        shared.serve(app, graph, WORKERS, '127.0.0.1', 8080, SHARED_DIR, use_replica, compact_if_needed)
+    else:
+        # Sin el recargador: su proceso padre también cargaría el grafo y abriría la misma bitácora
+        app.run(debug=True, port=8080, use_reloader=False)
@@ -0,0 +1,383 @@
+import json
+import logging
+import os
+import secrets
+import shutil
+import signal
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+import snapshot
+from adjacency import CSRAdjacency, csr_arrays
+
+'''
+
+Servidor multiproceso con el grafo en memoria compartida
+
+Un proceso dueño guarda el grafo autoritativo (con su bitácora) y es el único que lo
+modifica. Cada cierto tiempo publica la versión actual como archivos .npy en un directorio;
+los procesos trabajadores abren esos archivos con np.load(mmap_mode='r'), así que la
+adyacencia (CSR) y los arreglos de atributos de los estudiantes se comparten a través de la
+caché de páginas del sistema operativo en lugar de copiarse en cada proceso.
+
+Con cada versión se publican también el MST y los árboles del oráculo de distancias: el
+dueño los mantiene de forma incremental y los trabajadores los abren tal cual, en lugar de
+recalcular Prim y el oráculo desde cero en cada proceso y en cada versión.
+
+Los trabajadores atienden las peticiones HTTP (todos aceptan conexiones del mismo socket)
+y reenvían las mutaciones al dueño por un socket Unix. Cuando aparece una versión publicada
+más nueva, cada trabajador la abre y cambia de grafo entre peticiones.
+
+Las lecturas de un trabajador pueden ir hasta PUBLISH_INTERVAL segundos detrás del dueño;
+las del mismo trabajador que hizo una mutación esperan a que se publique su versión. La
+versión se resuelve una vez por petición (pin), así que toda la petición ve el mismo grafo.
+
+'''
+
+logger = logging.getLogger(__name__)
+
+# Segundos entre publicaciones (si hubo mutaciones); configurable con EDYA_PUBLISH_INTERVAL
+PUBLISH_INTERVAL = float(os.environ.get('EDYA_PUBLISH_INTERVAL', '0.5'))
+
+# Versiones publicadas que se conservan en disco (los trabajadores pueden seguir leyendo la anterior)
+KEEP_VERSIONS = 2
+
+# Tiempo máximo que un trabajador espera a que se publique su propia mutación
+READ_YOUR_WRITES_TIMEOUT = 5.0
+
+#-----------------------------------------------------------------------------------
+
+#* Función para publicar el estado del grafo en root/v<versión>; regresa el nombre de la versión
+def publish(graph, root) -> str:
+
+    # Se copian los arreglos con el candado de lectura; la escritura a disco ya no bloquea a las mutaciones
+    with graph.lock.read():
+        name = f'v{graph.version:012d}'
+        arrays = snapshot.collect(graph)
+        degree_codes, semester_codes, skills = graph.attributes.arrays()
+        arrays['attribute_ids'] = np.array(graph.attributes.ids[:graph.attributes.size])
+        arrays['attribute_degree_codes'] = np.array(degree_codes)
+        arrays['attribute_semester_codes'] = np.array(semester_codes)
+        arrays['attribute_skills'] = np.array(skills)
+
+        # MST (reparado solo donde hubo cambios) y árboles del oráculo, ya al día con esta versión
+        with graph.cache_lock:
+            tree = graph.mst_tree.tree()
+        arrays['mst_edges'] = np.array([(i, j) for i, j, _ in tree], dtype=np.int64).reshape(len(tree), 2)
+        arrays['mst_weights'] = np.array([weight for *_, weight in tree], dtype=np.float64)
+        arrays['oracle_skills'], arrays['oracle_distances'], arrays['oracle_next_hop'] = graph.oracle.arrays()
+
+    final = os.path.join(root, name)
+    if os.path.exists(final):
+        return name
+
+    indptr, indices, data = csr_arrays(graph_num_nodes(arrays), arrays['edge_sources'], arrays['edge_targets'], arrays['edge_weights'])
+    arrays.update({'csr_indptr': indptr, 'csr_indices': indices, 'csr_data': data})
+
+    # Se escribe en un directorio temporal y se renombra (los trabajadores nunca ven una versión a medias)
+    temporary = os.path.join(root, f'.{name}.tmp')
+    shutil.rmtree(temporary, ignore_errors=True)
+    os.makedirs(temporary)
+
+    for key, array in arrays.items():
+        if key == 'meta':
+            with open(os.path.join(temporary, 'meta.json'), 'w', encoding='utf-8') as f:
+                f.write(array.item())
+        else:
+            np.save(os.path.join(temporary, f'{key}.npy'), array)
+
+    os.replace(temporary, final)
+
+    # El puntero a la versión actual también se reemplaza de forma atómica
+    pointer = os.path.join(root, 'CURRENT.tmp')
+    with open(pointer, 'w') as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(root, 'CURRENT'))
+
+    # Se borran las versiones viejas (un trabajador que aún las tenga abiertas conserva sus mapas de memoria)
+    versions = sorted(entry for entry in os.listdir(root) if entry.startswith('v'))
+    for old in versions[:-KEEP_VERSIONS]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+    return name
+
+#* Función auxiliar: número de nodos guardado en los metadatos
+def graph_num_nodes(arrays) -> int:
+    return json.loads(arrays['meta'].item())['num_nodes']
+
+#-----------------------------------------------------------------------------------
+
+#* Función para leer el nombre de la versión publicada actual (None si no hay ninguna)
+def current_version(root):
+    try:
+        with open(os.path.join(root, 'CURRENT')) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+#-----------------------------------------------------------------------------------
+
+#* Función para abrir una versión publicada como grafo de solo lectura (arreglos en memoria compartida)
+def load(root, name, graph_class):
+    directory = os.path.join(root, name)
+    arrays = {}
+
+    with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+        arrays['meta'] = np.array(f.read())
+
+    for entry in os.listdir(directory):
+        if entry.endswith('.npy'):
+            arrays[entry[:-4]] = np.load(os.path.join(directory, entry), mmap_mode='r')
+
+    graph = graph_class(adjacency=CSRAdjacency)
+    snapshot.restore_indexes(graph, arrays)
+    graph.adjacency.adopt(arrays['csr_indptr'], arrays['csr_indices'], arrays['csr_data'], arrays['edge_sources'].shape[0])
+    graph.attributes.adopt(arrays['attribute_ids'], arrays['attribute_degree_codes'],
+                           arrays['attribute_semester_codes'], arrays['attribute_skills'])
+
+    # El MST y el oráculo publicados se usan tal cual (solo se leen: los arreglos están en memoria compartida)
+    mst_edges = arrays['mst_edges']
+    graph.mst_tree.adopt(list(zip(mst_edges[:, 0].tolist(), mst_edges[:, 1].tolist(), arrays['mst_weights'].tolist())))
+    graph.oracle.adopt(arrays['oracle_skills'], arrays['oracle_distances'], arrays['oracle_next_hop'])
+
+    return graph
+
+#-----------------------------------------------------------------------------------
+
+#* Lado del dueño: aplica las mutaciones que llegan de los trabajadores y publica las versiones nuevas
+class Owner:
+
+    # Mutaciones que los trabajadores pueden pedir
+    MUTATIONS = ('add_student_vertex', 'add_skill_vertex', 'import_rows', 'compact')
+
+    def __init__(self, graph, root, address, authkey, after_write=None):
+        self.graph = graph                                          # Grafo autoritativo
+        self.root = root                                            # Directorio de las versiones publicadas
+        self.address = address                                      # Socket Unix por el que llegan las mutaciones
+        self.authkey = authkey
+        self.after_write = after_write                              # Se llama después de cada mutación (p. ej. compactar)
+        self.published = None                                       # Versión del grafo publicada por última vez
+        self.stopped = threading.Event()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para publicar si el grafo cambió desde la última publicación
+    def publish(self) -> None:
+        if self.published != self.graph.version:
+            version = self.graph.version
+            publish(self.graph, self.root)
+            self.published = version
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para iniciar los hilos que atienden mutaciones y publican versiones
+    def start(self) -> None:
+        self.listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        threading.Thread(target=self._publish_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.listener.close()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar: cada conexión es una mutación (método, argumentos) y su respuesta
+    def _accept_loop(self) -> None:
+        while not self.stopped.is_set():
+            try:
+                connection = self.listener.accept()
+            except OSError:
+                return
+
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection) -> None:
+        with connection:
+            method, args, kwargs = connection.recv()
+
+            try:
+                if method not in self.MUTATIONS:
+                    raise ValueError(f'Mutación desconocida: {method}')
+
+                result = getattr(self.graph, method)(*args, **kwargs)
+
+                if self.after_write is not None:
+                    self.after_write()
+
+                connection.send(('ok', result, self.graph.version))
+
+            except ValueError as e:
+                connection.send(('error', e, self.graph.version))
+
+            # Un error inesperado no debe dejar al trabajador sin respuesta; se manda como RuntimeError
+            # (la excepción original podría no poder serializarse)
+            except Exception as e:
+                logger.exception('Error al aplicar %s en el proceso dueño', method)
+                connection.send(('error', RuntimeError(f'{type(e).__name__}: {e}'), self.graph.version))
+
+    def _publish_loop(self) -> None:
+        while not self.stopped.wait(PUBLISH_INTERVAL):
+            try:
+                self.publish()
+            except Exception:
+                logger.exception('No se pudo publicar la versión %s del grafo', self.graph.version)
+
+#-----------------------------------------------------------------------------------
+
+#* Lado del trabajador: grafo de solo lectura que se actualiza con cada versión publicada
+class Replica:
+
+    log = None                                                      # La bitácora la lleva el dueño
+
+    def __init__(self, root, address, authkey, graph_class):
+        self.root = root
+        self.address = address
+        self.authkey = authkey
+        self.graph_class = graph_class
+        self.graph = None                                           # Versión abierta actualmente
+        self.name = None                                            # Nombre de esa versión
+        self.min_version = -1                                       # Versión mínima que deben ver las lecturas (tras una mutación propia)
+        self.reload_lock = threading.Lock()                         # Evita que dos peticiones abran la misma versión
+        self.local = threading.local()                              # Versión fijada por el hilo actual (pin)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener el grafo de la versión publicada más nueva (la abre si cambió)
+    def current(self):
+        deadline = time.monotonic() + READ_YOUR_WRITES_TIMEOUT
+
+        while True:
+            name = current_version(self.root)
+
+            if name != self.name:
+                with self.reload_lock:
+                    if name != self.name:
+                        self.graph = load(self.root, name, self.graph_class)
+                        self.name = name
+
+            # Se espera a que el dueño publique la mutación hecha por este trabajador
+            if self.graph.version >= self.min_version or time.monotonic() > deadline:
+                return self.graph
+
+            time.sleep(PUBLISH_INTERVAL / 10)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para fijar la versión que ve el hilo actual (se llama al empezar cada petición); regresa ese grafo
+    # Sin fijar, cada acceso a un atributo revisaría en disco si hay una versión nueva
+    def pin(self, graph=None):
+        self.local.graph = graph or self.current()
+
+        return self.local.graph
+
+    #* Método para soltar la versión fijada (al terminar la petición)
+    def unpin(self) -> None:
+        self.local.graph = None
+
+    #* Método para obtener el grafo que ve el hilo actual (el fijado, o la versión publicada más nueva)
+    def pinned(self):
+        return getattr(self.local, 'graph', None) or self.current()
+
+    #-----------------------------------------------------------------------------
+
+    #* Las consultas se hacen sobre la versión fijada (o la publicada más nueva)
+    def __getattr__(self, name):
+        return getattr(self.pinned(), name)
+
+    #-----------------------------------------------------------------------------
+
+    #* Las mutaciones se reenvían al dueño
+    def add_student_vertex(self, *args, **kwargs):
+        return self.forward('add_student_vertex', *args, **kwargs)
+
+    def add_skill_vertex(self, *args, **kwargs):
+        return self.forward('add_skill_vertex', *args, **kwargs)
+
+    def import_rows(self, *args, **kwargs):
+        return self.forward('import_rows', *args, **kwargs)
+
+    def compact(self, *args, **kwargs):
+        return self.forward('compact', *args, **kwargs)
+
+    def forward(self, method, *args, **kwargs):
+        with Client(self.address, family='AF_UNIX', authkey=self.authkey) as connection:
+            connection.send((method, args, kwargs))
+            status, value, version = connection.recv()
+
+        self.min_version = max(self.min_version, version)
+
+        # Las lecturas siguientes de esta petición deben ver la mutación: se vuelve a resolver la versión
+        self.unpin()
+
+        if status == 'error':
+            raise value
+
+        return value
+
+#-----------------------------------------------------------------------------------
+
+#* Función para servir la aplicación con varios procesos trabajadores (pre-fork, solo en sistemas POSIX)
+# become_worker(replica) se llama en cada hijo para que la aplicación use la réplica en lugar del grafo
+def serve(app, graph, workers, host, port, root, become_worker, after_write=None) -> None:
+    from werkzeug.serving import make_server
+
+    os.makedirs(root, exist_ok=True)
+    address = os.path.join(root, 'owner.sock')
+    authkey = secrets.token_bytes(16)
+
+    if os.path.exists(address):
+        os.remove(address)
+
+    owner = Owner(graph, root, address, authkey, after_write)
+    owner.publish()
+
+    # El socket se abre antes de crear los hijos para que todos acepten conexiones del mismo puerto
+    listening = socket.create_server((host, port))
+    children = []
+
+    for _ in range(workers):
+        pid = os.fork()
+
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            become_worker(Replica(root, address, authkey, type(graph)))
+            server = make_server(host, port, app, threaded=True, fd=listening.fileno())
+            try:
+                server.serve_forever()
+            finally:
+                # Un hijo nunca ejecuta los atexit del dueño (no debe compactar el grafo)
+                os._exit(0)
+
+        children.append(pid)
+
+    # Los hilos del dueño se inician después de los fork (un hijo no hereda hilos a medias)
+    owner.start()
+    logger.warning('Sirviendo en http://%s:%d con %d procesos', host, port, workers)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    previous = signal.signal(signal.SIGTERM, stop)
+
+    try:
+        for _ in children:
+            os.wait()
+
+    except KeyboardInterrupt:
+        pass
+
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        owner.stop()
+        listening.close()
+        signal.signal(signal.SIGTERM, previous)
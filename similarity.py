@@ -0,0 +1,219 @@
+import numpy as np
+
+'''
+
+Motor vectorizado de similitud entre estudiantes
+
+Calcula la misma coincidencia que Graph.coincidence (2 puntos por habilidad en común,
+5 por carrera en común y 1 por semestre en común) y el mismo peso que Graph.weight,
+pero para todos los pares a la vez usando arreglos de NumPy:
+
+    - carreras y semestres codificados como enteros
+    - habilidades como bitsets empaquetados en palabras uint64 (N x W)
+
+'''
+
+# Puntos que aporta cada tipo de coincidencia (los mismos que Graph.coincidence)
+SKILL_POINTS = 2
+DEGREE_POINTS = 5
+SEMESTER_POINTS = 1
+
+# Límite aproximado de memoria (en elementos) para cada bloque de filas
+BLOCK_ELEMENTS = 4_000_000
+
+#-----------------------------------------------------------------------------------
+
+#* Función para codificar valores como enteros; dos valores reciben el mismo código si y solo si son iguales (==)
+def encode(values) -> np.ndarray:
+    codes = {}
+
+    return np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64, count=len(values))
+
+#-----------------------------------------------------------------------------------
+
+#* Función para empaquetar bitsets (int de Python) en una matriz uint64 de N x W palabras
+def pack_bitsets(bitsets, num_bits) -> np.ndarray:
+    words = max(1, (num_bits + 63) // 64)
+    packed = np.zeros((len(bitsets), words), dtype=np.uint64)
+    mask = (1 << 64) - 1
+
+    for word in range(words):
+        packed[:, word] = np.fromiter(((bits >> (64 * word)) & mask for bits in bitsets), dtype=np.uint64, count=len(bitsets))
+
+    return packed
+
+#-----------------------------------------------------------------------------------
+
+# Tabla de bits encendidos por byte (para versiones de NumPy sin bitwise_count)
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+#* Función para contar los bits encendidos de cada palabra uint64
+def popcount(words) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+
+    words = np.ascontiguousarray(words)
+
+    return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para generar la tabla coincidencia -> peso, con exactamente el mismo redondeo que Graph.weight
+def weight_table(max_coincidence) -> np.ndarray:
+    return np.array([float(format(1 / (c + 0.1), '.2f')) for c in range(max_coincidence + 1)], dtype=float)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para calcular la coincidencia de un bloque de filas contra un bloque de columnas (por broadcasting)
+def coincidence_block(rows, columns, degree_codes, semester_codes, skills) -> np.ndarray:
+    shared = popcount(skills[rows, None, :] & skills[None, columns, :]).sum(axis=-1, dtype=np.int64)
+    same_degree = degree_codes[rows, None] == degree_codes[None, columns]
+    same_semester = semester_codes[rows, None] == semester_codes[None, columns]
+
+    return SKILL_POINTS * shared + DEGREE_POINTS * same_degree + SEMESTER_POINTS * same_semester
+
+#-----------------------------------------------------------------------------------
+
+#* Función para calcular la matriz de correlación (pesos) completa, calculando solo el triángulo superior
+def correlation_matrix(degree_codes, semester_codes, skills) -> np.ndarray:
+    students_quantity = degree_codes.shape[0]
+    matrix = np.zeros((students_quantity, students_quantity), dtype=float)
+
+    if students_quantity < 2:
+        return matrix
+
+    # La coincidencia máxima posible define el tamaño de la tabla de pesos
+    max_coincidence = SKILL_POINTS * 64 * skills.shape[1] + DEGREE_POINTS + SEMESTER_POINTS
+    table = weight_table(max_coincidence)
+
+    # Se procesan bloques de filas; cada bloque solo se compara contra las columnas a su derecha
+    block = max(1, BLOCK_ELEMENTS // (students_quantity * skills.shape[1]))
+
+    for start in range(0, students_quantity, block):
+        end = min(start + block, students_quantity)
+        rows = np.arange(start, end)
+        columns = np.arange(start, students_quantity)
+
+        matrix[start:end, start:] = table[coincidence_block(rows, columns, degree_codes, semester_codes, skills)]
+
+    # Se descarta lo que quedó bajo la diagonal dentro de cada bloque y se refleja el triángulo superior
+    matrix = np.triu(matrix, k=1)
+
+    return matrix + matrix.T
+
+#-----------------------------------------------------------------------------------
+
+#* Atributos de los estudiantes como arreglos que crecen de forma amortizada (se actualizan en cada mutación)
+class StudentAttributes:
+    def __init__(self, capacity=16):
+        self.size = 0                                               # Número de estudiantes
+        self.positions = {}                                         # ID de estudiante -> posición en los arreglos
+        self.ids = np.zeros(capacity, dtype=np.int64)               # Posición -> ID de estudiante
+        self.degree_codes = np.zeros(capacity, dtype=np.int64)      # Carrera codificada como entero
+        self.semester_codes = np.zeros(capacity, dtype=np.int64)    # Semestre codificado como entero
+        self.skills = np.zeros((capacity, 1), dtype=np.uint64)      # Bitset de habilidades empaquetado (N x W)
+        self.degree_encoder = {}                                    # Carrera -> código
+        self.semester_encoder = {}                                  # Semestre -> código
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir un estudiante; regresa su posición
+    def add(self, student_id, degree, semester) -> int:
+
+        # Si los arreglos están llenos, se duplica su capacidad
+        if self.size == self.ids.shape[0]:
+            self._grow(2 * self.size, self.skills.shape[1])
+
+        position = self.size
+        self.positions[student_id] = position
+        self.ids[position] = student_id
+        self.degree_codes[position] = self.degree_encoder.setdefault(degree, len(self.degree_encoder))
+        self.semester_codes[position] = self.semester_encoder.setdefault(semester, len(self.semester_encoder))
+        self.size += 1
+
+        return position
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir muchos estudiantes de una vez; regresa sus posiciones
+    def extend(self, student_ids, degrees, semesters) -> np.ndarray:
+        quantity = len(student_ids)
+
+        if self.size + quantity > self.ids.shape[0]:
+            self._grow(max(self.size + quantity, 2 * self.ids.shape[0]), self.skills.shape[1])
+
+        positions = np.arange(self.size, self.size + quantity)
+        self.ids[positions] = student_ids
+
+        # Primero se registran los valores nuevos en cada codificador y luego se traducen todos con map (en C)
+        for encoder, values, codes in ((self.degree_encoder, degrees, self.degree_codes),
+                                       (self.semester_encoder, semesters, self.semester_codes)):
+            for value in dict.fromkeys(values):
+                encoder.setdefault(value, len(encoder))
+
+            codes[positions] = np.fromiter(map(encoder.__getitem__, values), dtype=np.int64, count=quantity)
+
+        self.positions.update(zip(np.asarray(student_ids).tolist(), positions.tolist()))
+        self.size += quantity
+
+        return positions
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para usar arreglos ya construidos (p. ej. mapas de memoria compartidos, de solo lectura) sin copiarlos
+    def adopt(self, ids, degree_codes, semester_codes, skills) -> None:
+        self.size = ids.shape[0]
+        self.ids = ids
+        self.degree_codes = degree_codes
+        self.semester_codes = semester_codes
+        self.skills = skills
+        self.positions = dict(zip(ids.tolist(), range(self.size)))
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para reemplazar los bitsets (ya empaquetados, N x W) de varios estudiantes
+    def set_packed_skills(self, positions, packed) -> None:
+        if packed.shape[1] > self.skills.shape[1]:
+            self._grow(self.ids.shape[0], packed.shape[1])
+
+        self.skills[positions] = 0
+        self.skills[positions, :packed.shape[1]] = packed
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para reemplazar el bitset de habilidades de un estudiante; regresa su posición
+    def set_skills(self, student_id, bits) -> int:
+        position = self.positions[student_id]
+        words = max(1, (bits.bit_length() + 63) // 64)
+
+        # Si el vocabulario creció más allá de las palabras actuales, se añaden columnas
+        if words > self.skills.shape[1]:
+            self._grow(self.ids.shape[0], words)
+
+        self.skills[position] = pack_bitsets([bits], 64 * self.skills.shape[1])[0]
+
+        return position
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar para ampliar la capacidad (filas) y el número de palabras de habilidades (columnas)
+    def _grow(self, capacity, words) -> None:
+        for name in ('ids', 'degree_codes', 'semester_codes'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+        skills = np.zeros((capacity, words), dtype=np.uint64)
+        skills[:self.size, :self.skills.shape[1]] = self.skills[:self.size]
+        self.skills = skills
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para obtener los arreglos (vistas) que usan los cálculos vectorizados
+    def arrays(self):
+        return self.degree_codes[:self.size], self.semester_codes[:self.size], self.skills[:self.size]
+
+    #* Método para obtener la lista de IDs de estudiante en el orden de los arreglos
+    def student_ids(self) -> list:
+        return self.ids[:self.size].tolist()
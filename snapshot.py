@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+import similarity
+
+'''
+
+Snapshot binario del grafo
+
+Guarda todo el estado de Graph (índices de nombres, atributos de los estudiantes, vocabulario
+de habilidades y adyacencia) en un archivo .npz sin comprimir: cada arreglo se escribe tal
+cual está en memoria, así que cargar un snapshot es leer arreglos y reconstruir los índices
+en bloque, en lugar de repetir cada add_student_vertex / add_skill_vertex.
+
+Las estructuras derivadas (MST, oráculo de distancias, vista de NetworkX) no se guardan:
+se recalculan la primera vez que se usan.
+
+'''
+
+# Versión del formato del archivo
+FORMAT_VERSION = 1
+
+#-----------------------------------------------------------------------------------
+
+#* Función para reunir el estado de un grafo como arreglos de NumPy (nombre -> arreglo)
+def collect(graph) -> dict:
+    student_ids = np.array(graph.attributes.student_ids(), dtype=np.int64)
+    skill_ids = np.array(graph.skill_vocabulary, dtype=np.int64)
+    sources, targets, weights = graph.adjacency.edge_arrays()
+
+    # Metadatos y valores que pueden ser de cualquier tipo (los semestres pueden ser int o str)
+    meta = {
+        'format': FORMAT_VERSION,
+        'num_nodes': graph.num_nodes,
+        'version': graph.version,
+        'log_sequence': graph.log_sequence,
+        'degrees': [graph.degrees[i] for i in sorted(graph.degrees)],
+        'categories': [graph.categories[i] for i in sorted(graph.categories)],
+        'semesters': [graph.students_semesters[i] for i in student_ids.tolist()],
+    }
+
+    return {
+        'meta': np.array(json.dumps(meta)),
+        'student_ids': student_ids,
+        'student_names': np.array([graph.students[i] for i in student_ids.tolist()], dtype=str),
+        'student_degrees': np.array([graph.degrees.index_of(graph.students_degrees[i]) for i in student_ids.tolist()], dtype=np.int64),
+        'student_skills': similarity.pack_bitsets([graph.students_skills.get(i, 0) for i in student_ids.tolist()], len(skill_ids)),
+        'skill_ids': skill_ids,
+        'skill_names': np.array([graph.skills[i] for i in skill_ids.tolist()], dtype=str),
+        'edge_sources': sources,
+        'edge_targets': targets,
+        'edge_weights': weights,
+    }
+
+#-----------------------------------------------------------------------------------
+
+#* Función para guardar el estado de un grafo en un archivo .npz (escritura atómica)
+def save(graph, path) -> None:
+    arrays = collect(graph)
+
+    # Se escribe a un archivo temporal propio (en el mismo directorio) y se reemplaza de forma atómica,
+    # para no dejar snapshots a medias aunque otro hilo o proceso guarde al mismo tiempo
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary, path)
+
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Función para restaurar un snapshot sobre un grafo recién creado (sin start())
+def restore(graph, path) -> None:
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    degree_names, semesters = restore_indexes(graph, arrays)
+
+    # Adyacencia completa de una sola vez
+    graph.adjacency.load_edges(graph.num_nodes, arrays['edge_sources'], arrays['edge_targets'], arrays['edge_weights'])
+
+    # Arreglos para los cálculos vectorizados (el MST se calcula completo la primera vez)
+    positions = graph.attributes.extend(arrays['student_ids'], degree_names, semesters)
+    graph.attributes.set_packed_skills(positions, arrays['student_skills'])
+
+    return
+
+#-----------------------------------------------------------------------------------
+
+#* Función para restaurar todo excepto la adyacencia y los arreglos de atributos; regresa (carreras, semestres)
+def restore_indexes(graph, arrays):
+    meta = json.loads(arrays['meta'].item())
+
+    if meta['format'] != FORMAT_VERSION:
+        raise ValueError(f"Formato de snapshot no soportado: {meta['format']}")
+
+    # Las carreras y categorías salen de degrees.json; deben coincidir con las del snapshot
+    if meta['degrees'] != [graph.degrees[i] for i in sorted(graph.degrees)] or \
+       meta['categories'] != [graph.categories[i] for i in sorted(graph.categories)]:
+        raise ValueError('El snapshot se generó con un catálogo de carreras distinto a degrees.json')
+
+    student_ids = np.asarray(arrays['student_ids'])
+    student_list = student_ids.tolist()
+    degree_names = [graph.degrees[i] for i in arrays['student_degrees'].tolist()]
+    semesters = meta['semesters']
+    skill_list = arrays['skill_ids'].tolist()
+
+    graph.num_nodes = meta['num_nodes']
+
+    # Índices de nombres y atributos de los estudiantes
+    graph.students.update(zip(student_list, arrays['student_names'].tolist()))
+    graph.students_degrees = dict(zip(student_list, degree_names))
+    graph.students_semesters = dict(zip(student_list, semesters))
+
+    # Vocabulario de habilidades (el orden de skill_ids es el número de bit)
+    graph.skills.update(zip(skill_list, arrays['skill_names'].tolist()))
+    graph.skill_vocabulary = skill_list
+    graph.skill_bits = {skill_index: bit for bit, skill_index in enumerate(skill_list)}
+
+    # Bitsets por estudiante (int de Python) e índice invertido habilidad -> estudiantes
+    packed = np.asarray(arrays['student_skills'])
+    bitsets = [0] * len(student_list)
+    for word in range(packed.shape[1]):
+        for position, value in enumerate(packed[:, word].tolist()):
+            if value:
+                bitsets[position] |= value << (64 * word)
+
+    graph.students_skills = {student: bits for student, bits in zip(student_list, bitsets) if bits}
+    graph.skill_students = {}
+    for bit, skill_index in enumerate(skill_list):
+        word, offset = divmod(bit, 64)
+        holders = student_ids[(packed[:, word] >> np.uint64(offset)) & np.uint64(1) == 1]
+        graph.skill_students[skill_index] = set(holders.tolist())
+
+    graph.version = meta['version']
+    graph.log_sequence = meta.get('log_sequence', 0)
+
+    return degree_names, semesters
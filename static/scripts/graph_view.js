@@ -0,0 +1,142 @@
+// Dibujo del grafo en el navegador a partir de /api/graph o /api/prim
+// Los arreglos llegan como bytes en base64 (little-endian) y se convierten a arreglos tipados sin copiar número por número
+
+// Colores por tipo de nodo (los mismos que la figura generada en el servidor)
+const PALETTE = {category: 'yellow', degree: 'lightgreen', student: 'lightblue', skill: 'lightcoral', cluster: 'plum'};
+
+// Con más nodos (o aristas) que esto, las etiquetas solo aparecen al pasar el cursor
+const MAX_LABELS = 1000;
+
+const ARRAY_TYPES = {uint8: Uint8Array, uint32: Uint32Array, float32: Float32Array};
+
+// Convierte {dtype, shape, data} en un arreglo tipado
+function decode(array) {
+    const bytes = Uint8Array.from(atob(array.data), c => c.charCodeAt(0));
+    return new ARRAY_TYPES[array.dtype](bytes.buffer);
+}
+
+function draw(data) {
+    const types = decode(data.types);
+    const positions = decode(data.positions);
+    const edges = decode(data.edges);
+    const weights = decode(data.weights);
+    const palette = Object.assign({}, PALETTE, data.colors || {});
+    const nodes = types.length;
+    const edgeCount = weights.length;
+
+    // Aristas: un solo trazo con NaN entre segmentos
+    const edgeX = new Float32Array(edgeCount * 3).fill(NaN);
+    const edgeY = new Float32Array(edgeCount * 3).fill(NaN);
+    const middleX = new Float32Array(edgeCount);
+    const middleY = new Float32Array(edgeCount);
+    for (let e = 0; e < edgeCount; e++) {
+        const u = edges[2 * e], v = edges[2 * e + 1];
+        edgeX[3 * e] = positions[2 * u];
+        edgeY[3 * e] = positions[2 * u + 1];
+        edgeX[3 * e + 1] = positions[2 * v];
+        edgeY[3 * e + 1] = positions[2 * v + 1];
+        middleX[e] = (edgeX[3 * e] + edgeX[3 * e + 1]) / 2;
+        middleY[e] = (edgeY[3 * e] + edgeY[3 * e + 1]) / 2;
+    }
+
+    const nodeX = new Float32Array(nodes);
+    const nodeY = new Float32Array(nodes);
+    const colors = new Array(nodes);
+    for (let i = 0; i < nodes; i++) {
+        nodeX[i] = positions[2 * i];
+        nodeY[i] = positions[2 * i + 1];
+        colors[i] = palette[data.type_names[types[i]]];
+    }
+
+    const traces = [
+        {type: 'scattergl', mode: 'lines', x: edgeX, y: edgeY, hoverinfo: 'none',
+         line: {width: 1, color: '#888'}},
+        {type: 'scattergl', mode: nodes <= MAX_LABELS ? 'markers+text' : 'markers', x: nodeX, y: nodeY,
+         text: data.labels, textposition: 'top center', hoverinfo: 'text',
+         marker: {size: 15, color: colors, line: {width: 2}}},
+    ];
+
+    // Pesos de las aristas en su punto medio
+    const weightText = Array.from(weights, w => Number.isInteger(w) ? String(w) : w.toFixed(2));
+    traces.push({type: 'scattergl', mode: edgeCount <= MAX_LABELS ? 'text' : 'markers', x: middleX, y: middleY,
+                 text: weightText, hoverinfo: edgeCount <= MAX_LABELS ? 'none' : 'text',
+                 marker: {size: 1, opacity: 0}, textfont: {size: 10}});
+
+    Plotly.newPlot('graph', traces, {
+        title: {text: data.title}, showlegend: false, hovermode: 'closest',
+        margin: {b: 20, l: 5, r: 5, t: 40},
+        xaxis: {showgrid: false, zeroline: false, showticklabels: false},
+        yaxis: {showgrid: false, zeroline: false, showticklabels: false},
+    }, {responsive: true}).then(plot => {
+        // Vista resumida: un clic en un cúmulo, una carrera o una categoría la abre (o la cierra)
+        if (data.names) {
+            plot.on('plotly_click', event => toggleExpand(data.names, event));
+        }
+    });
+}
+
+// Se recarga la vista con la carrera o categoría añadida (o quitada) del parámetro expand
+function toggleExpand(names, event) {
+    const point = event.points.find(p => p.curveNumber === 1);
+    const name = point && names[point.pointIndex];
+    if (!name) return;
+
+    const params = new URLSearchParams(location.search);
+    const expand = new Set((params.get('expand') || '').split(',').filter(Boolean));
+    if (expand.has(name)) expand.delete(name); else expand.add(name);
+
+    if (expand.size) params.set('expand', [...expand].join(',')); else params.delete('expand');
+    location.search = params.toString();
+}
+
+// Los datos se piden sin esperar el cálculo (async=1): si el servidor responde 202, se espera el aviso del
+// trabajo por server-sent events y después se descarga su resultado
+function load(url) {
+    const separator = url.includes('?') ? '&' : '?';
+    return fetch(url + separator + 'async=1').then(response => {
+        if (response.status === 202) return response.json().then(waitForJob);
+        if (!response.ok) throw new Error(response.statusText);
+        return response.json();
+    });
+}
+
+// Si el flujo de eventos falla (se cortó, o el trabajo ya no existe) se consulta el resultado cada POLL_INTERVAL ms
+const POLL_INTERVAL = 1000;
+
+function waitForJob(job) {
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(job.events_url);
+        events.addEventListener('done', () => {
+            events.close();
+            pollResult(job.result_url).then(resolve, reject);
+        });
+        events.addEventListener('failed', event => {
+            events.close();
+            reject(new Error(JSON.parse(event.data).error));
+        });
+        events.onerror = () => {
+            events.close();
+            pollResult(job.result_url).then(resolve, reject);
+        };
+    });
+}
+
+// Descarga el resultado de un trabajo; mientras siga en curso (202) se vuelve a consultar
+function pollResult(url) {
+    return fetch(url).then(response => {
+        if (response.status === 202) {
+            return new Promise(resolve => setTimeout(resolve, POLL_INTERVAL)).then(() => pollResult(url));
+        }
+        if (!response.ok) throw new Error(response.statusText || 'HTTP ' + response.status);
+        return response.json();
+    });
+}
+
+const container = document.getElementById('graph');
+load(container.dataset.url)
+    .then(draw)
+    .catch(error => {
+        const message = document.getElementById('error-message');
+        message.textContent = 'Error: ' + error.message;
+        message.hidden = false;
+    });
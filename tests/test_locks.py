@@ -0,0 +1,98 @@
+import threading
+import time
+
+from locks import ReadWriteLock
+
+'''
+
+Pruebas del candado de lectores/escritor
+
+'''
+
+# Tiempo máximo que un hilo puede esperar su turno antes de considerarse bloqueado
+TIMEOUT = 5
+
+#-----------------------------------------------------------------------------------
+
+#* Función auxiliar: hilos que toman el candado en un ciclo continuo (siempre hay alguien adentro) hasta stop
+def hammer(lock, mode, stop, threads):
+    def loop():
+        while not stop.is_set():
+            with getattr(lock, mode)():
+                time.sleep(0.001)
+
+    workers = [threading.Thread(target=loop, daemon=True) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    return workers
+
+#-----------------------------------------------------------------------------------
+
+#* Función auxiliar: toma el candado en otro hilo y regresa si lo consiguió antes del plazo
+def acquired_in_time(lock, mode, timeout=TIMEOUT) -> bool:
+    done = threading.Event()
+
+    def take():
+        with getattr(lock, mode)():
+            done.set()
+
+    threading.Thread(target=take, daemon=True).start()
+
+    return done.wait(timeout)
+
+#-----------------------------------------------------------------------------------
+
+#* Un escritor entra aunque los lectores se traslapen sin parar
+def test_writer_not_starved_by_continuous_readers():
+    lock = ReadWriteLock()
+    stop = threading.Event()
+    readers = hammer(lock, 'read', stop, 8)
+
+    try:
+        time.sleep(0.05)
+        assert all(acquired_in_time(lock, 'write') for _ in range(20))
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join(TIMEOUT)
+
+#-----------------------------------------------------------------------------------
+
+#* Un lector entra aunque los escritores se formen sin parar
+def test_reader_not_starved_by_continuous_writers():
+    lock = ReadWriteLock()
+    stop = threading.Event()
+    writers = hammer(lock, 'write', stop, 4)
+
+    try:
+        time.sleep(0.05)
+        assert all(acquired_in_time(lock, 'read') for _ in range(20))
+    finally:
+        stop.set()
+        for writer in writers:
+            writer.join(TIMEOUT)
+
+#-----------------------------------------------------------------------------------
+
+#* Los lectores comparten el candado; el escritor espera a que salgan
+def test_readers_share_and_writer_excludes():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=TIMEOUT)
+    release = threading.Event()
+
+    def read():
+        with lock.read():
+            inside.wait()
+            release.wait(TIMEOUT)
+
+    readers = [threading.Thread(target=read, daemon=True) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+
+    # Los dos lectores están adentro a la vez
+    inside.wait()
+    assert not acquired_in_time(lock, 'write', 0.1)
+
+    release.set()
+    assert acquired_in_time(lock, 'write')
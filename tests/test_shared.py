@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+import shared
+from grapher import Graph
+
+'''
+
+Pruebas del grafo compartido entre procesos (dueño y réplica, en el mismo proceso)
+
+'''
+
+#* Dueño con un grafo inicial publicado y una réplica conectada a él
+@pytest.fixture
+def replica(tmp_path):
+    graph = Graph()
+    graph.start()
+
+    root = str(tmp_path)
+    address = os.path.join(root, 'owner.sock')
+    authkey = os.urandom(16)
+
+    owner = shared.Owner(graph, root, address, authkey)
+    owner.publish()
+    owner.start()
+
+    yield shared.Replica(root, address, authkey, Graph), graph
+
+    owner.stop()
+
+#-----------------------------------------------------------------------------------
+
+#* Una mutación reenviada al dueño es visible en la siguiente versión fijada por la réplica
+def test_forwarded_mutation_visible_after_pin(replica):
+    replica, owner_graph = replica
+    before = replica.pin()
+    student_id = before.getStudentId('Karol')
+
+    replica.add_skill_vertex('Karol', 'Bailar', student_id)
+    after = replica.pin()
+
+    assert after.version >= owner_graph.version > before.version
+    assert after.students_with_skill('Bailar') == {student_id}
+    assert after.has_skill(student_id, 'Bailar')
+
+    # La versión fijada antes de la mutación no cambia (es de solo lectura)
+    assert not before.skills.has_name('Bailar')
+
+    replica.unpin()
+
+#-----------------------------------------------------------------------------------
+
+#* Los errores del dueño llegan a la réplica: ValueError tal cual, los inesperados como RuntimeError
+def test_forwarded_errors(replica):
+    replica, _ = replica
+
+    with pytest.raises(ValueError):
+        replica.add_skill_vertex('Nadie', 'Bailar')
+
+    with pytest.raises(RuntimeError, match='TypeError'):
+        replica.add_skill_vertex('Karol')
@@ -0,0 +1,90 @@
+import pytest
+
+from grapher import Graph
+from wal import LogInUseError, WriteAheadLog
+
+'''
+
+Pruebas de la bitácora de mutaciones (write-ahead log)
+
+'''
+
+#* Función auxiliar para crear un grafo inicial
+def new_graph() -> Graph:
+    graph = Graph()
+    graph.start()
+
+    return graph
+
+#-----------------------------------------------------------------------------------
+
+#* Una segunda apertura de la misma bitácora falla mientras la primera siga abierta
+def test_second_open_log_fails(tmp_path):
+    path = str(tmp_path / 'graph_wal.jsonl')
+    owner = new_graph()
+    owner.open_log(path)
+
+    with pytest.raises(LogInUseError):
+        new_graph().open_log(path)
+
+    # Al cerrarla, otro dueño puede abrirla
+    owner.log.close()
+    WriteAheadLog(path).close()
+
+#-----------------------------------------------------------------------------------
+
+#* Una escritura interrumpida (última línea sin salto) se descarta al abrir y no rompe la reproducción
+def test_torn_tail_is_dropped(tmp_path):
+    path = str(tmp_path / 'graph_wal.jsonl')
+    graph = new_graph()
+    graph.open_log(path)
+    student_id = graph.add_student_vertex('Ana', 'SIS.', 3)
+    graph.add_skill_vertex('Ana', 'Cantar', student_id)
+    graph.log.close()
+
+    with open(path, 'ab') as f:
+        f.write(b'{"seq": 3, "op": "student", "id": ')
+
+    recovered = new_graph()
+    assert recovered.open_log(path) == 2
+    assert recovered.students[student_id] == 'Ana'
+    assert recovered.students_with_skill('Cantar') == {student_id}
+
+    with open(path, 'rb') as f:
+        assert f.read().endswith(b'\n')
+
+    # La bitácora sigue aceptando registros después de la recuperación
+    recovered.add_student_vertex('Luis', 'SIS.', 5)
+    recovered.log.close()
+
+    assert new_graph().open_log(path) == 3
+
+#-----------------------------------------------------------------------------------
+
+#* Después de compactar, snapshot + bitácora reconstruyen el mismo grafo (sin repetir lo que ya guardó el snapshot)
+def test_replay_after_compaction(tmp_path):
+    path = str(tmp_path / 'graph_wal.jsonl')
+    snapshot_path = str(tmp_path / 'graph_snapshot.npz')
+    graph = new_graph()
+    graph.open_log(path)
+
+    first = graph.add_student_vertex('Ana', 'SIS.', 3)
+    graph.add_skill_vertex('Ana', 'Cantar', first)
+    graph.compact(snapshot_path)
+    assert graph.log.records == 0
+
+    second = graph.add_student_vertex('Luis', 'SIS.', 5)
+    graph.add_skill_vertex('Luis', 'Cantar', second)
+    graph.add_skill_vertex('Ana', 'Bailar', first)
+
+    # Corte sin compactar: los registros posteriores solo están en la bitácora
+    graph.log.close()
+
+    restored = Graph.load_snapshot(snapshot_path)
+    assert restored.open_log(path) == 3
+
+    assert dict(restored.students) == dict(graph.students)
+    assert restored.students_skills == graph.students_skills
+    assert restored.students_with_skill('Cantar') == {first, second}
+    assert restored.log_sequence == graph.log_sequence
+    assert restored.version == graph.version
@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+'''
+
+Trazas de tiempo por etapa
+
+span('nombre') mide una etapa (construcción de la matriz, MST, layout, render...).
+Si no hay una petición siendo trazada y el logger no está en nivel DEBUG, el span no
+hace nada más que una comprobación, por lo que puede quedarse en el código sin costo.
+
+server.py abre una traza por petición (start_request / finish_request) y publica los
+tiempos en la cabecera Server-Timing. Los trabajos en segundo plano abren su propia traza
+en su hilo y la petición que los espera la añade a la suya (extend).
+
+'''
+
+logger = logging.getLogger(__name__)
+
+# Lista de spans de la petición actual (una por hilo)
+_local = threading.local()
+
+#-----------------------------------------------------------------------------------
+
+#* Context manager para medir el tiempo de una etapa
+@contextmanager
+def span(name):
+    spans = getattr(_local, 'spans', None)
+
+    # Si nadie está escuchando, no se mide nada
+    if spans is None and not logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+
+        if spans is not None:
+            spans.append((name, elapsed))
+
+        logger.debug('%s: %.2f ms', name, elapsed * 1000)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para empezar a registrar los spans del hilo actual
+def start_request() -> None:
+    _local.spans = []
+
+#-----------------------------------------------------------------------------------
+
+#* Función para añadir a la traza del hilo actual spans medidos en otro hilo (p. ej. un trabajo en segundo plano)
+def extend(spans) -> None:
+    current = getattr(_local, 'spans', None)
+
+    if current is not None:
+        current.extend(spans)
+
+#-----------------------------------------------------------------------------------
+
+#* Función para terminar la traza del hilo actual y obtener sus spans [(nombre, segundos)]
+def finish_request() -> list:
+    spans = getattr(_local, 'spans', None) or []
+    _local.spans = None
+
+    return spans
+
+#-----------------------------------------------------------------------------------
+
+#* Función para formatear los spans como cabecera Server-Timing (milisegundos)
+def server_timing(spans) -> str:
+    return ', '.join(f'{name};dur={elapsed * 1000:.2f}' for name, elapsed in spans)
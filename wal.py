@@ -0,0 +1,201 @@
+import fcntl
+import json
+import os
+import tempfile
+import threading
+
+'''
+
+Bitácora de escritura anticipada (write-ahead log) de las mutaciones del grafo
+
+Cada mutación exitosa (alta de estudiante o de habilidad) se añade como una línea JSON con
+un número de secuencia, y la petición no termina hasta que su registro está en disco.
+El fsync se hace por grupos (group commit): el primer hilo que espera se vuelve "líder" y
+hace un solo fsync que cubre todos los registros escritos hasta ese momento; los hilos que
+llegan mientras tanto esperan al siguiente fsync, así que una ráfaga de peticiones
+concurrentes paga unos pocos fsync en lugar de uno por petición.
+
+Al arrancar se carga el último snapshot y se aplican encima los registros con secuencia
+mayor a la que guardó el snapshot. La compactación guarda un snapshot nuevo y deja la
+bitácora solo con los registros posteriores.
+
+Una bitácora tiene un solo dueño: al abrirla se toma un candado exclusivo (flock) sobre un
+archivo hermano "<bitácora>.lock". Dos procesos escribiendo el mismo archivo repetirían
+números de secuencia y la reproducción fallaría, así que el segundo falla de inmediato.
+
+'''
+
+#* Error al abrir una bitácora que ya tiene otro dueño
+class LogInUseError(RuntimeError):
+    pass
+
+#-----------------------------------------------------------------------------------
+
+#* Bitácora de mutaciones en un archivo JSON Lines con fsync agrupado
+class WriteAheadLog:
+    def __init__(self, path):
+        self.lock_descriptor = lock_log(path)                       # Candado exclusivo (se toma antes de tocar el archivo)
+        drop_torn_tail(path)
+
+        self.path = path                                            # Ruta del archivo de la bitácora
+        self.condition = threading.Condition()                      # Protege el archivo y los contadores
+        self.written = 0                                            # Registros escritos (en el buffer o en disco)
+        self.synced = 0                                             # Registros con fsync completo
+        self.syncing = False                                        # Hay un líder haciendo fsync
+        self.records = sum(1 for _ in read_records(path))           # Registros en el archivo (para decidir la compactación)
+        self.file = open(path, 'ab')
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para añadir un registro; con wait=True regresa cuando el registro ya está en disco
+    def append(self, record, wait=True) -> None:
+        line = json.dumps(record, ensure_ascii=False).encode() + b'\n'
+
+        with self.condition:
+            self.file.write(line)
+            self.written += 1
+            self.records += 1
+
+            if wait:
+                self._wait_synced(self.written)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para forzar el fsync de todos los registros escritos
+    def sync(self) -> None:
+        with self.condition:
+            self._wait_synced(self.written)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para descartar los registros ya incluidos en un snapshot (secuencia <= sequence)
+    def truncate(self, sequence) -> None:
+        with self.condition:
+            self._wait_synced(self.written)
+            self.file.close()
+
+            # Se reescribe el archivo con los registros posteriores y se reemplaza de forma atómica
+            kept = [record for record in read_records(self.path) if record['seq'] > sequence]
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                                     prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+            with os.fdopen(descriptor, 'wb') as f:
+                for record in kept:
+                    f.write(json.dumps(record, ensure_ascii=False).encode() + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temporary, self.path)
+
+            self.file = open(self.path, 'ab')
+            self.records = len(kept)
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para saber si el archivo sigue siendo el que escribe esta bitácora
+    # (otro proceso no lo reemplazó al compactar ni le añadió registros que este proceso no aplicó)
+    def owned(self) -> bool:
+        with self.condition:
+            if self.file.closed:
+                return False
+
+            self.file.flush()
+
+            try:
+                current = os.stat(self.path)
+            except FileNotFoundError:
+                return False
+
+            return current.st_ino == os.fstat(self.file.fileno()).st_ino and current.st_size == self.file.tell()
+
+    #-----------------------------------------------------------------------------
+
+    #* Método para cerrar la bitácora (hace fsync de lo pendiente) y soltar el candado
+    def close(self) -> None:
+        with self.condition:
+            if not self.file.closed:
+                self._wait_synced(self.written)
+                self.file.close()
+
+            # Se cierra el descriptor sin LOCK_UN: un hijo creado con fork comparte el candado y no debe soltarlo al dueño
+            if self.lock_descriptor is not None:
+                os.close(self.lock_descriptor)
+                self.lock_descriptor = None
+
+    #-----------------------------------------------------------------------------
+
+    #* Método auxiliar (con la condición tomada): espera a que el registro ticket esté en disco
+    def _wait_synced(self, ticket) -> None:
+        while self.synced < ticket:
+
+            # Si otro hilo está haciendo fsync, se espera a que termine y se vuelve a revisar
+            if self.syncing:
+                self.condition.wait()
+                continue
+
+            # Este hilo es el líder: un fsync cubre todo lo escrito hasta ahora
+            self.syncing = True
+            target = self.written
+            self.file.flush()
+
+            # El fsync se hace sin la condición, para que otros hilos sigan escribiendo el siguiente grupo
+            self.condition.release()
+            try:
+                os.fsync(self.file.fileno())
+            finally:
+                self.condition.acquire()
+                self.syncing = False
+                self.condition.notify_all()
+
+            self.synced = target
+
+#-----------------------------------------------------------------------------------
+
+#* Función para tomar una bitácora en exclusiva; regresa el descriptor del archivo de candado
+# El candado va en un archivo aparte porque truncate reemplaza el archivo de la bitácora (y con él su candado)
+def lock_log(path) -> int:
+    descriptor = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        owner = os.read(descriptor, 32).decode(errors='replace').strip() or '?'
+        os.close(descriptor)
+        raise LogInUseError(f'La bitácora {path} ya está abierta por otro proceso (pid {owner})')
+
+    # Se deja el pid del dueño para el mensaje de error de quien intente abrirla después
+    os.ftruncate(descriptor, 0)
+    os.write(descriptor, f'{os.getpid()}\n'.encode())
+
+    return descriptor
+
+#-----------------------------------------------------------------------------------
+
+#* Función para leer los registros de una bitácora (una última línea incompleta se ignora)
+def read_records(path):
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'rb') as f:
+        for number, line in enumerate(f, start=1):
+
+            # Una línea sin salto final es una escritura interrumpida por un corte
+            if not line.endswith(b'\n'):
+                return
+
+            try:
+                yield json.loads(line)
+            except ValueError:
+                raise ValueError(f'Registro corrupto en la línea {number} de {path}')
+
+#-----------------------------------------------------------------------------------
+
+#* Función para descartar una última línea incompleta (escritura interrumpida por un corte)
+def drop_torn_tail(path) -> None:
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)